@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+ZSPOOF Benchmark - Multi-worker dashboard load test
+Starts serve.py with 1, 2, 4 ... workers and drives the read-only API routes
+over keep-alive connections from several client processes; reports req/s,
+speedup and scaling efficiency per worker count. The clients share the
+machine with the workers, so efficiency is understated near the core count.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import platform
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+SERVE = Path(__file__).parent.parent / "dashboard" / "backend" / "serve.py"
+ROUTES = ['/api/health', '/api/profiles', '/api/stats', '/api/sessions?limit=20', '/api/jobs']
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def wait_ready(port: int, timeout: float = 30.0) -> bool:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+            conn.request('GET', '/api/health')
+            if conn.getresponse().status == 200:
+                return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+def drive(port: int, threads: int, duration: float, routes: list) -> dict:
+    """Client process: `threads` keep-alive connections hammering the routes"""
+    results = []
+    lock = threading.Lock()
+
+    def loop(offset):
+        done = errors = 0
+        workers = Counter()
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+        deadline = time.perf_counter() + duration
+        i = offset
+        while time.perf_counter() < deadline:
+            try:
+                conn.request('GET', routes[i % len(routes)])
+                response = conn.getresponse()
+                response.read()
+                if response.status == 200:
+                    done += 1
+                    workers[response.getheader('X-ZSpoof-Worker', '-')] += 1
+                else:
+                    errors += 1
+            except (OSError, http.client.HTTPException):
+                errors += 1
+                conn.close()
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+            i += 1
+        conn.close()
+        with lock:
+            results.append((done, errors, workers))
+
+    pool = [threading.Thread(target=loop, args=(n,)) for n in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    workers = Counter()
+    for _, _, seen in results:
+        workers.update(seen)
+    return {'requests': sum(r[0] for r in results), 'errors': sum(r[1] for r in results),
+            'workers': dict(workers)}
+
+def measure(workers: int, args) -> dict:
+    port = free_port()
+    with tempfile.TemporaryDirectory() as tmp, open(Path(tmp) / 'serve.log', 'w+') as log:
+        env = dict(os.environ,
+                   ZSPOOF_SESSION_DB=str(Path(tmp) / 'sessions.db'),
+                   ZSPOOF_STATE_DB=str(Path(tmp) / 'state.db'))
+        # The access log goes to a file: an unread pipe fills up and stalls the workers
+        server = subprocess.Popen(
+            [sys.executable, str(SERVE), '-w', str(workers), '--host', '127.0.0.1',
+             '--port', str(port), '--bus', str(Path(tmp) / 'bus.sock')],
+            env=env, stdout=subprocess.DEVNULL, stderr=log
+        )
+        try:
+            if not wait_ready(port):
+                server.kill()
+                log.seek(0)
+                raise RuntimeError(f"serve.py did not come up: {log.read()[-500:]}")
+            connections = args.connections * workers
+            clients = min(args.clients, connections)
+            per_client = [connections // clients + (i < connections % clients) for i in range(clients)]
+            drive(port, connections, 1.0, args.routes)  # warm-up: imports, SQLite pages
+            with ProcessPoolExecutor(max_workers=clients) as pool:
+                runs = list(pool.map(drive, [port] * clients, per_client,
+                                     [args.duration] * clients, [args.routes] * clients))
+        finally:
+            server.send_signal(signal.SIGTERM)
+            try:
+                server.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                server.kill()
+    distribution = Counter()
+    for run in runs:
+        distribution.update(run['workers'])
+    requests = sum(run['requests'] for run in runs)
+    return {
+        'workers': workers,
+        'connections': connections,
+        'requests': requests,
+        'errors': sum(run['errors'] for run in runs),
+        'requests_per_s': round(requests / args.duration, 1),
+        'per_worker': dict(sorted(distribution.items())),
+    }
+
+def main():
+    cpus = os.cpu_count() or 1
+    default = [n for n in (1, 2, 4, 8, 16, 32) if n <= cpus] or [1]
+    parser = argparse.ArgumentParser(description="Multi-worker dashboard load test")
+    parser.add_argument('-w', '--workers', default=','.join(map(str, default)),
+                        help='comma-separated worker counts (default: powers of two up to the CPU count)')
+    parser.add_argument('-d', '--duration', type=float, default=10.0, help='seconds per worker count')
+    parser.add_argument('-c', '--connections', type=int, default=8, help='keep-alive connections per worker')
+    parser.add_argument('--clients', type=int, default=cpus, help='client processes')
+    parser.add_argument('--routes', nargs='+', default=ROUTES)
+    parser.add_argument('--min-efficiency', type=float, default=0.0,
+                        help='exit 1 when any run scales below this fraction of linear')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    parser.add_argument('-o', '--output', help='also write the JSON results to this file')
+    args = parser.parse_args()
+
+    try:
+        import flask, flask_socketio  # noqa: F401
+    except ImportError as e:
+        print(f"Dashboard dependencies missing ({e.name}); pip install -r requirements.txt")
+        return 2
+
+    runs = [measure(int(n), args) for n in args.workers.split(',')]
+    base = runs[0]['requests_per_s'] / runs[0]['workers']
+    for run in runs:
+        run['speedup'] = round(run['requests_per_s'] / runs[0]['requests_per_s'], 2)
+        run['efficiency'] = round(run['requests_per_s'] / (base * run['workers']), 2)
+
+    report = {'cpus': cpus, 'python': platform.python_version(), 'routes': args.routes,
+              'duration_s': args.duration, 'runs': runs}
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(json.dumps(report, indent=2) + '\n')
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"Routes: {', '.join(args.routes)} ({args.duration:.0f} s per run)")
+        for run in runs:
+            print(f"  {run['workers']:3d} workers  {run['requests_per_s']:>10,.0f} req/s  "
+                  f"x{run['speedup']:<5} eff {run['efficiency']:.0%}  errors {run['errors']}  "
+                  f"per worker {list(run['per_worker'].values())}")
+    return 1 if any(run['efficiency'] < args.min_efficiency for run in runs) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
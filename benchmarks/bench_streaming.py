@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+ZSPOOF Benchmark - Streaming analyze_network_environment
+Throughput and peak RSS when fingerprinting large NDJSON/CSV exports
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+from mac_generator import format_records, iter_batches
+
+def write_export(path: Path, records: int, fmt: str) -> None:
+    """Write a synthetic scan export of stealth-profile MACs"""
+    with open(path, 'w', buffering=1 << 20) as f:
+        if fmt == 'csv':
+            f.write('ip,mac\n')
+        host = 0
+        for raw in iter_batches('stealth', records):
+            lines = []
+            for mac in format_records(raw):
+                ip = f"10.{(host >> 16) & 0xFF}.{(host >> 8) & 0xFF}.{host & 0xFF}"
+                if fmt == 'csv':
+                    lines.append(f"{ip},{mac}\n")
+                else:
+                    lines.append(f'{{"ip": "{ip}", "mac": "{mac}"}}\n')
+                host += 1
+            f.writelines(lines)
+
+def measure(path: Path, mode: str) -> dict:
+    """Analyze in a fresh interpreter so ru_maxrss belongs to this run only"""
+    code = f"""
+import json, resource, sys, time
+sys.path.insert(0, {str(SRC_DIR)!r})
+from ml_engine import MLMACEngine
+from scan_sources import iter_devices
+engine = MLMACEngine()
+baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+source = {str(path)!r}
+if {mode!r} == 'list':
+    source = list(iter_devices(source))
+fingerprint = engine.analyze_network_environment(source)
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    'elapsed_s': elapsed,
+    'baseline_rss_mb': baseline / 1024,
+    'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'vendors': len(fingerprint.vendor_distribution),
+}}))
+"""
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming ingestion benchmark")
+    parser.add_argument('--records', type=int, default=10_000_000)
+    parser.add_argument('--format', choices=['ndjson', 'csv'], default='ndjson')
+    parser.add_argument('--compare-list', action='store_true',
+                        help='also time the fully materialised list path')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    results = {'records': args.records, 'format': args.format, 'runs': {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / f"scan.{args.format}"
+        start = time.perf_counter()
+        write_export(path, args.records, args.format)
+        results['write_s'] = round(time.perf_counter() - start, 2)
+        results['file_mb'] = round(path.stat().st_size / 1e6, 1)
+
+        modes = ['stream'] + (['list'] if args.compare_list else [])
+        for mode in modes:
+            run = measure(path, mode)
+            run['records_per_s'] = round(args.records / run['elapsed_s'])
+            results['runs'][mode] = run
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{args.records:,} records ({results['file_mb']} MB {args.format})")
+    for mode, run in results['runs'].items():
+        print(f"  {mode:6s}  {run['records_per_s']:>10,} rec/s  "
+              f"{run['elapsed_s']:7.2f} s  peak RSS {run['peak_rss_mb']:7.1f} MB "
+              f"(baseline {run['baseline_rss_mb']:.1f} MB)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
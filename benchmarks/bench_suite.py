@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+ZSPOOF Benchmark Suite - Hot-path timings with baseline comparison
+Generation, vendor lookup, fingerprinting, namespace link changes and
+dashboard routes; results are written as JSON so runs can be diffed
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+SRC_DIR = PROJECT_DIR / "src"
+BACKEND_DIR = PROJECT_DIR / "dashboard" / "backend"
+sys.path.insert(0, str(SRC_DIR))
+
+from mac_array import MacArray
+from mac_generator import generate_batch, generate_batch_bytes, generate_mac
+from ml_engine import MLMACEngine
+
+DEFAULT_OUTPUT = PROJECT_DIR / "benchmarks" / "results" / "latest.json"
+DEVICE_COUNTS = (1_000, 100_000, 1_000_000)
+
+
+class Skip(Exception):
+    """Benchmark cannot run in this environment"""
+
+
+def measure(fn: Callable[[], object], ops: int = 1, repeat: int = 5,
+            min_time: float = 0.2) -> Dict:
+    """Calibrate a loop count to min_time, then take the median of `repeat` runs"""
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or loops >= 1 << 20:
+            break
+        loops *= 10 if elapsed < min_time / 10 else 2
+
+    samples = [elapsed / loops]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        samples.append((time.perf_counter() - start) / loops)
+
+    median = statistics.median(samples)
+    return {
+        'median_s': median,
+        'min_s': min(samples),
+        'ops': ops,
+        'ops_per_s': ops / median,
+        'loops': loops,
+        'repeat': repeat,
+    }
+
+
+# Cases ---------------------------------------------------------------
+
+def bench_generation() -> List[Tuple[str, Dict]]:
+    return [
+        ('generate_mac[stealth]', measure(lambda: generate_mac('stealth'))),
+        ('generate_batch[stealth,100k]',
+         measure(lambda: generate_batch('stealth', 100_000), ops=100_000, repeat=3)),
+        ('generate_batch_bytes[random,1M]',
+         measure(lambda: generate_batch_bytes('random', 1_000_000), ops=1_000_000, repeat=3)),
+    ]
+
+
+def bench_ml(engine: MLMACEngine) -> List[Tuple[str, Dict]]:
+    macs = generate_batch('stealth', 10_000) + generate_batch('random', 10_000)
+
+    def identify():
+        for mac in macs:
+            engine._identify_vendor(mac)
+
+    array = MacArray.from_strings(macs * 50)
+
+    return [
+        ('generate_intelligent_mac[stealth]',
+         measure(lambda: engine.generate_intelligent_mac('stealth'))),
+        ('generate_intelligent_batch[byod,100k]',
+         measure(lambda: engine.generate_intelligent_batch('byod', 100_000),
+                 ops=100_000, repeat=3)),
+        ('_identify_vendor', measure(identify, ops=len(macs))),
+        ('predict_detection_batch[1M]',
+         measure(lambda: engine.predict_detection_batch(array, 'corporate', hours=3),
+                 ops=len(array), repeat=3)),
+    ]
+
+
+def bench_analyze(engine: MLMACEngine, counts) -> List[Tuple[str, Dict]]:
+    results = []
+    for n in counts:
+        raw = generate_batch_bytes('stealth', n)
+        array = MacArray.from_records(raw)
+        devices = [{'mac': mac} for mac in array.to_strings()]
+        repeat = 3 if n < 1_000_000 else 1
+        results.append((f'analyze_network_environment[dicts,{n}]',
+                        measure(lambda: engine.analyze_network_environment(devices),
+                                ops=n, repeat=repeat, min_time=0.1)))
+        results.append((f'analyze_network_environment[MacArray,{n}]',
+                        measure(lambda: engine.analyze_network_environment(array),
+                                ops=n, repeat=repeat, min_time=0.1)))
+    return results
+
+
+LINK_CHANGE_SCRIPT = r"""
+import json, sys, time
+sys.path.insert(0, sys.argv[1])
+from netlink import NetlinkError, create_link, set_link_address
+name = 'zspb0'
+try:
+    create_link(name, 'dummy')
+except NetlinkError:
+    name = 'lo'  # no dummy driver: loopback still takes a full down/address/up
+samples = {'batch': [], 'step': []}
+for i in range(int(sys.argv[2])):
+    for mode in samples:
+        mac = '02:5A:%02X:%02X:00:%02X' % (i >> 8 & 0xFF, i & 0xFF, mode == 'step')
+        start = time.perf_counter()
+        result = set_link_address(name, mac, batch=mode == 'batch')
+        samples[mode].append(time.perf_counter() - start)
+        assert result.success, result.error
+print(json.dumps(samples))
+"""
+
+
+def bench_link_change(iterations: int = 200) -> List[Tuple[str, Dict]]:
+    """Full down/address/up on a dummy link inside an unprivileged netns"""
+    if not shutil.which('unshare') or subprocess.run(['unshare', '-rn', 'true'],
+                                                     capture_output=True).returncode != 0:
+        raise Skip('user namespaces unavailable')
+    result = subprocess.run(
+        ['unshare', '-rn', sys.executable, '-c', LINK_CHANGE_SCRIPT, str(SRC_DIR), str(iterations)],
+        capture_output=True, text=True, timeout=120
+    )
+    if result.returncode != 0:
+        raise Skip(result.stderr.strip().splitlines()[-1] if result.stderr else 'netns failed')
+    results = []
+    for mode, samples in json.loads(result.stdout).items():
+        median = statistics.median(samples)
+        results.append((f'set_link_address[netns,{mode}]', {
+            'median_s': median,
+            'min_s': min(samples),
+            'ops': 1,
+            'ops_per_s': 1 / median,
+            'loops': 1,
+            'repeat': len(samples),
+        }))
+    return results
+
+
+def bench_routes() -> List[Tuple[str, Dict]]:
+    """Each read-only dashboard route through the Flask test client"""
+    try:
+        import flask  # noqa: F401
+    except ImportError:
+        raise Skip('flask not installed')
+    os.environ.setdefault('ZSPOOF_SESSION_DB', str(Path(tempfile.mkdtemp()) / 'sessions.db'))
+    sys.path.insert(0, str(BACKEND_DIR))
+    import app as dashboard
+
+    client = dashboard.app.test_client()
+    routes = [
+        ('GET', '/api/health', None),
+        ('GET', '/api/interfaces', None),
+        ('GET', '/api/profiles', None),
+        ('GET', '/api/stats', None),
+        ('GET', '/api/sessions', None),
+        ('GET', '/api/jobs', None),
+        ('POST', '/api/generate-mac', {'profile': 'stealth'}),
+    ]
+    results = []
+    for method, path, body in routes:
+        call = (lambda p=path: client.get(p)) if method == 'GET' else \
+               (lambda p=path, b=body: client.post(p, json=b))
+        status = call().status_code
+        if status >= 500:
+            raise Skip(f'{method} {path} returned {status}')
+        results.append((f'route[{method} {path}]', measure(call)))
+    return results
+
+
+# Reporting -----------------------------------------------------------
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[Dict]:
+    """Per-benchmark throughput ratio against a previous run"""
+    rows = []
+    for name, current in results.items():
+        before = baseline.get('results', {}).get(name)
+        if not before or 'ops_per_s' not in before or 'ops_per_s' not in current:
+            continue
+        ratio = current['ops_per_s'] / before['ops_per_s']
+        rows.append({
+            'name': name,
+            'baseline_ops_per_s': before['ops_per_s'],
+            'ops_per_s': current['ops_per_s'],
+            'ratio': ratio,
+            'regression': ratio < 1 - threshold,
+        })
+    return rows
+
+
+def format_rate(ops_per_s: float) -> str:
+    for unit, scale in (('M', 1e6), ('k', 1e3)):
+        if ops_per_s >= scale:
+            return f"{ops_per_s / scale:8.2f}{unit}/s"
+    return f"{ops_per_s:8.2f} /s"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="ZSPOOF benchmark suite")
+    parser.add_argument('-o', '--output', default=str(DEFAULT_OUTPUT))
+    parser.add_argument('--baseline', help='previous results JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='relative slowdown reported as a regression (default 0.2)')
+    parser.add_argument('--quick', action='store_true', help='skip the 1M-device analysis')
+    parser.add_argument('-k', '--filter', help='only run benchmarks whose group contains this')
+    args = parser.parse_args(argv)
+
+    engine = MLMACEngine()
+    counts = DEVICE_COUNTS[:-1] if args.quick else DEVICE_COUNTS
+    groups = [
+        ('generation', bench_generation),
+        ('ml', lambda: bench_ml(engine)),
+        ('analyze', lambda: bench_analyze(engine, counts)),
+        ('netns', bench_link_change),
+        ('routes', bench_routes),
+    ]
+
+    results, skipped = {}, {}
+    for group, run in groups:
+        if args.filter and args.filter not in group:
+            continue
+        try:
+            for name, result in run():
+                results[name] = result
+                print(f"  {name:48s} {format_rate(result['ops_per_s'])}  "
+                      f"{result['median_s'] * 1e6:12.2f} µs/call")
+        except Skip as e:
+            skipped[group] = str(e)
+            print(f"  {group:48s} skipped ({e})")
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+        },
+        'results': results,
+        'skipped': skipped,
+    }
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            rows = compare(results, json.load(f), args.threshold)
+        report['comparison'] = rows
+        print(f"\n  Against {args.baseline}:")
+        for row in rows:
+            marker = '  REGRESSION' if row['regression'] else ''
+            print(f"  {row['name']:48s} {row['ratio']:6.2f}x{marker}")
+        regressions = [row['name'] for row in rows if row['regression']]
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\n  Results written to {output}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
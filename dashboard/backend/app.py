@@ -4,20 +4,42 @@ ZSPOOF v3.0 - AI-Powered Backend
 Professional Flask API with ML integration
 """
 
-from flask import Flask, jsonify, request, send_file
+from flask import Flask, Response, jsonify, request, send_file
 from flask_cors import CORS
 from flask_socketio import SocketIO
-import subprocess
+import errno
+import ipaddress
+import math
+import os
 import sys
+import threading
+from dataclasses import asdict
 from datetime import datetime
 from pathlib import Path
+from time import perf_counter, sleep
 
 # Add parent to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
 
+from oui_registry import get_registry
+from mac_array import MacArray
+from uniqueness import observe as observe_addresses, unique_mac
+from bulk_apply import apply_many, apply_one
+import inventory
+import neighbors
+import cluster
+from jobs import FINISHED, JobCancelled, JobLimitError, JobManager
+from scan_cache import MODES as SCAN_MODES, STALE, ScanCache, group_targets
+from scan_stream import BATCH_INTERVAL, NDJSON_MIMETYPE, ScanStream, ndjson_lines
+from metrics import REGISTRY, counter, histogram, timed
+from session_store import Session, get_store, log_session
+
 app = Flask(__name__)
 CORS(app)
-socketio = SocketIO(app, cors_allowed_origins="*")
+# Under serve.py the emits fan out to every worker over the event bus
+socketio = SocketIO(app, cors_allowed_origins="*", **cluster.socketio_options())
+# Scan tables and job snapshots shared by serve.py workers (None when single-process)
+shared_state = cluster.state_store()
 
 # Paths
 SCRIPT_DIR = Path(__file__).parent
@@ -28,15 +50,87 @@ INDEX_HTML = DASHBOARD_DIR / "index.html"
 
 # Try to import ML engine
 try:
-    from ml_engine import MLMACEngine, AdvancedNetworkAnalyzer
+    from ml_engine import AdvancedNetworkAnalyzer, FingerprintTracker, get_engine
     ML_AVAILABLE = True
-    ml_engine = MLMACEngine()
-    network_analyzer = AdvancedNetworkAnalyzer()
+    ml_engine = get_engine()
+    network_analyzer = AdvancedNetworkAnalyzer(ml_engine)
 except ImportError:
     ML_AVAILABLE = False
     ml_engine = None
     network_analyzer = None
 
+# Per-(interface, range) fingerprints updated from scan deltas
+network_trackers = {}
+trackers_lock = threading.Lock()
+
+# Scans and analyses run as background jobs; events reach clients via the pump
+jobs = JobManager(limits={
+    'scan': int(os.environ.get('ZSPOOF_SCAN_JOBS', 2)),
+    'analysis': int(os.environ.get('ZSPOOF_ANALYSIS_JOBS', 2)),
+}, store=shared_state)
+# ARP results per (interface, range); refreshes only re-probe expired addresses
+scan_cache = ScanCache(store=shared_state)
+
+pump_lock = threading.Lock()
+pump_started = False
+metrics_stream_started = False
+METRICS_INTERVAL = float(os.environ.get('ZSPOOF_METRICS_INTERVAL', 5))
+neighbor_stream_started = False
+NEIGHBOR_INTERVAL = float(os.environ.get('ZSPOOF_NEIGHBOR_INTERVAL', 1))
+interface_stream_started = False
+# Link/address notifications arriving within one interval reach clients as one event
+INTERFACE_INTERVAL = float(os.environ.get('ZSPOOF_INTERFACE_INTERVAL', 0.25))
+SCAN_TIMEOUT = float(os.environ.get('ZSPOOF_SCAN_TIMEOUT', 3))
+
+def submit_job(kind, fn, *args):
+    """Submit a job, starting the event pump first (raises JobLimitError)"""
+    global pump_started
+    with pump_lock:
+        if not pump_started:
+            socketio.start_background_task(jobs.pump, socketio.emit, socketio.sleep)
+            pump_started = True
+    return jobs.submit(kind, fn, *args)
+
+def start_job(kind, fn, *args):
+    """Submit a job and answer 202 with its id (429 when over the limits)"""
+    try:
+        job = submit_job(kind, fn, *args)
+    except JobLimitError as e:
+        return jsonify({'error': str(e)}), 429
+    return jsonify(job_accepted(job)), 202
+
+def job_accepted(job):
+    return {'job_id': job.id, 'status_url': f'/api/jobs/{job.id}', **job.status()}
+
+def update_fingerprint(interface, ip_range, macs):
+    """Fold a scan (MacArray) into the running fingerprint for its subnet"""
+    if not ML_AVAILABLE:
+        return None
+    with trackers_lock:
+        tracker = network_trackers.get((interface, ip_range))
+        if tracker is None:
+            tracker = network_trackers[(interface, ip_range)] = FingerprintTracker()
+        delta = tracker.sync(macs)
+        return dict(asdict(tracker.fingerprint()), delta=delta)
+
+@app.before_request
+def start_timer():
+    request.environ['zspoof.start'] = perf_counter()
+
+@app.after_request
+def record_latency(response):
+    """Per-route latency histogram and status counter"""
+    start = request.environ.get('zspoof.start')
+    if start is not None:
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        histogram('zspoof_http_request_seconds', 'Flask handler latency',
+                  method=request.method, route=route).observe(perf_counter() - start)
+        counter('zspoof_http_responses_total', 'Responses by status code',
+                status=str(response.status_code)).inc()
+    if cluster.CLUSTERED:
+        response.headers['X-ZSpoof-Worker'] = str(cluster.WORKER_ID)
+    return response
+
 @app.route('/')
 def index():
     return send_file(INDEX_HTML)
@@ -47,40 +141,29 @@ def health():
         'status': 'operational',
         'timestamp': datetime.now().isoformat(),
         'ml_available': ML_AVAILABLE,
-        'engine_available': BIN_PATH.exists()
+        'engine_available': BIN_PATH.exists(),
+        'oui_registry': get_registry().source
     })
 
+def interface_entry(iface):
+    """API representation of an inventory.InterfaceInfo"""
+    return {
+        'name': iface.name,
+        'mac': iface.mac,
+        'permanent_mac': iface.permanent_mac,
+        'state': iface.operstate,
+        'driver': iface.driver,
+        'ip': iface.ipv4 or 'N/A',
+        'addresses': iface.addresses
+    }
+
 @app.route('/api/interfaces')
 def get_interfaces():
-    """Get network interfaces"""
+    """Get network interfaces (served from memory while the interface stream runs)"""
     try:
-        # Linux
-        result = subprocess.run(['ip', 'link', 'show'], capture_output=True, text=True, timeout=5)
-        interfaces = []
-        
-        for line in result.stdout.split('\n'):
-            if ': ' in line and 'state' in line.lower():
-                parts = line.split(': ')
-                if len(parts) >= 2:
-                    name = parts[1].split(':')[0].split('@')[0]
-                    if name != 'lo':
-                        # Get MAC
-                        mac_result = subprocess.run(['cat', f'/sys/class/net/{name}/address'], 
-                                                   capture_output=True, text=True, timeout=2)
-                        mac = mac_result.stdout.strip() if mac_result.returncode == 0 else 'unknown'
-                        
-                        # Get state
-                        state_result = subprocess.run(['cat', f'/sys/class/net/{name}/operstate'], 
-                                                     capture_output=True, text=True, timeout=2)
-                        state = state_result.stdout.strip() if state_result.returncode == 0 else 'unknown'
-                        
-                        interfaces.append({
-                            'name': name,
-                            'mac': mac,
-                            'state': state,
-                            'ip': 'N/A'
-                        })
-        
+        interfaces = [interface_entry(iface)
+                      for iface in inventory.get_interfaces(refresh=request.args.get('refresh') == '1')
+                      if iface.name != 'lo']
         return jsonify({'interfaces': interfaces})
     except Exception as e:
         return jsonify({'error': str(e), 'interfaces': []}), 500
@@ -91,13 +174,8 @@ def generate_mac():
     data = request.json
     profile = data.get('profile', 'random')
     
-    if not BIN_PATH.exists():
-        return jsonify({'error': 'Engine not compiled'}), 500
-    
     try:
-        # Use C++ engine
-        result = subprocess.run([str(BIN_PATH), profile], capture_output=True, text=True, timeout=5)
-        mac = result.stdout.strip()
+        mac = unique_mac(profile)
         
         # Add ML intelligence if available
         if ML_AVAILABLE and ml_engine:
@@ -121,73 +199,296 @@ def generate_mac():
 
 @app.route('/api/spoof-mac', methods=['POST'])
 def spoof_mac():
-    """Apply MAC spoofing"""
+    """Apply MAC spoofing
+
+    Timings are 'batch'/'total' unless step_timings is true, which sends the
+    down/address/up requests one at a time and times each
+    """
     data = request.json
     interface = data.get('interface')
     mac = data.get('mac')
     profile = data.get('profile', 'custom')
+    step_timings = data.get('step_timings', False)
     
     if not interface or not mac:
         return jsonify({'error': 'Interface and MAC required'}), 400
+    if not isinstance(step_timings, bool):
+        return jsonify({'error': 'step_timings must be a boolean'}), 400
     
-    try:
-        # Linux MAC change
-        subprocess.run(['ip', 'link', 'set', 'dev', interface, 'down'], check=True, timeout=5)
-        subprocess.run(['ip', 'link', 'set', 'dev', interface, 'address', mac], check=True, timeout=5)
-        subprocess.run(['ip', 'link', 'set', 'dev', interface, 'up'], check=True, timeout=5)
-        
-        socketio.emit('mac_spoofed', {
-            'interface': interface,
-            'spoofed_mac': mac,
-            'profile': profile
-        })
-        
+    current = inventory.get_interface(interface)
+    result = apply_one(interface, mac, batch=not step_timings)
+    log_session(Session(
+        interface=interface,
+        mac=mac,
+        profile=profile,
+        original_mac=current.mac if current else None,
+        success=result.success,
+        latency_ms=result.timings.get('total'),
+        error=result.error
+    ))
+    if not result.success:
+        status = 400 if result.errno in (errno.EINVAL, errno.ENODEV) else 500
+        if result.errno == errno.EPERM:
+            message = 'MAC change failed - check permissions'
+        else:
+            message = result.error
         return jsonify({
-            'success': True,
-            'message': 'MAC spoofed successfully',
-            'interface': interface,
-            'mac': mac
-        })
-    except subprocess.CalledProcessError as e:
-        return jsonify({'success': False, 'error': 'MAC change failed - check permissions'}), 500
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+            'success': False,
+            'error': message,
+            'errno': result.errno,
+            'timings': result.timings
+        }), status
+    
+    socketio.emit('mac_spoofed', {
+        'interface': interface,
+        'spoofed_mac': mac,
+        'profile': profile
+    })
+    
+    return jsonify({
+        'success': True,
+        'message': 'MAC spoofed successfully',
+        'interface': interface,
+        'mac': mac,
+        'timings': result.timings
+    })
+
+@app.route('/api/spoof-mac/bulk', methods=['POST'])
+def spoof_mac_bulk():
+    """Apply MACs to several interfaces at once (all-or-nothing)"""
+    data = request.json or {}
+    changes = data.get('changes', [])
+    profile = data.get('profile', 'custom')
+    
+    try:
+        pairs = [(change['interface'], change['mac']) for change in changes]
+        max_workers = int(data.get('max_workers', 16))
+    except (KeyError, TypeError, ValueError):
+        return jsonify({'error': 'changes must be a list of {interface, mac}'}), 400
+    if not pairs:
+        return jsonify({'error': 'At least one change required'}), 400
+    
+    try:
+        result = apply_many(pairs, max_workers=max_workers, rollback=data.get('rollback', True))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    for change in result.results:
+        log_session(Session(
+            interface=change.interface,
+            mac=change.mac,
+            profile=profile,
+            original_mac=change.original_mac,
+            success=change.success and not change.rolled_back,
+            latency_ms=change.latency_ms,
+            error=change.error or ('rolled back' if change.rolled_back else None)
+        ))
+    
+    if result.success:
+        for change in result.results:
+            socketio.emit('mac_spoofed', {
+                'interface': change.interface,
+                'spoofed_mac': change.mac,
+                'profile': profile
+            })
+    
+    return jsonify(result.to_dict()), 200 if result.success else 500
+
+def forward_devices(job, stream, cursor, timeout=0.0):
+    """Emit the devices after cursor as one scan_device batch (waits up to timeout for one)"""
+    batch = stream.take(cursor, timeout)
+    job.check()
+    if batch:
+        job.emit('scan_device', {'job_id': job.id, 'devices': batch})
+        sleep(BATCH_INTERVAL)  # let replies arriving together coalesce into the next batch
+    return cursor + len(batch)
+
+@timed('zspoof_scan_seconds', 'ARP scan job latency')
+def run_scan(job, interface, ip_range, targets, stream):
+    """ARP probe of the stale/missing addresses, streamed as replies arrive (requires scapy)
+    
+    Requests go out per /24 while a sniffer feeds replies into the stream;
+    the table is merged into the scan cache once every target answered or
+    the reply window (ZSPOOF_SCAN_TIMEOUT) closed
+    """
+    try:
+        return stream_scan(job, interface, ip_range, targets, stream)
+    except BaseException as e:
+        if not stream.done:
+            stream.finish({'job_id': job.id, 'count': len(stream.devices),
+                           'error': 'cancelled' if isinstance(e, JobCancelled) else str(e)})
+        raise
+
+def stream_scan(job, interface, ip_range, targets, stream):
+    from scapy.all import ARP, AsyncSniffer, Ether, sendp
+    
+    registry = get_registry()
+    wanted = set(targets)
+    
+    def on_reply(packet):
+        arp = packet[ARP]
+        if arp.op == 2 and int(ipaddress.ip_address(arp.psrc)) in wanted:
+            mac = arp.hwsrc.upper()
+            stream.add(arp.psrc, mac, registry.lookup(mac) or 'unknown')
+    
+    sniffer = AsyncSniffer(iface=interface, store=False, prn=on_reply,
+                           lfilter=lambda packet: ARP in packet)
+    sniffer.start()
+    try:
+        groups = group_targets(ip_range, targets)
+        cursor = 0
+        for i, (block, pdst) in enumerate(groups):
+            job.report(i / len(groups), f'Probing {block}')
+            sendp(Ether(dst="ff:ff:ff:ff:ff:ff")/ARP(pdst=pdst), iface=interface, verbose=0)
+            cursor = forward_devices(job, stream, cursor)
+        job.report(len(groups) / (len(groups) + 1), 'Waiting for replies')
+        deadline = perf_counter() + SCAN_TIMEOUT
+        while len(stream.devices) < len(targets) and perf_counter() < deadline:
+            cursor = forward_devices(job, stream, cursor, deadline - perf_counter())
+    finally:
+        sniffer.stop()
+    while cursor < len(stream.devices):
+        cursor = forward_devices(job, stream, cursor)
+    
+    replies = [(device['ip'], device['mac'], device['vendor']) for device in stream.devices]
+    devices = scan_cache.merge(interface, ip_range, targets, replies)
+    observe_addresses(stream.devices)  # never hand out a MAC already on this network
+    first = stream.first_device_s
+    if first is not None:
+        histogram('zspoof_scan_first_device_seconds', 'Scan start to first ARP reply').observe(first)
+    summary = dict(scan_summary(interface, ip_range, devices, probed=len(targets)),
+                   job_id=job.id, replies=len(replies),
+                   first_device_ms=round(first * 1000, 1) if first is not None else None)
+    stream.finish(summary)
+    job.emit('scan_complete', summary)
+    return summary
+
+def scan_summary(interface, ip_range, devices, probed):
+    """Scan totals; the fingerprint follows the cached device table"""
+    macs = MacArray.from_strings([device['mac'] for device in devices])
+    return {
+        'count': len(devices),
+        'ip_range': ip_range,
+        'probed': probed,
+        'cached': probed == 0,
+        'fingerprint': update_fingerprint(interface, ip_range, macs)
+    }
+
+def wants_stream():
+    return request.args.get('stream') == '1' or NDJSON_MIMETYPE in request.headers.get('Accept', '')
+
+def ndjson_response(stream, head=None):
+    """Chunked NDJSON body that follows a scan stream"""
+    return Response(ndjson_lines(stream, head), mimetype=NDJSON_MIMETYPE,
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 @app.route('/api/scan-network', methods=['POST'])
 def scan_network():
-    """Network scan (requires scapy)"""
-    data = request.json
+    """Scan a range through the TTL cache (mode: cached, stale or full)
+    
+    Answers 200 from the cache when nothing needs probing, otherwise starts
+    a scan job (requires scapy) over only the stale or missing addresses.
+    Devices are pushed as scan_device events while the job runs; with
+    ?stream=1 (or Accept: application/x-ndjson) this response itself is an
+    NDJSON stream of job, device and summary lines
+    """
+    data = request.json or {}
     interface = data.get('interface')
     ip_range = data.get('ip_range', '192.168.1.0/24')
+    mode = data.get('mode', STALE)
     
+    if mode not in SCAN_MODES:
+        return jsonify({'error': f"mode must be one of {', '.join(SCAN_MODES)}"}), 400
     try:
-        from scapy.all import ARP, Ether, srp
-        
-        arp = ARP(pdst=ip_range)
-        ether = Ether(dst="ff:ff:ff:ff:ff:ff")
-        packet = ether/arp
-        
-        result = srp(packet, timeout=3, verbose=0, iface=interface)[0]
-        
-        devices = []
-        for sent, received in result:
-            devices.append({'ip': received.psrc, 'mac': received.hwsrc})
-        
-        socketio.emit('scan_complete', {
-            'devices': devices,
-            'count': len(devices),
-            'ip_range': ip_range
-        })
-        
-        return jsonify({
-            'success': True,
-            'devices': devices,
-            'count': len(devices)
-        })
+        if ipaddress.ip_network(ip_range, strict=False).version != 4:
+            return jsonify({'error': 'ARP scans need an IPv4 range'}), 400
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    targets = scan_cache.plan(interface, ip_range, mode)
+    if not targets:
+        devices = scan_cache.devices(interface, ip_range)
+        summary = scan_summary(interface, ip_range, devices, 0)
+        if wants_stream():
+            return ndjson_response(ScanStream.completed(devices, summary))
+        return jsonify(dict(summary, devices=devices))
+    
+    try:
+        import scapy  # noqa: F401
     except ImportError:
         return jsonify({'error': 'Scapy not installed'}), 500
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    
+    stream = ScanStream()
+    try:
+        job = submit_job('scan', run_scan, interface, ip_range, targets, stream)
+    except JobLimitError as e:
+        return jsonify({'error': str(e)}), 429
+    stream.job_id = job.id
+    stream.alive = lambda: job.state not in FINISHED
+    if wants_stream():
+        return ndjson_response(stream, job_accepted(job))
+    return jsonify(job_accepted(job)), 202
+
+@app.route('/api/neighbors')
+def list_neighbors():
+    """Passive device list from the kernel neighbour table (no packets sent)"""
+    interface = request.args.get('interface')
+    start = perf_counter()
+    devices = neighbors.get_devices(interface, get_registry())
+    elapsed_ms = (perf_counter() - start) * 1000
+    observe_addresses(devices)
+    macs = MacArray.from_strings([device['mac'] for device in devices])
+    return jsonify({
+        'devices': devices,
+        'count': len(devices),
+        'source': 'neighbors',
+        'elapsed_ms': round(elapsed_ms, 3),
+        'fingerprint': update_fingerprint(interface, 'neighbors', macs)
+    })
+
+def run_analysis(job, devices):
+    """Deep analysis job body"""
+    job.report(0.0, f'Analyzing {len(devices)} devices')
+    return network_analyzer.perform_deep_analysis(devices)
+
+@app.route('/api/analyze', methods=['POST'])
+def analyze_network():
+    """Start a deep analysis job over posted devices, MAC strings or the neighbour table"""
+    if not ML_AVAILABLE:
+        return jsonify({'error': 'ML engine not available'}), 503
+    data = request.json or {}
+    if data.get('source') == 'neighbors':
+        devices = neighbors.get_devices(data.get('interface'), get_registry())
+        if not devices:
+            return jsonify({'error': 'Neighbour table is empty'}), 404
+    else:
+        devices = data.get('devices')
+    if not isinstance(devices, list) or not devices:
+        return jsonify({'error': 'devices must be a non-empty list'}), 400
+    
+    return start_job('analysis', run_analysis, devices)
+
+@app.route('/api/jobs')
+def list_jobs():
+    """Recent jobs, newest first"""
+    listed = [job.status() for job in jobs.list(kind=request.args.get('kind'))]
+    return jsonify({'jobs': listed, 'count': len(listed)})
+
+@app.route('/api/jobs/<job_id>')
+def get_job(job_id):
+    """Job status, with the result once finished"""
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    """Cancel a queued or running job"""
+    job = jobs.cancel(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    return jsonify(job.status())
 
 @app.route('/api/profiles')
 def get_profiles():
@@ -204,25 +505,108 @@ def get_profiles():
 
 @app.route('/api/stats')
 def get_stats():
-    """Get statistics"""
-    # Simple stats (could be enhanced with database)
-    return jsonify({
-        'total_sessions': 0,
-        'active_session': None,
-        'ml_available': ML_AVAILABLE
-    })
+    """Get statistics (incrementally maintained counters)"""
+    stats = get_store().stats()
+    last = stats['last_session']
+    stats['active_session'] = last if last and last['success'] else None
+    stats['ml_available'] = ML_AVAILABLE
+    return jsonify(stats)
 
 @app.route('/api/sessions')
 def get_sessions():
-    """Get session history"""
+    """Get session history, newest first (keyset pagination via ?before=<cursor>)"""
+    try:
+        limit = min(max(int(request.args.get('limit', 50)), 1), 500)
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    # Checked here rather than with type=: Flask turns a bad value into None,
+    # which would silently drop the filter
+    bounds = {}
+    for name, kind, expected in (('before', int, 'an integer cursor'),
+                                 ('since', float, 'a Unix timestamp'),
+                                 ('until', float, 'a Unix timestamp')):
+        value = request.args.get(name)
+        try:
+            bounds[name] = None if value is None else kind(value)
+            if not math.isfinite(bounds[name] or 0):
+                raise ValueError(value)
+        except ValueError:
+            return jsonify({'error': f'{name} must be {expected}'}), 400
+    
+    sessions, cursor = get_store().sessions(
+        limit=limit,
+        **bounds,
+        interface=request.args.get('interface'),
+        profile=request.args.get('profile')
+    )
     return jsonify({
-        'sessions': [],
-        'count': 0
+        'sessions': [s.to_dict() for s in sessions],
+        'count': len(sessions),
+        'next_cursor': cursor
     })
 
+@app.route('/api/metrics')
+def get_metrics():
+    """Prometheus text exposition of every counter and histogram"""
+    return Response(REGISTRY.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+def stream_metrics():
+    """Push a metrics snapshot to Socket.IO clients every METRICS_INTERVAL seconds"""
+    while True:
+        socketio.emit('metrics', REGISTRY.snapshot())
+        socketio.sleep(METRICS_INTERVAL)
+
+def stream_neighbors():
+    """Push neighbour table additions and removals to Socket.IO clients"""
+    try:
+        watcher = neighbors.NeighborWatcher()
+    except OSError:
+        return  # no rtnetlink: clients can still poll /api/neighbors
+    registry = get_registry()
+    observe_addresses(watcher.devices(registry))
+    while True:
+        added = []
+        for event, entry in watcher.poll():
+            device = entry.to_device(registry)
+            socketio.emit('neighbor_update', {'event': event, 'device': device})
+            if event == neighbors.ADDED:
+                added.append(device)
+        if added:
+            observe_addresses(added)
+        socketio.sleep(NEIGHBOR_INTERVAL)
+
+def stream_interfaces():
+    """Push coalesced interface additions, changes and removals to Socket.IO clients"""
+    try:
+        watcher = inventory.InterfaceWatcher()
+    except OSError:
+        return  # no rtnetlink: clients can still poll /api/interfaces
+    while True:
+        changes = [{'event': event, 'interface': interface_entry(iface), 'fields': fields}
+                   for event, iface, fields in watcher.poll() if iface.name != 'lo']
+        if changes:
+            socketio.emit('interface_changed', {'changes': changes, 'count': len(changes)})
+        socketio.sleep(INTERFACE_INTERVAL)
+
+def start_streams():
+    """Start the metrics, neighbour and interface streams once (the leader's job under serve.py)"""
+    global metrics_stream_started, neighbor_stream_started, interface_stream_started
+    with pump_lock:
+        if not metrics_stream_started:
+            socketio.start_background_task(stream_metrics)
+            metrics_stream_started = True
+        if not neighbor_stream_started:
+            socketio.start_background_task(stream_neighbors)
+            neighbor_stream_started = True
+        if not interface_stream_started:
+            socketio.start_background_task(stream_interfaces)
+            interface_stream_started = True
+
 @socketio.on('connect')
 def handle_connect():
     print('✓ Client connected')
+    if cluster.is_leader():
+        start_streams()
 
 @socketio.on('disconnect')
 def handle_disconnect():
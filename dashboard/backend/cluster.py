@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+ZSPOOF Cluster - Multi-worker settings for the dashboard
+Workers started by serve.py find their id, the event-bus socket and the
+shared state database in the environment; a plain `python3 app.py` sees
+none of them and keeps the single-process behaviour
+"""
+
+import os
+from typing import Dict, Optional
+
+import socketio
+
+from event_bus import BusClient
+from shared_state import StateStore
+
+WORKER_ID = int(os.environ.get('ZSPOOF_WORKER_ID', 0))
+WORKERS = int(os.environ.get('ZSPOOF_WORKERS', 1))
+BUS_PATH = os.environ.get('ZSPOOF_BUS_PATH')
+CLUSTERED = BUS_PATH is not None
+
+
+def is_leader() -> bool:
+    """Worker that runs the cluster-wide streams (metrics, neighbour watch)"""
+    return WORKER_ID == 0
+
+
+class BusManager(socketio.PubSubManager):
+    """Socket.IO client manager that fans emits out over the Unix-socket bus
+
+    python-socketio publishes every emit here and applies whatever _listen()
+    yields (own messages included) to the clients connected to this worker
+    """
+    name = 'zspoof-bus'
+
+    def __init__(self, path: str, channel: str = 'socketio', write_only: bool = False, logger=None):
+        super().__init__(channel=channel, write_only=write_only, logger=logger)
+        self.bus = BusClient(path)
+
+    def _publish(self, data):
+        self.bus.publish(data)
+
+    def _listen(self):
+        yield from self.bus.listen()
+
+
+def socketio_options() -> Dict:
+    """Extra SocketIO() arguments: the bus manager when clustered
+
+    Workers serve through werkzeug threads (serve.py), so the async mode is
+    pinned to threading instead of whatever happens to be installed
+    """
+    if not CLUSTERED:
+        return {}
+    return {'async_mode': 'threading', 'client_manager': BusManager(BUS_PATH)}
+
+
+def state_store() -> Optional[StateStore]:
+    """Shared scan/job state when clustered (ZSPOOF_STATE_DB), else None"""
+    return StateStore() if CLUSTERED else None
+
+
+# Export
+__all__ = ['WORKER_ID', 'WORKERS', 'CLUSTERED', 'BusManager', 'is_leader',
+           'socketio_options', 'state_store']
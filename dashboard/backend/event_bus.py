@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+ZSPOOF Event Bus - Cross-worker Socket.IO fan-out over a Unix socket
+The serve.py supervisor runs one EventBus hub; every dashboard worker keeps
+a BusClient connection to it and each published message is relayed to all
+connected workers (publisher included), so no external broker is needed
+"""
+
+import json
+import os
+import selectors
+import socket
+import struct
+import sys
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
+FRAME = struct.Struct('!I')   # big-endian body length, then a JSON body
+MAX_FRAME = 16 << 20
+MAX_BACKLOG = 64 << 20        # a worker this far behind is dropped (it reconnects)
+RECONNECT_DELAY = 0.5
+
+
+def encode(message: Dict) -> bytes:
+    body = json.dumps(message, separators=(',', ':'), default=str).encode()
+    return FRAME.pack(len(body)) + body
+
+
+class FrameReader:
+    """Reassembles length-prefixed frames from arbitrary recv() chunks"""
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def frames(self, data: bytes) -> List[bytes]:
+        """Complete frame bodies contained in the stream so far"""
+        buffer = self._buffer
+        buffer += data
+        bodies = []
+        offset = 0
+        while len(buffer) - offset >= FRAME.size:
+            (length,) = FRAME.unpack_from(buffer, offset)
+            if length > MAX_FRAME:
+                raise ValueError(f"Frame of {length} bytes exceeds {MAX_FRAME}")
+            end = offset + FRAME.size + length
+            if end > len(buffer):
+                break
+            bodies.append(bytes(buffer[offset + FRAME.size:end]))
+            offset = end
+        del buffer[:offset]
+        return bodies
+
+    def messages(self, data: bytes) -> List[Dict]:
+        return [json.loads(body) for body in self.frames(data)]
+
+
+class _Peer:
+    __slots__ = ('sock', 'reader', 'out')
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.reader = FrameReader()
+        self.out = bytearray()
+
+
+class EventBus:
+    """Relay hub: every frame a peer sends goes out to every connected peer"""
+
+    def __init__(self, path: str, max_backlog: int = MAX_BACKLOG):
+        self.path = path
+        self.max_backlog = max_backlog
+        self.relayed = 0
+        self._server: Optional[socket.socket] = None
+        self._peers: Dict[socket.socket, _Peer] = {}
+        self._selector = selectors.DefaultSelector()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = threading.Event()
+
+    def __enter__(self) -> 'EventBus':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def peers(self) -> int:
+        return len(self._peers)
+
+    def start(self) -> 'EventBus':
+        """Bind the socket (replacing a stale one) and relay on a daemon thread"""
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self.path)
+        os.chmod(self.path, 0o600)
+        server.listen(128)
+        server.setblocking(False)
+        self._server = server
+        self._selector.register(server, selectors.EVENT_READ)
+        self._thread = threading.Thread(target=self._loop, name='zspoof-bus', daemon=True)
+        self._thread.start()
+        return self
+
+    def _drop(self, peer: _Peer) -> None:
+        self._selector.unregister(peer.sock)
+        del self._peers[peer.sock]
+        peer.sock.close()
+
+    def _relay(self, body: bytes) -> None:
+        frame = FRAME.pack(len(body)) + body
+        for peer in list(self._peers.values()):
+            if len(peer.out) + len(frame) > self.max_backlog:
+                print(f"[event_bus] dropping a peer {len(peer.out)} bytes behind", file=sys.stderr)
+                self._drop(peer)
+                continue
+            if not peer.out:
+                self._selector.modify(peer.sock, selectors.EVENT_READ | selectors.EVENT_WRITE, peer)
+            peer.out += frame
+        self.relayed += 1
+
+    def _read(self, peer: _Peer) -> None:
+        try:
+            data = peer.sock.recv(1 << 16)
+            bodies = peer.reader.frames(data) if data else None
+        except (OSError, ValueError):
+            bodies = None
+        if bodies is None:
+            self._drop(peer)
+            return
+        for body in bodies:
+            self._relay(body)
+
+    def _write(self, peer: _Peer) -> None:
+        try:
+            sent = peer.sock.send(peer.out)
+        except BlockingIOError:
+            return
+        except OSError:
+            self._drop(peer)
+            return
+        del peer.out[:sent]
+        if not peer.out:
+            self._selector.modify(peer.sock, selectors.EVENT_READ, peer)
+
+    def _loop(self) -> None:
+        while not self._closed.is_set():
+            try:
+                ready = self._selector.select(0.5)
+            except (OSError, ValueError):
+                return  # closed under us
+            for key, mask in ready:
+                if key.data is None:
+                    try:
+                        sock, _ = self._server.accept()
+                    except OSError:
+                        continue
+                    sock.setblocking(False)
+                    peer = self._peers[sock] = _Peer(sock)
+                    self._selector.register(sock, selectors.EVENT_READ, peer)
+                    continue
+                peer = key.data
+                if mask & selectors.EVENT_READ and peer.sock in self._peers:
+                    self._read(peer)
+                if mask & selectors.EVENT_WRITE and peer.sock in self._peers:
+                    self._write(peer)
+
+    def close(self) -> None:
+        self._closed.set()
+        if self._thread is not None:
+            self._thread.join()
+        for peer in list(self._peers.values()):
+            self._drop(peer)
+        if self._server is not None:
+            self._selector.unregister(self._server)
+            self._server.close()
+            self._server = None
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+        self._selector.close()
+
+
+class BusClient:
+    """One worker's connection to the hub
+
+    publish() is safe from any thread; listen() is a blocking generator for
+    a single consumer thread and reconnects (with RECONNECT_DELAY backoff)
+    whenever the hub goes away. Messages sent while disconnected are lost.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._sock: Optional[socket.socket] = None
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._closed = False
+
+    def _connect(self) -> socket.socket:
+        with self._lock:
+            if self._closed:
+                raise OSError("Bus client closed")
+            if self._sock is None:
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                try:
+                    sock.connect(self.path)
+                except OSError:
+                    sock.close()
+                    raise
+                self._sock = sock
+            return self._sock
+
+    def _reset(self, sock: socket.socket) -> None:
+        with self._lock:
+            if self._sock is sock:
+                self._sock = None
+        sock.close()
+
+    def connected(self) -> bool:
+        return self._sock is not None
+
+    def publish(self, message: Dict) -> bool:
+        """Send one message; False when the hub is unreachable"""
+        frame = encode(message)
+        for _ in range(2):  # a fresh connection if the old one went stale
+            try:
+                sock = self._connect()
+            except OSError:
+                return False
+            try:
+                with self._send_lock:
+                    sock.sendall(frame)
+                return True
+            except OSError:
+                self._reset(sock)
+        return False
+
+    def listen(self) -> Iterator[Dict]:
+        """Every message relayed by the hub, forever (until close())"""
+        while not self._closed:
+            try:
+                sock = self._connect()
+            except OSError:
+                time.sleep(RECONNECT_DELAY)
+                continue
+            reader = FrameReader()
+            while True:
+                try:
+                    data = sock.recv(1 << 16)
+                    messages = reader.messages(data) if data else None
+                except (OSError, ValueError):
+                    messages = None
+                if messages is None:
+                    self._reset(sock)
+                    break
+                yield from messages
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            sock, self._sock = self._sock, None
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+
+
+# Export
+__all__ = ['EventBus', 'BusClient', 'FrameReader', 'encode']
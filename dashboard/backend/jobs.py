@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+ZSPOOF Jobs - Background work for the dashboard
+Long operations (network scans, deep analyses) run on a native thread pool
+so request workers and the Socket.IO event loop never block on them;
+progress and results are queued for the Socket.IO pump to emit. Given a
+StateStore, job snapshots are mirrored there so any serve.py worker can
+report on (and cancel) a job another worker runs
+"""
+
+import os
+import queue
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+
+DEFAULT_WORKERS = int(os.environ.get('ZSPOOF_JOB_WORKERS', 4))
+DEFAULT_MAX_PENDING = int(os.environ.get('ZSPOOF_JOB_MAX_PENDING', 32))
+DEFAULT_RETENTION = 3600.0
+
+
+class JobCancelled(Exception):
+    """Raised inside a job once cancellation was requested"""
+
+
+class JobLimitError(RuntimeError):
+    """Raised when a submit would exceed the configured concurrency limits"""
+
+
+@dataclass
+class Job:
+    """One unit of background work and its observable state"""
+    id: str
+    kind: str
+    state: str = QUEUED
+    progress: float = 0.0
+    message: str = ''
+    result: Any = None
+    error: Optional[str] = None
+    created: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    _cancel: threading.Event = field(default_factory=threading.Event, repr=False)
+    _future: Optional[Future] = field(default=None, repr=False)
+    _manager: Optional['JobManager'] = field(default=None, repr=False)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Job':
+        """Read-only snapshot of a job owned by another worker"""
+        return cls(**data)
+
+    @property
+    def cancelled(self) -> bool:
+        if not self._cancel.is_set() and self._manager is not None and self._manager._remote_cancel(self):
+            self._cancel.set()
+        return self._cancel.is_set()
+
+    def check(self) -> None:
+        """Cooperative cancellation point for the job body"""
+        if self.cancelled:
+            raise JobCancelled(self.id)
+
+    def report(self, progress: float, message: str = '') -> None:
+        """Record progress (0..1) and queue a job_update event"""
+        self.check()
+        self.progress = max(0.0, min(1.0, progress))
+        self.message = message
+        self._manager._publish('job_update', self.status())
+        self._manager._save(self)
+
+    def emit(self, event: str, payload: Dict) -> None:
+        """Queue a custom Socket.IO event (safe from the worker thread)"""
+        self._manager._publish(event, payload)
+
+    def status(self) -> Dict:
+        """Public view without the result payload"""
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'state': self.state,
+            'progress': round(self.progress, 4),
+            'message': self.message,
+            'error': self.error,
+            'created': self.created,
+            'started': self.started,
+            'finished': self.finished,
+        }
+
+    def to_dict(self) -> Dict:
+        return dict(self.status(), result=self.result)
+
+
+class JobManager:
+    """Thread-pool job runner with per-kind limits and cooperative cancellation"""
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_WORKERS,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        limits: Optional[Dict[str, int]] = None,
+        retention: float = DEFAULT_RETENTION,
+        store=None
+    ):
+        self.max_pending = max_pending
+        self.limits = dict(limits or {})
+        self.retention = retention
+        self.store = store
+        self.events: 'queue.Queue[tuple]' = queue.Queue()
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='zspoof-job')
+
+    def _publish(self, event: str, payload: Dict) -> None:
+        self.events.put((event, payload))
+
+    def _save(self, job: Job) -> None:
+        """Mirror a job's state for the other workers"""
+        if self.store is not None:
+            self.store.put(f'job:{job.id}', job.to_dict())
+
+    def _remote(self, job_id: str) -> Optional[Job]:
+        if self.store is None:
+            return None
+        _, data = self.store.get(f'job:{job_id}')
+        return Job.from_dict(data) if data else None
+
+    def _remote_cancel(self, job: Job) -> bool:
+        return self.store is not None and self.store.version(f'cancel:{job.id}') > 0
+
+    def _active(self, kind: Optional[str] = None) -> List[Job]:
+        return [job for job in self._jobs.values()
+                if job.state not in FINISHED and (kind is None or job.kind == kind)]
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.retention
+        expired = [j.id for j in self._jobs.values() if j.finished and j.finished < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+        if expired and self.store is not None:
+            self.store.delete(*[f'{prefix}:{job_id}' for job_id in expired for prefix in ('job', 'cancel')])
+
+    def submit(self, kind: str, fn: Callable[..., Any], *args, **kwargs) -> Job:
+        """Queue fn(job, *args, **kwargs); its return value becomes job.result"""
+        with self._lock:
+            self._prune()
+            if len(self._active()) >= self.max_pending:
+                raise JobLimitError(f"Too many pending jobs (limit {self.max_pending})")
+            limit = self.limits.get(kind)
+            if limit is not None and len(self._active(kind)) >= limit:
+                raise JobLimitError(f"Too many {kind} jobs (limit {limit})")
+            job = Job(id=uuid.uuid4().hex, kind=kind, _manager=self)
+            self._jobs[job.id] = job
+            self._save(job)
+            job._future = self._pool.submit(self._run, job, fn, args, kwargs)
+        self._publish('job_update', job.status())
+        return job
+
+    def _run(self, job: Job, fn: Callable[..., Any], args: tuple, kwargs: Dict) -> None:
+        if job.cancelled:
+            self._finish(job, CANCELLED)
+            return
+        job.state = RUNNING
+        job.started = time.time()
+        self._publish('job_update', job.status())
+        self._save(job)
+        try:
+            job.result = fn(job, *args, **kwargs)
+        except JobCancelled:
+            self._finish(job, CANCELLED)
+        except Exception as e:
+            job.error = str(e)
+            self._finish(job, FAILED)
+        else:
+            job.progress = 1.0
+            self._finish(job, SUCCEEDED)
+
+    def _finish(self, job: Job, state: str) -> None:
+        job.state = state
+        job.finished = time.time()
+        self._publish('job_complete', job.to_dict())
+        self._save(job)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id) or self._remote(job_id)
+
+    def list(self, kind: Optional[str] = None) -> List[Job]:
+        jobs = [job for job in self._jobs.values() if kind is None or job.kind == kind]
+        if self.store is not None:
+            jobs += [Job.from_dict(data) for _, data in self.store.items('job:')
+                     if data['id'] not in self._jobs and (kind is None or data['kind'] == kind)]
+        return sorted(jobs, key=lambda job: job.created, reverse=True)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Request cancellation; queued jobs never start, running ones stop at check()
+
+        A job owned by another worker gets a shared cancel flag its check() picks up
+        """
+        job = self._jobs.get(job_id)
+        if job is None:
+            job = self._remote(job_id)
+            if job is not None and job.state not in FINISHED:
+                self.store.put(f'cancel:{job_id}', True)
+            return job
+        if job.state in FINISHED:
+            return job
+        job._cancel.set()
+        if job._future is not None and job._future.cancel():
+            self._finish(job, CANCELLED)
+        return job
+
+    def pump(self, emit: Callable[[str, Dict], Any], sleep: Callable[[float], Any],
+             interval: float = 0.05) -> None:
+        """Forward queued events forever; run via socketio.start_background_task"""
+        while True:
+            try:
+                while True:
+                    emit(*self.events.get_nowait())
+            except queue.Empty:
+                pass
+            sleep(interval)
+
+    def shutdown(self, wait: bool = True) -> None:
+        for job in self._active():
+            job._cancel.set()
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+# Export
+__all__ = ['Job', 'JobManager', 'JobCancelled', 'JobLimitError']
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+ZSPOOF Scan Cache - Incremental ARP scans for the dashboard
+Keeps a device table per (interface, range) with per-address probe times so
+refreshes only re-probe addresses whose last answer (or silence) is older
+than the TTL; a refresh with nothing stale answers straight from memory.
+Given a StateStore, tables are shared by every serve.py worker
+"""
+
+import ipaddress
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+CACHED = 'cached'   # never probe
+STALE = 'stale'     # probe missing or expired addresses only
+FULL = 'full'       # probe everything
+MODES = (CACHED, STALE, FULL)
+
+DEFAULT_TTL = float(os.environ.get('ZSPOOF_SCAN_TTL', 60))
+
+
+@dataclass
+class Device:
+    """One host that answered ARP"""
+    ip: str
+    mac: str
+    vendor: str
+    first_seen: float
+    last_seen: float
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+@dataclass
+class ScanTable:
+    """Devices and probe times for one (interface, range)"""
+    interface: Optional[str]
+    ip_range: str
+    devices: Dict[str, Device] = field(default_factory=dict)
+    probed: Dict[int, float] = field(default_factory=dict)  # address -> last probe time
+
+    def snapshot(self) -> List[Dict]:
+        """Devices as dicts in address order"""
+        ordered = sorted(self.devices.values(), key=lambda d: ipaddress.ip_address(d.ip))
+        return [device.to_dict() for device in ordered]
+
+    def to_doc(self) -> Dict:
+        """JSON form for the shared store; probes are grouped by time (one group per round)"""
+        rounds: Dict[float, List[int]] = {}
+        for address, when in self.probed.items():
+            rounds.setdefault(when, []).append(address)
+        return {
+            'devices': [device.to_dict() for device in self.devices.values()],
+            'probed': [[when, addresses] for when, addresses in rounds.items()],
+        }
+
+    def load(self, doc: Optional[Dict]) -> None:
+        """Replace the contents with a to_doc() document (None empties the table)"""
+        doc = doc or {'devices': [], 'probed': []}
+        self.devices = {d['ip']: Device(**d) for d in doc['devices']}
+        self.probed = {address: when for when, addresses in doc['probed'] for address in addresses}
+
+
+def host_addresses(ip_range: str) -> range:
+    """Probe-able addresses of a network as integers (no network/broadcast)"""
+    network = ipaddress.ip_network(ip_range, strict=False)
+    first, last = int(network.network_address), int(network.broadcast_address)
+    if network.num_addresses > 2:
+        return range(first + 1, last)
+    return range(first, last + 1)
+
+
+def group_targets(ip_range: str, targets: List[int]) -> List[Tuple[str, object]]:
+    """Split targets per /24 block: (block, CIDR string if all hosts else address list)
+
+    Hosts are those of the whole range, so inside a /16 a block's .0 and .255
+    are targets like any other address
+    """
+    network = ipaddress.ip_network(ip_range, strict=False)
+    blocks = [network] if network.prefixlen >= 24 else list(network.subnets(new_prefix=24))
+    valid = host_addresses(ip_range)
+    wanted = set(targets)
+    groups = []
+    for block in blocks:
+        hosts = range(max(int(block.network_address), valid.start),
+                      min(int(block.broadcast_address) + 1, valid.stop))
+        chosen = [a for a in hosts if a in wanted]
+        if not chosen:
+            continue
+        if len(chosen) == len(hosts):
+            groups.append((str(block), str(block)))
+        else:
+            groups.append((str(block), [str(ipaddress.ip_address(a)) for a in chosen]))
+    return groups
+
+
+def _doc_key(key: Tuple[Optional[str], str]) -> str:
+    return 'scan:' + json.dumps(list(key))
+
+
+class ScanCache:
+    """Thread-safe scan tables keyed by (interface, range)
+
+    With a shared_state.StateStore every worker reads and merges the same
+    tables: reads reload a table only when its stored version moved, merges
+    apply to the latest stored table under the store's write lock
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL, store=None):
+        self.ttl = ttl
+        self.store = store
+        self._tables: Dict[Tuple[Optional[str], str], ScanTable] = {}
+        self._versions: Dict[Tuple[Optional[str], str], int] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, interface: Optional[str], ip_range: str) -> Tuple[Optional[str], str]:
+        return interface, str(ipaddress.ip_network(ip_range, strict=False))
+
+    def _table(self, interface: Optional[str], ip_range: str, sync: bool = True) -> ScanTable:
+        key = self._key(interface, ip_range)
+        with self._lock:
+            table = self._tables.get(key)
+            if table is None:
+                table = self._tables[key] = ScanTable(interface, key[1])
+        if sync and self.store is not None:
+            self._sync(key, table)
+        return table
+
+    def _sync(self, key: Tuple[Optional[str], str], table: ScanTable) -> None:
+        """Reload a table another worker changed since this process last saw it"""
+        if self.store.version(_doc_key(key)) == self._versions.get(key, 0):
+            return
+        version, doc = self.store.get(_doc_key(key))
+        with self._lock:
+            table.load(doc)
+            self._versions[key] = version
+
+    def plan(self, interface: Optional[str], ip_range: str, mode: str = STALE,
+             now: Optional[float] = None) -> List[int]:
+        """Addresses a refresh in `mode` has to probe"""
+        if mode not in MODES:
+            raise ValueError(f"Unknown scan mode: {mode}")
+        if mode == CACHED:
+            return []
+        hosts = host_addresses(ip_range)
+        if mode == FULL:
+            return list(hosts)
+        now = time.time() if now is None else now
+        table = self._table(interface, ip_range)
+        with self._lock:
+            probed = table.probed
+            cutoff = now - self.ttl
+            return [a for a in hosts if probed.get(a, 0.0) <= cutoff]
+
+    def devices(self, interface: Optional[str], ip_range: str) -> List[Dict]:
+        """Current device table (hosts that answered their latest probe)"""
+        table = self._table(interface, ip_range)
+        with self._lock:
+            return table.snapshot()
+
+    def merge(self, interface: Optional[str], ip_range: str, probed: Iterable[int],
+              replies: Iterable[Tuple[str, str, str]], now: Optional[float] = None) -> List[Dict]:
+        """Fold one probe round in: (ip, mac, vendor) replies; silent addresses drop out"""
+        now = time.time() if now is None else now
+        probed = set(probed)
+        key = self._key(interface, ip_range)
+        table = self._table(interface, ip_range, sync=False)
+        if self.store is None:
+            with self._lock:
+                return self._merge(table, probed, replies, now)
+        with self.store.update(_doc_key(key)) as doc:
+            with self._lock:
+                table.load(doc.value)  # latest shared table, under the write lock
+                devices = self._merge(table, probed, replies, now)
+                doc.value = table.to_doc()
+        with self._lock:
+            self._versions[key] = doc.version
+        return devices
+
+    def _merge(self, table: ScanTable, probed: set, replies: Iterable[Tuple[str, str, str]],
+               now: float) -> List[Dict]:
+        for address in probed:
+            table.probed[address] = now
+        answered = set()
+        for ip, mac, vendor in replies:
+            answered.add(ip)
+            device = table.devices.get(ip)
+            if device is None or device.mac != mac:
+                table.devices[ip] = Device(ip, mac, vendor, now, now)
+            else:
+                device.last_seen = now
+        for ip in list(table.devices):
+            if ip not in answered and int(ipaddress.ip_address(ip)) in probed:
+                del table.devices[ip]
+        return table.snapshot()
+
+    def invalidate(self, interface: Optional[str] = None) -> None:
+        """Forget every table, or those of one interface"""
+        with self._lock:
+            if interface is None:
+                self._tables.clear()
+                self._versions.clear()
+            else:
+                for key in [k for k in self._tables if k[0] == interface]:
+                    del self._tables[key]
+                    self._versions.pop(key, None)
+        if self.store is not None:
+            self.store.delete(*[doc_key for doc_key, _ in self.store.items('scan:')
+                                if interface is None or json.loads(doc_key[5:])[0] == interface])
+
+
+# Export
+__all__ = ['ScanCache', 'ScanTable', 'Device', 'MODES', 'CACHED', 'STALE', 'FULL',
+           'host_addresses', 'group_targets']
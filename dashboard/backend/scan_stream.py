@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+ZSPOOF Scan Stream - Incremental scan results
+ARP replies land in one append-only device list as they arrive; the scan
+job and NDJSON responses follow it with their own cursor and take all that
+is new in one slice, so a slow consumer gets bigger batches rather than a
+growing queue, and no consumer holds a second copy of the list
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional
+
+BATCH_INTERVAL = float(os.environ.get('ZSPOOF_SCAN_BATCH_MS', 50)) / 1000
+MAX_BATCH = 256
+LIVENESS_INTERVAL = 1.0
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+
+class ScanStream:
+    """Devices of one scan in arrival order, then a summary
+
+    `alive` (set by the producer's owner) lets followers notice a scan that
+    ended without finishing the stream, e.g. a job cancelled while queued
+    """
+
+    def __init__(self, job_id: Optional[str] = None, alive: Optional[Callable[[], bool]] = None):
+        self.job_id = job_id
+        self.alive = alive
+        self.devices: List[Dict] = []
+        self.summary: Optional[Dict] = None
+        self.started = time.perf_counter()
+        self.first_device_s: Optional[float] = None
+        self._seen = set()
+        self._cond = threading.Condition()
+
+    @classmethod
+    def completed(cls, devices: List[Dict], summary: Dict) -> 'ScanStream':
+        """An already finished stream (answers served from the scan cache)"""
+        stream = cls()
+        stream.devices = devices
+        stream.summary = summary
+        return stream
+
+    @property
+    def done(self) -> bool:
+        return self.summary is not None
+
+    def add(self, ip: str, mac: str, vendor: str) -> bool:
+        """Record one reply (safe from the sniffer thread); repeats are ignored"""
+        with self._cond:
+            if ip in self._seen or self.summary is not None:
+                return False
+            self._seen.add(ip)
+            if self.first_device_s is None:
+                self.first_device_s = time.perf_counter() - self.started
+            self.devices.append({'ip': ip, 'mac': mac, 'vendor': vendor})
+            self._cond.notify_all()
+            return True
+
+    def finish(self, summary: Dict) -> None:
+        """Close the stream; the first summary wins"""
+        with self._cond:
+            if self.summary is None:
+                self.summary = summary
+            self._cond.notify_all()
+
+    def take(self, cursor: int, timeout: Optional[float] = None) -> List[Dict]:
+        """Devices after cursor (at most MAX_BATCH), waiting up to timeout for the first"""
+        with self._cond:
+            self._cond.wait_for(lambda: len(self.devices) > cursor or self.summary is not None, timeout)
+            return self.devices[cursor:cursor + MAX_BATCH]
+
+    def follow(self, interval: float = BATCH_INTERVAL) -> Iterator[List[Dict]]:
+        """Batches until the summary arrives
+
+        The first device goes out as soon as it lands; after each batch the
+        follower pauses `interval` so replies arriving together coalesce
+        """
+        cursor = 0
+        while True:
+            batch = self.take(cursor, LIVENESS_INTERVAL)
+            if batch:
+                cursor += len(batch)
+                yield batch
+                if interval and not self.done:
+                    time.sleep(interval)
+            elif self.done:
+                return
+            elif self.alive is not None and not self.alive():
+                self.finish({'job_id': self.job_id, 'count': len(self.devices),
+                             'error': 'scan ended without a summary'})
+
+
+def ndjson_lines(stream: ScanStream, head: Optional[Dict] = None) -> Iterator[bytes]:
+    """Chunked HTTP body: an optional job line, one line per device, the summary
+
+    Each batch is a single chunk; every line carries a "type" of job, device
+    or summary
+    """
+    if head is not None:
+        yield (json.dumps(dict(head, type='job')) + '\n').encode()
+    for batch in stream.follow():
+        yield ''.join(json.dumps(dict(device, type='device')) + '\n' for device in batch).encode()
+    yield (json.dumps(dict(stream.summary, type='summary'), default=str) + '\n').encode()
+
+
+# Export
+__all__ = ['ScanStream', 'ndjson_lines', 'NDJSON_MIMETYPE', 'BATCH_INTERVAL', 'MAX_BATCH']
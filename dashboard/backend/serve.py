@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+ZSPOOF Serve - Multi-worker dashboard
+The supervisor binds the port once, runs the event-bus hub and starts N
+worker processes that accept on the inherited socket; workers share
+sessions, scan tables and job state through SQLite and fan Socket.IO
+events out over the bus. Crashed workers are restarted.
+
+    python3 dashboard/backend/serve.py -w 4 --port 5000
+"""
+
+import argparse
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from event_bus import EventBus
+
+DEFAULT_WORKERS = int(os.environ.get('ZSPOOF_WORKERS', os.cpu_count() or 1))
+RESTART_DELAY = 1.0
+
+
+def run_worker(host: str, port: int) -> int:
+    """Worker body: serve the Flask app on the supervisor's listening socket"""
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    import app as dashboard
+    import cluster
+
+    if cluster.is_leader():
+        dashboard.start_streams()
+    class KeepAliveHandler(WSGIRequestHandler):
+        # HTTP/1.1 keeps connections (and their handler threads) open across requests
+        protocol_version = 'HTTP/1.1'
+
+    server = make_server(host, port, dashboard.app, threaded=True,
+                         request_handler=KeepAliveHandler,
+                         fd=int(os.environ['ZSPOOF_LISTEN_FD']))
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    print(f"  worker {cluster.WORKER_ID} (pid {os.getpid()}) ready", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass  # the supervisor handles Ctrl+C
+    return 0
+
+
+class Supervisor:
+    """Owns the listening socket, the bus hub and the worker processes"""
+
+    def __init__(self, host: str, port: int, workers: int, bus_path: str,
+                 state_path: Optional[str] = None):
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.bus = EventBus(bus_path)
+        self.listener = socket.create_server((host, port), backlog=1024)
+        self.listener.set_inheritable(True)
+        self.env = dict(
+            os.environ,
+            ZSPOOF_BUS_PATH=bus_path,
+            ZSPOOF_WORKERS=str(workers),
+            ZSPOOF_LISTEN_FD=str(self.listener.fileno()),
+        )
+        if state_path:
+            self.env['ZSPOOF_STATE_DB'] = state_path
+        self.procs: List[Optional[subprocess.Popen]] = [None] * workers
+        self.stopping = False
+
+    def spawn(self, worker_id: int) -> subprocess.Popen:
+        proc = subprocess.Popen(
+            [sys.executable, __file__, '--worker', '--host', self.host, '--port', str(self.port)],
+            env=dict(self.env, ZSPOOF_WORKER_ID=str(worker_id)),
+            pass_fds=(self.listener.fileno(),),
+        )
+        self.procs[worker_id] = proc
+        return proc
+
+    def stop(self, *_) -> None:
+        self.stopping = True
+
+    def run(self) -> int:
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        self.bus.start()
+        for worker_id in range(self.workers):
+            self.spawn(worker_id)
+        try:
+            while not self.stopping:
+                for worker_id, proc in enumerate(self.procs):
+                    if proc.poll() is not None and not self.stopping:
+                        print(f"  worker {worker_id} exited ({proc.returncode}); restarting",
+                              file=sys.stderr)
+                        time.sleep(RESTART_DELAY)
+                        self.spawn(worker_id)
+                time.sleep(0.2)
+        finally:
+            for proc in self.procs:
+                if proc is not None and proc.poll() is None:
+                    proc.terminate()
+            for proc in self.procs:
+                if proc is not None:
+                    try:
+                        proc.wait(timeout=10)
+                    except subprocess.TimeoutExpired:
+                        proc.kill()
+            self.bus.close()
+            self.listener.close()
+        return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="ZSPOOF multi-worker dashboard server")
+    parser.add_argument('-w', '--workers', type=int, default=DEFAULT_WORKERS,
+                        help='worker processes (default: ZSPOOF_WORKERS or CPU count)')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--bus', help='event-bus socket path (default: in the temp dir, per port)')
+    parser.add_argument('--state-db', help='shared state database (default: ZSPOOF_STATE_DB or data/)')
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        return run_worker(args.host, args.port)
+
+    bus_path = args.bus or str(Path(tempfile.gettempdir()) / f'zspoof-bus-{args.port}.sock')
+    print(f"\n  ZSPOOF dashboard: {args.workers} workers on http://{args.host}:{args.port}")
+    print(f"  Event bus: {bus_path}\n", flush=True)
+    return Supervisor(args.host, args.port, max(1, args.workers), bus_path, args.state_db).run()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+ZSPOOF Shared State - Cross-worker dashboard state in SQLite
+Versioned JSON documents (scan tables, job snapshots) in one WAL database
+so every serve.py worker answers from the same data; readers check a
+document's version before reloading it, writers update under BEGIN IMMEDIATE
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator, List, Tuple
+
+DEFAULT_STATE_PATH = Path(__file__).resolve().parent.parent.parent / "data" / "dashboard_state.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    key     TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    body    TEXT    NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(path), timeout=30, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class Document:
+    """Value being edited inside StateStore.update()"""
+    __slots__ = ('key', 'version', 'value')
+
+    def __init__(self, key: str, version: int, value: Any):
+        self.key = key
+        self.version = version
+        self.value = value
+
+
+class StateStore:
+    """Key -> (version, JSON value) store shared by every dashboard worker"""
+
+    def __init__(self, path=None):
+        self.path = Path(path or os.environ.get('ZSPOOF_STATE_DB', DEFAULT_STATE_PATH))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = _connect(self.path)
+        conn.executescript(_SCHEMA)
+        conn.close()
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = _connect(self.path)
+        return conn
+
+    def version(self, key: str) -> int:
+        """Current version (0 when missing); cheap enough to call per request"""
+        row = self._conn().execute("SELECT version FROM documents WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else 0
+
+    def get(self, key: str, default: Any = None) -> Tuple[int, Any]:
+        row = self._conn().execute("SELECT version, body FROM documents WHERE key = ?",
+                                   (key,)).fetchone()
+        return (row[0], json.loads(row[1])) if row else (0, default)
+
+    def put(self, key: str, value: Any) -> int:
+        """Replace a document; returns its new version"""
+        with self.update(key) as doc:
+            doc.value = value
+        return doc.version
+
+    @contextmanager
+    def update(self, key: str, default: Any = None) -> Iterator[Document]:
+        """Read-modify-write under the database write lock
+
+        Assign doc.value (or mutate it) inside the block; doc.version holds
+        the stored version afterwards. An exception rolls the change back.
+        """
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT version, body FROM documents WHERE key = ?", (key,)).fetchone()
+            doc = Document(key, row[0] if row else 0, json.loads(row[1]) if row else default)
+            yield doc
+            doc.version += 1
+            conn.execute("INSERT OR REPLACE INTO documents (key, version, body) VALUES (?, ?, ?)",
+                         (key, doc.version, json.dumps(doc.value, separators=(',', ':'), default=str)))
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def delete(self, *keys: str) -> None:
+        self._conn().executemany("DELETE FROM documents WHERE key = ?", [(k,) for k in keys])
+
+    def items(self, prefix: str) -> List[Tuple[str, Any]]:
+        """(key, value) of every document whose key starts with prefix"""
+        rows = self._conn().execute(
+            "SELECT key, body FROM documents WHERE key >= ? AND key < ? ORDER BY key",
+            (prefix, prefix + '\U0010ffff')
+        ).fetchall()
+        return [(key, json.loads(body)) for key, body in rows]
+
+    def close(self) -> None:
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+# Export
+__all__ = ['StateStore', 'Document']
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+ZSPOOF Bulk Apply - Parallel multi-interface MAC changes
+Per-interface locking and all-or-nothing rollback to the captured originals
+"""
+
+import fcntl
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import inventory
+from metrics import timed
+from netlink import LinkChangeResult, set_link_address
+
+DEFAULT_WORKERS = 16
+
+# One lock file per interface, shared by every dashboard worker and CLI;
+# the temp dir only serves processes that cannot write under /run
+LOCK_DIRS = (Path(os.environ.get('ZSPOOF_LOCK_DIR', '/run/zspoof')),
+             Path(tempfile.gettempdir()) / 'zspoof')
+
+IFNAMSIZ = 16
+
+
+def _lockable(interface: str) -> bool:
+    """Only names the kernel could accept map to a lock file"""
+    return (0 < len(interface) < IFNAMSIZ and interface not in ('.', '..')
+            and not any(c == '/' or c.isspace() or c == '\0' for c in interface))
+
+
+def _open_lock(interface: str) -> int:
+    for directory in LOCK_DIRS:
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            return os.open(directory / f'{interface}.lock',
+                           os.O_RDWR | os.O_CREAT | os.O_CLOEXEC, 0o644)
+        except PermissionError:
+            continue
+    raise PermissionError(f"no writable lock directory for {interface} (tried {LOCK_DIRS[0]})")
+
+
+@contextmanager
+def interface_locks(interfaces: Sequence[str]) -> Iterator[None]:
+    """Hold the locks for several interfaces (sorted order, so no deadlock)
+
+    Each lock is an exclusive flock on <lock dir>/<ifname>.lock. Every
+    acquisition opens its own file description, so threads of one process
+    and separate processes (serve.py workers, the CLI) all queue on it
+    """
+    fds: List[int] = []
+    try:
+        for name in sorted(set(interfaces)):
+            if not _lockable(name):
+                continue  # no such link can exist, so set_link_address just fails
+            fds.append(_open_lock(name))
+            fcntl.flock(fds[-1], fcntl.LOCK_EX)
+        yield
+    finally:
+        for fd in reversed(fds):
+            os.close(fd)  # closing the description drops its flock
+
+
+@dataclass
+class InterfaceApplyResult:
+    """Per-interface outcome of a bulk apply"""
+    interface: str
+    mac: str
+    original_mac: Optional[str]
+    success: bool
+    errno: int = 0
+    error: Optional[str] = None
+    latency_ms: float = 0.0
+    address_changed: bool = False
+    rolled_back: bool = False
+    timings: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class BulkApplyResult:
+    """Outcome of a bulk apply"""
+    success: bool
+    results: List[InterfaceApplyResult]
+    elapsed_ms: float
+    rollback_errors: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+@timed('zspoof_apply_seconds', 'Locked apply latency including inventory refresh', mode='one')
+def apply_one(interface: str, mac: str, batch: bool = True) -> LinkChangeResult:
+    """Single MAC change under the interface lock (batch=False for per-step timings)"""
+    with interface_locks([interface]):
+        result = set_link_address(interface, mac, batch)
+    inventory.invalidate()
+    return result
+
+
+def _run(pool: ThreadPoolExecutor, changes: Sequence[Tuple[str, str]],
+         up: Optional[Dict[str, bool]] = None) -> List[LinkChangeResult]:
+    """set_link_address per change; `up` maps interfaces to leave down to False"""
+    up = up or {}
+    return list(pool.map(lambda change: set_link_address(*change, up=up.get(change[0], True)),
+                         changes))
+
+
+@timed('zspoof_apply_seconds', 'Locked apply latency including inventory refresh', mode='many')
+def apply_many(
+    changes: Sequence[Tuple[str, str]],
+    max_workers: int = DEFAULT_WORKERS,
+    rollback: bool = True
+) -> BulkApplyResult:
+    """Apply (interface, mac) pairs concurrently; on any failure restore the rest"""
+    start = time.perf_counter()
+    names = [interface for interface, _ in changes]
+    if len(set(names)) != len(names):
+        raise ValueError("Each interface may appear only once per bulk apply")
+    if not changes:
+        return BulkApplyResult(success=True, results=[], elapsed_ms=0.0)
+
+    with interface_locks(names):
+        interfaces = inventory.get_interfaces(refresh=True)
+        originals = {iface.name: iface.mac for iface in interfaces}
+        # Rollback puts administratively down links back down, not just their MAC
+        was_up = {iface.name: iface.admin_up is not False for iface in interfaces}
+        workers = max(1, min(max_workers, len(changes)))
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='zspoof-apply') as pool:
+            outcomes = _run(pool, changes)
+            results = [
+                InterfaceApplyResult(
+                    interface=outcome.interface,
+                    mac=outcome.mac,
+                    original_mac=originals.get(outcome.interface),
+                    success=outcome.success,
+                    errno=outcome.errno,
+                    error=outcome.error,
+                    latency_ms=outcome.timings.get('total', 0.0),
+                    address_changed=outcome.address_changed,
+                    timings=outcome.timings,
+                )
+                for outcome in outcomes
+            ]
+
+            success = all(r.success for r in results)
+            rollback_errors = []
+            if not success and rollback:
+                # A failed link-up can still leave the new address in place
+                restore = [r for r in results if r.address_changed]
+                missing = [r for r in restore if not r.original_mac]
+                restore = [r for r in restore if r.original_mac]
+                rollback_errors.extend(f"{r.interface}: original MAC unknown" for r in missing)
+
+                reverts = [(r.interface, r.original_mac) for r in restore]
+                for record, outcome in zip(restore, _run(pool, reverts, was_up)):
+                    if outcome.success:
+                        record.rolled_back = True
+                    else:
+                        rollback_errors.append(f"{record.interface}: {outcome.error}")
+
+    inventory.invalidate()
+    elapsed = round((time.perf_counter() - start) * 1000, 3)
+    return BulkApplyResult(success=success, results=results, elapsed_ms=elapsed,
+                           rollback_errors=rollback_errors)
+
+
+# Export
+__all__ = ['apply_many', 'apply_one', 'interface_locks', 'BulkApplyResult', 'InterfaceApplyResult']
@@ -288,7 +288,7 @@ public:
 
 int main(int argc, char* argv[]) {
     if (argc < 2) {
-        std::cerr << "Usage: " << argv[0] << " <profile|random|validate> [mac_address]" << std::endl;
+        std::cerr << "Usage: " << argv[0] << " <profile|random|validate> [count|mac_address]" << std::endl;
         return 1;
     }
     
@@ -310,8 +310,20 @@ int main(int argc, char* argv[]) {
         std::cout << anti_detect.get_stealth_delay_ms() << std::endl;
     }
     else {
-        // Generate MAC based on profile
-        std::cout << mac_gen.generate_profile_mac(command) << std::endl;
+        // Generate MAC(s) based on profile: <profile> [count]
+        long count = 1;
+        if (argc >= 3) {
+            try {
+                count = std::stol(argv[2]);
+            } catch (const std::exception&) {
+                std::cerr << "Invalid count: " << argv[2] << std::endl;
+                return 1;
+            }
+        }
+        for (long i = 0; i < count; i++) {
+            std::cout << mac_gen.generate_profile_mac(command) << '\n';
+        }
+        std::cout.flush();
     }
     
     return 0;
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+ZSPOOF Generate - Non-interactive bulk MAC output
+Streams packed batches to stdout or a file as text, NDJSON or raw 6-byte
+records (mmap-friendly), one large write per chunk
+"""
+
+import argparse
+import os
+import signal
+import sys
+from typing import BinaryIO, List, Optional
+
+from mac_array import MacArray
+from mac_generator import (DEFAULT_CHUNK, available_profiles, iter_batches, parallel_batches,
+                           resolve_profile)
+from rng_streams import stream
+
+FORMATS = ('text', 'ndjson', 'binary')
+CHUNK = DEFAULT_CHUNK * 4
+BUFFER_SIZE = 1 << 20
+
+_NDJSON_PREFIX = b'{"mac":"'
+
+
+def format_text(raw: bytes) -> bytearray:
+    """One XX:XX:XX:XX:XX:XX per line"""
+    if not raw:
+        return bytearray()
+    buf = bytearray(raw.hex(':').upper().encode('ascii'))
+    buf.append(0x3A)  # every record now ends in a ':' separator ...
+    buf[17::18] = b'\n' * (len(raw) // 6)  # ... which becomes its newline
+    return buf
+
+
+def format_ndjson(raw: bytes) -> bytes:
+    """One {"mac": ...} object per line"""
+    if not raw:
+        return b''
+    body = bytes(format_text(raw)).replace(b'\n', b'"}\n' + _NDJSON_PREFIX)
+    return _NDJSON_PREFIX + body[:-len(_NDJSON_PREFIX)]
+
+
+class Annotator:
+    """Adds MACIntelligence fields (vendor, confidence, risk level) per record"""
+
+    def __init__(self, profile: str):
+        from ml_engine import get_engine  # only paid for with --intel
+
+        self.engine = get_engine()
+        self.profile = profile
+
+    def records(self, raw: bytes):
+        """((mac, vendor) pairs, confidence, risk level) for one chunk"""
+        confidence, risk_level = self.engine.profile_confidence(self.profile)
+        macs = MacArray.from_records(raw)
+        pairs = zip(macs.to_strings(), macs.vendors(self.engine.registry))
+        return pairs, round(confidence, 2), risk_level
+
+    def text(self, raw: bytes) -> bytes:
+        records, confidence, risk_level = self.records(raw)
+        tail = f'\t{confidence}\t{risk_level}\n'
+        return ''.join(f'{mac}\t{vendor}{tail}' for mac, vendor in records).encode()
+
+    def ndjson(self, raw: bytes) -> bytes:
+        records, confidence, risk_level = self.records(raw)
+        tail = f'","confidence":{confidence},"risk_level":"{risk_level}"}}\n'
+        return ''.join(f'{{"mac":"{mac}","vendor":"{vendor}{tail}'
+                       for mac, vendor in records).encode()
+
+
+def unique_batches(index, profile: str, count: int, chunk: int = CHUNK, seed=None):
+    """Chunks drawn through a uniqueness index (rejects redrawn from the same stream)"""
+    for i, start in enumerate(range(0, count, chunk)):
+        yield index.generate(profile, min(chunk, count - start),
+                             None if seed is None else stream(seed, i))
+    index.flush()
+
+
+def write(out: BinaryIO, profile: str, count: int, fmt: str = 'text', intel: bool = False,
+          use_engine: bool = False, chunk: int = CHUNK, seed=None, jobs: int = 1,
+          unique=None) -> int:
+    """Generate `count` MACs into `out`; returns bytes written
+
+    The same seed and chunk size give byte-identical output for any `jobs`;
+    `unique` (a UniquenessIndex) skips every MAC it has already recorded
+    """
+    profile = resolve_profile(profile)
+    if use_engine and (seed is not None or jobs > 1 or unique is not None):
+        raise ValueError("--seed, --jobs and --unique use the in-process generator, not bin/core_engine")
+    if unique is not None and jobs > 1:
+        raise ValueError("--unique draws in one process")
+    if fmt == 'binary':
+        if intel:
+            raise ValueError("binary records have no room for intelligence fields")
+        encode = bytes
+    elif intel:
+        annotator = Annotator(profile)
+        encode = annotator.ndjson if fmt == 'ndjson' else annotator.text
+    else:
+        encode = format_ndjson if fmt == 'ndjson' else format_text
+
+    if unique is not None:
+        batches = unique_batches(unique, profile, count, chunk, seed)
+    elif jobs > 1:
+        batches = parallel_batches(profile, count, jobs, chunk, seed)
+    else:
+        batches = iter_batches(profile, count, chunk, use_engine, seed)
+    written = 0
+    for raw in batches:
+        data = encode(raw)
+        out.write(data)
+        written += len(data)
+    return written
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='zspoof generate',
+                                     description="Generate MAC addresses without the interactive menu")
+    parser.add_argument('-p', '--profile', default='random',
+                        help=f"profile ({', '.join(available_profiles())}; default: random)")
+    parser.add_argument('-n', '--count', type=int, default=1)
+    parser.add_argument('-f', '--format', choices=FORMATS, default='text',
+                        help='text lines, NDJSON objects or raw 6-byte records')
+    parser.add_argument('-o', '--output', default='-', help="output file (default: stdout)")
+    parser.add_argument('--intel', action='store_true',
+                        help='add vendor, confidence and risk level per record (text/ndjson)')
+    parser.add_argument('--engine', action='store_true', help='pull batches from bin/core_engine')
+    parser.add_argument('--seed', help='reproducible output: same seed, same bytes (int or string)')
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='generate chunks in N processes')
+    parser.add_argument('--unique', nargs='?', const='', metavar='DIR',
+                        help='never repeat a MAC issued before (index in DIR, default ZSPOOF_UNIQUE_DIR '
+                             'or data/unique/)')
+    parser.add_argument('--observe', action='append', default=[], metavar='PATH',
+                        help='also avoid every MAC in a scan export or capture (NDJSON/CSV/pcap; '
+                             'repeatable, implies --unique)')
+    args = parser.parse_args(argv)
+
+    if args.count < 0:
+        parser.error('--count must be >= 0')
+    if args.jobs < 1:
+        parser.error('--jobs must be >= 1')
+    if args.observe and args.unique is None:
+        args.unique = ''
+    if args.engine and (args.seed is not None or args.jobs > 1 or args.unique is not None):
+        parser.error('--seed, --jobs and --unique are not available with --engine')
+    if args.unique is not None and args.jobs > 1:
+        parser.error('--unique is not available with --jobs')
+    unique = None
+    if args.unique is not None:
+        from uniqueness import UniquenessIndex, get_index
+        unique = UniquenessIndex(args.unique) if args.unique else get_index()
+        for path in args.observe:
+            try:
+                unique.observe(path)
+            except (OSError, ValueError) as e:
+                parser.error(f'--observe {path}: {e}')
+    seed = int(args.seed) if args.seed is not None and args.seed.isdigit() else args.seed
+    if args.intel and args.format == 'binary':
+        parser.error('--intel is not available with --format binary')
+
+    if args.output != '-':
+        with open(args.output, 'wb', buffering=BUFFER_SIZE) as out:
+            write(out, args.profile, args.count, args.format, args.intel, args.engine,
+                  seed=seed, jobs=args.jobs, unique=unique)
+        return 0
+
+    # Behave like a Unix filter: a closed pipe (| head) ends the process quietly
+    if hasattr(signal, 'SIGPIPE'):
+        signal.signal(signal.SIGPIPE, signal.SIG_DFL)
+    try:
+        write(sys.stdout.buffer, args.profile, args.count, args.format, args.intel, args.engine,
+              seed=seed, jobs=args.jobs, unique=unique)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # No SIGPIPE on this platform; keep the interpreter's final flush from failing too
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    return 0
+
+
+# Export
+__all__ = ['write', 'format_text', 'format_ndjson', 'Annotator', 'FORMATS']
+
+if __name__ == "__main__":
+    sys.exit(main())
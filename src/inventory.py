@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+ZSPOOF Interface Inventory - Subprocess-free interface table
+Builds the interface list from one RTM_GETLINK + RTM_GETADDR dump,
+falling back to direct sysfs reads where netlink is unavailable;
+InterfaceWatcher keeps the table current from link/address notifications
+"""
+
+import errno
+import os
+import select
+import socket
+import struct
+import threading
+import time
+from dataclasses import dataclass, field, asdict, replace
+from typing import Dict, List, Optional, Tuple
+
+from metrics import timed
+from netlink import (
+    IFA_ADDRESS, IFA_LOCAL, IFF_UP, IFLA_ADDRESS, IFLA_IFNAME, IFLA_INFO_KIND, IFLA_LINKINFO,
+    IFLA_OPERSTATE, IFLA_PERM_ADDRESS, RTM_DELADDR, RTM_DELLINK, RTM_GETADDR, RTM_GETLINK,
+    RTM_NEWADDR, RTM_NEWLINK, RTMGRP_IPV4_IFADDR, RTMGRP_IPV6_IFADDR, RTMGRP_LINK,
+    NetlinkSocket, link_payload, parse_attrs, unpack_link,
+)
+
+SYSFS_NET = '/sys/class/net'
+PROC_ROUTE = '/proc/net/route'
+
+# RFC 2863 operational states as reported in IFLA_OPERSTATE
+OPERSTATES = ('unknown', 'notpresent', 'down', 'lowerlayerdown', 'testing', 'dormant', 'up')
+
+_IFADDRMSG = struct.Struct('=BBBBI')  # family, prefixlen, flags, scope, index
+
+# InterfaceWatcher events
+ADDED = 'added'
+CHANGED = 'changed'
+REMOVED = 'removed'
+
+
+@dataclass
+class InterfaceInfo:
+    """One network interface"""
+    name: str
+    index: int
+    mac: str
+    permanent_mac: Optional[str]
+    operstate: str
+    driver: Optional[str]
+    addresses: List[str] = field(default_factory=list)
+    admin_up: Optional[bool] = None  # IFF_UP (administrative state, unlike operstate)
+
+    @property
+    def ipv4(self) -> Optional[str]:
+        for address in self.addresses:
+            if '.' in address:
+                return address.split('/')[0]
+        return None
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def _format_mac(raw: Optional[bytes]) -> Optional[str]:
+    return raw.hex(':') if raw else None
+
+
+def _read_sysfs(name: str, attr: str) -> Optional[str]:
+    try:
+        with open(os.path.join(SYSFS_NET, name, attr)) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _driver(name: str, kind: Optional[str] = None) -> Optional[str]:
+    """Driver from the sysfs device link, else the rtnetlink link kind"""
+    try:
+        return os.path.basename(os.readlink(os.path.join(SYSFS_NET, name, 'device', 'driver')))
+    except OSError:
+        return kind
+
+
+def _parse_link(body) -> InterfaceInfo:
+    """InterfaceInfo (without addresses) from an RTM_NEWLINK body"""
+    index, flags, attrs = unpack_link(body)
+    name = attrs.get(IFLA_IFNAME, b'').rstrip(b'\0').decode()
+    operstate = attrs.get(IFLA_OPERSTATE, b'\0')[0]
+    kind = None
+    if IFLA_LINKINFO in attrs:
+        kind = parse_attrs(attrs[IFLA_LINKINFO]).get(IFLA_INFO_KIND)
+    return InterfaceInfo(
+        name=name,
+        index=index,
+        mac=_format_mac(attrs.get(IFLA_ADDRESS)) or 'unknown',
+        permanent_mac=_format_mac(attrs.get(IFLA_PERM_ADDRESS)),
+        operstate=OPERSTATES[operstate] if operstate < len(OPERSTATES) else 'unknown',
+        driver=_driver(name, kind.rstrip(b'\0').decode() if kind else None),
+        admin_up=bool(flags & IFF_UP),
+    )
+
+
+def _parse_addr(body) -> Tuple[int, Optional[str]]:
+    """(interface index, "address/prefix") from an RTM_NEWADDR/RTM_DELADDR body"""
+    family, prefixlen, _, _, index = _IFADDRMSG.unpack_from(body, 0)
+    attrs = parse_attrs(body, _IFADDRMSG.size)
+    raw = attrs.get(IFA_LOCAL) or attrs.get(IFA_ADDRESS)
+    return index, f"{socket.inet_ntop(family, raw)}/{prefixlen}" if raw else None
+
+
+@timed('zspoof_inventory_seconds', 'Interface table refresh latency', source='netlink')
+def _dump_netlink() -> List[InterfaceInfo]:
+    interfaces: Dict[int, InterfaceInfo] = {}
+    with NetlinkSocket() as nl:
+        for msg_type, body in nl.dump(RTM_GETLINK, link_payload(0)):
+            if msg_type == RTM_NEWLINK:
+                interface = _parse_link(body)
+                interfaces[interface.index] = interface
+
+        payload = _IFADDRMSG.pack(socket.AF_UNSPEC, 0, 0, 0, 0)
+        for msg_type, body in nl.dump(RTM_GETADDR, payload):
+            if msg_type != RTM_NEWADDR:
+                continue
+            index, address = _parse_addr(body)
+            if address and index in interfaces:
+                interfaces[index].addresses.append(address)
+
+    return sorted(interfaces.values(), key=lambda i: i.index)
+
+
+@timed('zspoof_inventory_seconds', 'Interface table refresh latency', source='sysfs')
+def _scan_sysfs() -> List[InterfaceInfo]:
+    interfaces = []
+    try:
+        names = os.listdir(SYSFS_NET)
+    except OSError:
+        return interfaces
+    for name in sorted(names):
+        index = _read_sysfs(name, 'ifindex')
+        flags = _read_sysfs(name, 'flags')
+        interfaces.append(InterfaceInfo(
+            name=name,
+            index=int(index) if index else 0,
+            mac=_read_sysfs(name, 'address') or 'unknown',
+            permanent_mac=None,
+            operstate=_read_sysfs(name, 'operstate') or 'unknown',
+            driver=_driver(name),
+            admin_up=bool(int(flags, 16) & IFF_UP) if flags else None,
+        ))
+    return sorted(interfaces, key=lambda i: i.index)
+
+
+_cache: Optional[List[InterfaceInfo]] = None
+_cache_lock = threading.Lock()
+
+
+def invalidate() -> None:
+    """Drop the cached table; the next call re-dumps"""
+    global _cache
+    with _cache_lock:
+        _cache = None
+
+
+def get_interfaces(refresh: bool = False) -> List[InterfaceInfo]:
+    """Interface table (cached until invalidate() or refresh=True, or kept
+    current by a running InterfaceWatcher)"""
+    global _cache
+    with _cache_lock:
+        if _cache is None or refresh:
+            try:
+                _cache = _dump_netlink()
+            except (OSError, AttributeError):  # no AF_NETLINK on this platform
+                _cache = _scan_sysfs()
+        return list(_cache)
+
+
+def get_interface(name: str, refresh: bool = False) -> Optional[InterfaceInfo]:
+    """Look up a single interface by name"""
+    for interface in get_interfaces(refresh):
+        if interface.name == name:
+            return interface
+    return None
+
+
+class InterfaceWatcher:
+    """Non-blocking subscription to link and address notifications
+
+    The socket joins the groups before the initial dump so nothing between
+    the two is lost. poll() folds whatever the kernel queued into the table
+    and reports each touched interface once as (event, InterfaceInfo,
+    changed fields), comparing against its state before the poll: a link that
+    flaps and settles back inside one poll reports nothing, and counter-only
+    RTM_NEWLINK churn never surfaces. With publish=True every change is also
+    written to the get_interfaces() cache, so readers never re-dump.
+    """
+
+    def __init__(self, publish: bool = True):
+        self.publish = publish
+        self.nl = NetlinkSocket(groups=RTMGRP_LINK | RTMGRP_IPV4_IFADDR | RTMGRP_IPV6_IFADDR)
+        self.nl.sock.setblocking(False)
+        self.known: Dict[int, InterfaceInfo] = {i.index: i for i in _dump_netlink()}
+        self._publish()
+
+    def __enter__(self) -> 'InterfaceWatcher':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.nl.close()
+
+    def fileno(self) -> int:
+        return self.nl.fileno()
+
+    def interfaces(self) -> List[InterfaceInfo]:
+        """Current table, by index"""
+        return sorted(self.known.values(), key=lambda i: i.index)
+
+    def _publish(self) -> None:
+        global _cache
+        if self.publish:
+            with _cache_lock:
+                _cache = self.interfaces()
+
+    def handle(self, msg_type: int, body) -> Optional[int]:
+        """Fold one notification into the table; returns the index it changed, if any"""
+        if msg_type == RTM_NEWLINK:
+            interface = _parse_link(body)
+            previous = self.known.get(interface.index)
+            if previous is not None:
+                interface.addresses = previous.addresses
+                if interface == previous:
+                    return None
+            self.known[interface.index] = interface
+            return interface.index
+        if msg_type == RTM_DELLINK:
+            index, _, _ = unpack_link(body)
+            return index if self.known.pop(index, None) is not None else None
+        if msg_type in (RTM_NEWADDR, RTM_DELADDR):
+            index, address = _parse_addr(body)
+            interface = self.known.get(index)
+            if interface is None or address is None:
+                return None
+            present = address in interface.addresses
+            if msg_type == RTM_NEWADDR and not present:
+                self.known[index] = replace(interface, addresses=interface.addresses + [address])
+            elif msg_type == RTM_DELADDR and present:
+                self.known[index] = replace(
+                    interface, addresses=[a for a in interface.addresses if a != address])
+            else:
+                return None
+            return index
+        return None
+
+    def _resync(self) -> None:
+        """Rebuild from a dump after the socket overflowed (ENOBUFS)"""
+        self.known = {i.index: i for i in _dump_netlink()}
+
+    def poll(self, timeout: float = 0.0,
+             window: float = 0.0) -> List[Tuple[str, InterfaceInfo, List[str]]]:
+        """Changes queued since the last call, waiting up to `timeout` for the first
+
+        After the first notification the watcher waits `window` more seconds
+        so a burst (ip link set down/address/up, DHCP renewals) coalesces into
+        one report per interface
+        """
+        if timeout and not select.select([self.nl.sock], [], [], timeout)[0]:
+            return []
+        before = dict(self.known)
+        touched = set()
+        deadline = time.monotonic() + window
+        while True:
+            try:
+                for msg_type, _, _, body in self.nl.receive():
+                    index = self.handle(msg_type, body)
+                    if index is not None:
+                        touched.add(index)
+            except BlockingIOError:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not select.select([self.nl.sock], [], [], remaining)[0]:
+                    break
+            except OSError as e:
+                if e.errno != errno.ENOBUFS:
+                    raise
+                self._resync()
+                touched.update(before, self.known)
+
+        changes = []
+        for index in sorted(touched):
+            old, new = before.get(index), self.known.get(index)
+            if new is None and old is not None:
+                changes.append((REMOVED, old, []))
+            elif old is None and new is not None:
+                changes.append((ADDED, new, []))
+            elif old != new:
+                fields = [name for name, value in asdict(new).items() if asdict(old)[name] != value]
+                changes.append((CHANGED, new, fields))
+        if changes:
+            self._publish()
+        return changes
+
+
+def default_interface(path: str = PROC_ROUTE) -> Optional[str]:
+    """Interface of the lowest-metric IPv4 default route, read from /proc/net/route"""
+    best: Optional[Tuple[int, str]] = None
+    try:
+        with open(path) as f:
+            next(f, None)  # header
+            for line in f:
+                fields = line.split()
+                if len(fields) < 8 or fields[1] != '00000000' or fields[7] != '00000000':
+                    continue
+                if not int(fields[3], 16) & 0x1:  # RTF_UP
+                    continue
+                metric = int(fields[6])
+                if best is None or metric < best[0]:
+                    best = (metric, fields[0])
+    except (OSError, ValueError):
+        return None
+    return best[1] if best else None
+
+
+# Export
+__all__ = [
+    'InterfaceInfo', 'InterfaceWatcher', 'get_interfaces', 'get_interface', 'invalidate',
+    'default_interface', 'ADDED', 'CHANGED', 'REMOVED',
+]
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+ZSPOOF MAC Array - Packed 48-bit MAC storage
+Holds addresses as uint64 in an array('Q') (8 bytes each instead of a
+17-character str) with slice-based bulk parsing, formatting and bit tests
+"""
+
+import sys
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from itertools import compress
+from typing import Dict, Iterable, Iterator, List, Union
+
+from mac_generator import format_records
+
+try:
+    import numpy as np
+except ImportError:  # optional accelerator
+    np = None
+
+_LITTLE = sys.byteorder == 'little'
+
+# First-octet flag tables for bytes.translate: 1 where the bit is set
+_MULTICAST = bytes(b & 0x01 for b in range(256))
+_LOCAL = bytes((b >> 1) & 0x01 for b in range(256))
+
+_SEPARATORS = str.maketrans('', '', ':-.')
+
+
+class MacArray:
+    """Compact array of 48-bit MAC addresses"""
+
+    __slots__ = ('data', 'is_sorted')
+
+    def __init__(self, values: Iterable[int] = (), is_sorted: bool = False):
+        if isinstance(values, array) and values.typecode == 'Q':
+            self.data = values
+        else:
+            self.data = array('Q', values)
+        self.is_sorted = is_sorted
+
+    # Construction -----------------------------------------------------
+
+    @classmethod
+    def from_records(cls, raw: bytes) -> 'MacArray':
+        """Unpack 6-byte big-endian records (generator/pcap layout)"""
+        n = len(raw) // 6
+        if len(raw) != 6 * n:
+            raise ValueError("Record buffer length must be a multiple of 6")
+        # Widen each record to 8 bytes; octet order reversed on little-endian hosts
+        wide = bytearray(8 * n)
+        for i in range(6):
+            wide[(5 - i if _LITTLE else 2 + i)::8] = raw[i::6]
+        data = array('Q')
+        data.frombytes(bytes(wide))
+        return cls(data)
+
+    @classmethod
+    def from_strings(cls, macs: Iterable[str]) -> 'MacArray':
+        """Parse XX:XX:XX:XX:XX:XX / dashed / bare-hex strings in bulk"""
+        macs = macs if isinstance(macs, list) else list(macs)
+        if not macs:
+            return cls()
+        # Newline-joined, every 13th character must be the separator: a strided
+        # slice checks each item holds exactly 12 digits without a Python loop
+        joined = '\n'.join(macs).translate(_SEPARATORS)
+        n = len(macs)
+        if (len(joined) != 13 * n - 1 or joined.count('\n') != n - 1
+                or joined[12::13] != '\n' * (n - 1)):
+            bad = next((m for m in macs if len(m.translate(_SEPARATORS)) != 12 or '\n' in m), macs[0])
+            raise ValueError(f"Invalid MAC address: {bad!r}")
+        try:
+            return cls.from_records(bytes.fromhex(joined.replace('\n', '')))
+        except ValueError:
+            raise ValueError(f"Invalid MAC address in {n} strings (non-hex digits)") from None
+
+    @classmethod
+    def from_devices(cls, devices: Iterable[Dict], key: str = 'mac') -> 'MacArray':
+        """Pack the MACs of scan-result dicts"""
+        return cls.from_strings([device[key] for device in devices])
+
+    # Conversion -------------------------------------------------------
+
+    def to_records(self) -> bytes:
+        """Pack back into 6-byte big-endian records"""
+        wide = self.data.tobytes()
+        raw = bytearray(6 * len(self.data))
+        for i in range(6):
+            raw[i::6] = wide[(5 - i if _LITTLE else 2 + i)::8]
+        return bytes(raw)
+
+    def to_strings(self) -> List[str]:
+        """Format as XX:XX:XX:XX:XX:XX strings"""
+        return format_records(self.to_records())
+
+    def to_numpy(self):
+        """Zero-copy uint64 NumPy view (requires numpy)"""
+        if np is None:
+            raise ImportError("numpy is not installed")
+        return np.frombuffer(self.data, dtype=np.uint64)
+
+    # Sequence protocol ------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.data)
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return MacArray(self.data[index], self.is_sorted and (index.step or 1) > 0)
+        return self.data[index]
+
+    def __contains__(self, mac: Union[int, str]) -> bool:
+        value = mac if isinstance(mac, int) else MacArray.from_strings([mac]).data[0]
+        if self.is_sorted:
+            i = bisect_left(self.data, value)
+            return i < len(self.data) and self.data[i] == value
+        return value in self.data
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, MacArray) and self.data == other.data
+
+    def __repr__(self) -> str:
+        preview = ', '.join(self[:3].to_strings())
+        return f"MacArray({len(self)} addresses: {preview}{', ...' if len(self) > 3 else ''})"
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.data) * self.data.itemsize
+
+    def append(self, value: Union[int, str]) -> None:
+        self.data.append(value if isinstance(value, int) else MacArray.from_strings([value]).data[0])
+        self.is_sorted = False
+
+    def extend(self, other: 'MacArray') -> None:
+        self.data.extend(other.data)
+        self.is_sorted = False
+
+    # Bit fields -------------------------------------------------------
+
+    def _octets(self, index: int) -> bytes:
+        """One octet (0 = first on the wire) of every address"""
+        return self.data.tobytes()[(5 - index if _LITTLE else 2 + index)::8]
+
+    def ouis(self) -> array:
+        """24-bit OUI of every address (value >> 24)"""
+        wide = self.data.tobytes()
+        out = bytearray(4 * len(self.data))
+        for i in range(3):
+            out[(i if _LITTLE else 3 - i)::4] = wide[(3 + i if _LITTLE else 4 - i)::8]
+        ouis = array('I')
+        ouis.frombytes(bytes(out))
+        return ouis
+
+    def multicast_mask(self) -> bytes:
+        """1 per multicast address, 0 otherwise"""
+        return self._octets(0).translate(_MULTICAST)
+
+    def local_mask(self) -> bytes:
+        """1 per locally administered address, 0 otherwise"""
+        return self._octets(0).translate(_LOCAL)
+
+    def count_multicast(self) -> int:
+        return self.multicast_mask().count(1)
+
+    def count_local(self) -> int:
+        return self.local_mask().count(1)
+
+    def select(self, mask: bytes) -> 'MacArray':
+        """Keep the addresses whose mask byte is non-zero"""
+        return MacArray(array('Q', compress(self.data, mask)), self.is_sorted)
+
+    # Set operations ---------------------------------------------------
+
+    def unique(self) -> 'MacArray':
+        """Sorted distinct addresses"""
+        if np is not None:
+            return MacArray(array('Q', np.unique(self.to_numpy()).tobytes()), is_sorted=True)
+        return MacArray(sorted(set(self.data)), is_sorted=True)
+
+    def union(self, other: 'MacArray') -> 'MacArray':
+        return MacArray(sorted(set(self.data).union(other.data)), is_sorted=True)
+
+    def intersection(self, other: 'MacArray') -> 'MacArray':
+        return MacArray(sorted(set(self.data).intersection(other.data)), is_sorted=True)
+
+    def difference(self, other: 'MacArray') -> 'MacArray':
+        return MacArray(sorted(set(self.data).difference(other.data)), is_sorted=True)
+
+    # Vendor counting --------------------------------------------------
+
+    def vendor_counts(self, registry) -> Counter:
+        """Vendor histogram with one registry lookup per distinct OUI"""
+        oui_counts = Counter(self.ouis())
+        split = registry.subdivided_ouis()
+        counts: Counter = Counter()
+        for oui, n in oui_counts.items():
+            if oui not in split:
+                counts[registry.lookup_int(oui << 24) or 'unknown'] += n
+        if split and not split.isdisjoint(oui_counts):
+            # MA-M/MA-S blocks need the full address for longest-prefix match
+            for value in self.data:
+                if value >> 24 in split:
+                    counts[registry.lookup_int(value) or 'unknown'] += 1
+        return counts
+
+    def registered_mask(self, registry) -> bytes:
+        """1 per address with a registered vendor, 0 otherwise"""
+        known = registry.registered_ouis()
+        if np is not None:
+            keys = np.fromiter(known, dtype=np.uint64, count=len(known))
+            mask = bytearray(np.isin(self.to_numpy() >> np.uint64(24), keys).view(np.uint8).tobytes())
+        else:
+            mask = bytearray(map(known.__contains__, self.ouis()))
+        # OUIs split into MA-M/MA-S blocks without an MA-L of their own need
+        # the full address
+        split = registry.subdivided_ouis() - known
+        if split and not split.isdisjoint(self.ouis()):
+            for i, value in enumerate(self.data):
+                if value >> 24 in split:
+                    mask[i] = registry.lookup_int(value) is not None
+        return bytes(mask)
+
+    def vendors(self, registry) -> List[str]:
+        """Per-address vendor names, resolved once per distinct OUI"""
+        split = registry.subdivided_ouis()
+        names: Dict[int, str] = {}
+        result = []
+        for value in self.data:
+            oui = value >> 24
+            if oui in split:
+                result.append(registry.lookup_int(value) or 'unknown')
+                continue
+            name = names.get(oui)
+            if name is None:
+                name = names[oui] = registry.lookup_int(oui << 24) or 'unknown'
+            result.append(name)
+        return result
+
+
+# Export
+__all__ = ['MacArray']
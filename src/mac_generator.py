@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+ZSPOOF MAC Generator - In-process batched generation
+Same per-profile semantics as bin/core_engine without a process per address
+"""
+
+import os
+from collections import deque
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from metrics import timed
+from oui_registry import BUILTIN_VENDOR_OUIS, mac_to_int
+from rng_streams import Seed, StreamRandom, stream
+
+ENGINE_PATH = Path(__file__).parent.parent / "bin" / "core_engine"
+
+# Vendor market-share weights per profile (mirrors generate_profile_mac in core_engine.cpp)
+PROFILE_VENDORS: Dict[str, Tuple[Tuple[str, float], ...]] = {
+    'corporate': (('dell', 22.5), ('lenovo', 18.3), ('hp', 15.7), ('cisco', 8.2), ('intel', 25.3)),
+    'cafe': (('apple', 28.4), ('samsung', 19.6), ('xiaomi', 11.2), ('google', 6.8)),
+    'iot': (('espressif', 32.1), ('amazon', 18.5), ('tuya', 14.3), ('xiaomi', 11.2)),
+    'gamer': (('sony', 42.7), ('nintendo', 31.8), ('microsoft', 19.4)),
+    'stealth': (('apple', 28.4), ('samsung', 19.6), ('dell', 22.5), ('lenovo', 18.3), ('intel', 25.3)),
+}
+
+# Weights of bin/heavylifting, the toolkit menu's original engine; its
+# profiles keep their own mix (apple in corporate and iot, intel in gamer)
+TOOLKIT_VENDORS: Dict[str, Tuple[Tuple[str, float], ...]] = {
+    'corporate': (('dell', 35.0), ('lenovo', 30.0), ('apple', 20.0), ('cisco', 10.0), ('intel', 5.0)),
+    'cafe': (('apple', 60.0), ('samsung', 30.0), ('intel', 10.0)),
+    'iot': (('espressif', 50.0), ('amazon', 30.0), ('apple', 20.0)),
+    'gamer': (('sony', 40.0), ('nintendo', 40.0), ('intel', 20.0)),
+}
+
+# core_engine subcommands: as a profile they would print something other than MACs
+ENGINE_COMMANDS = frozenset({'validate', 'hostname', 'delay'})
+
+PROFILE_ALIASES = {'public': 'cafe', 'smarthome': 'iot', 'gaming': 'gamer'}
+
+# Vendor selection resolves through a 16-bit table: each OUI owns a share of
+# 65536 slots proportional to its weight, so one uint16 draw picks an OUI
+_TABLE_BITS = 16
+_TABLE_SIZE = 1 << _TABLE_BITS
+
+# First-octet mask for random MACs: set locally administered, clear multicast
+_UNICAST_LOCAL = bytes(((b | 0x02) & 0xFE) for b in range(256))
+
+DEFAULT_CHUNK = 1 << 16
+
+_oui_tables: Dict[Tuple[str, tuple], Tuple[bytes, ...]] = {}
+
+
+def resolve_profile(profile: str) -> str:
+    """Normalise profile names the way the C++ engine does"""
+    profile = profile.lower()
+    return PROFILE_ALIASES.get(profile, profile)
+
+
+def slot_counts(weights: Sequence[float], size: int = _TABLE_SIZE) -> List[int]:
+    """Share of `size` table slots per weight, summing to exactly `size`"""
+    total = sum(weights)
+    exact = [w / total * size for w in weights]
+    slots = [int(x) for x in exact]
+    # Largest remainder keeps the quantisation error under one slot per entry
+    by_remainder = sorted(range(len(exact)), key=lambda i: exact[i] - slots[i], reverse=True)
+    for i in by_remainder[:size - sum(slots)]:
+        slots[i] += 1
+    return slots
+
+
+def _oui_table(profile: str, vendors: Mapping = PROFILE_VENDORS) -> Tuple[bytes, ...]:
+    """Slot table mapping a uint16 draw to a 3-byte OUI for this profile"""
+    key = (profile, vendors[profile])
+    table = _oui_tables.get(key)
+    if table is not None:
+        return table
+
+    # Vendor picked by market share, then OUI uniformly within the vendor
+    weighted = []
+    for vendor, share in vendors[profile]:
+        ouis = BUILTIN_VENDOR_OUIS[vendor]
+        for oui in ouis:
+            weighted.append(((mac_to_int(oui) >> 24).to_bytes(3, 'big'), share / len(ouis)))
+
+    entries: List[bytes] = []
+    for (oui, _), count in zip(weighted, slot_counts([w for _, w in weighted])):
+        entries.extend([oui] * count)
+    table = _oui_tables[key] = tuple(entries)
+    return table
+
+
+def _source(rng: Optional[StreamRandom]) -> Callable[[int], bytes]:
+    """Random bytes: the seeded stream when given, else os.urandom"""
+    return os.urandom if rng is None else rng.randbytes
+
+
+def _random_records(n: int, rng: Optional[StreamRandom] = None) -> bytes:
+    raw = bytearray(_source(rng)(6 * n))
+    raw[0::6] = raw[0::6].translate(_UNICAST_LOCAL)
+    return bytes(raw)
+
+
+def _profile_records(profile: str, n: int, rng: Optional[StreamRandom] = None,
+                     vendors: Mapping = PROFILE_VENDORS) -> bytes:
+    table = _oui_table(profile, vendors)
+    rand = _source(rng)(5 * n)
+    ouis = b''.join(map(table.__getitem__, memoryview(rand)[:2 * n].cast('H')))
+
+    raw = bytearray(6 * n)
+    for i in range(3):
+        raw[i::6] = ouis[i::3]
+        raw[3 + i::6] = rand[2 * n + i::3]
+    return bytes(raw)
+
+
+@timed('zspoof_engine_seconds', 'bin/core_engine invocation latency')
+def _engine_records(profile: str, n: int) -> bytes:
+    """Delegate to the compiled engine in a single invocation"""
+    if profile in ENGINE_COMMANDS:
+        raise ValueError(f"{profile!r} is a core_engine command, not a profile")
+    if not ENGINE_PATH.exists():
+        raise FileNotFoundError(f"Engine not compiled: {ENGINE_PATH}")
+    import subprocess  # only the engine path pays for it
+    result = subprocess.run([str(ENGINE_PATH), profile, str(n)],
+                            capture_output=True, text=True, check=True)
+    return b''.join(bytes.fromhex(line.replace(':', '')) for line in result.stdout.split())
+
+
+@timed('zspoof_generate_seconds', 'MAC batch generation latency')
+def generate_batch_bytes(profile: str, n: int, use_engine: bool = False,
+                         rng: Optional[StreamRandom] = None,
+                         vendors: Mapping = PROFILE_VENDORS) -> bytes:
+    """Generate n MACs as packed 6-byte records (reproducible with a seeded rng)
+
+    `vendors` swaps the per-profile weight table, e.g. TOOLKIT_VENDORS
+    """
+    if n <= 0:
+        return b''
+    profile = resolve_profile(profile)
+    if use_engine:
+        if rng is not None:
+            raise ValueError("bin/core_engine seeds itself; seeded output needs the in-process generator")
+        if vendors is not PROFILE_VENDORS:
+            raise ValueError("bin/core_engine only knows its own vendor weights")
+        return _engine_records(profile, n)
+    if profile in vendors:
+        return _profile_records(profile, n, rng, vendors)
+    return _random_records(n, rng)
+
+
+def format_records(raw: bytes) -> List[str]:
+    """Format packed 6-byte records as XX:XX:XX:XX:XX:XX strings"""
+    if not raw:
+        return []
+    text = raw.hex(':').upper()
+    return [text[i:i + 17] for i in range(0, len(text), 18)]
+
+
+def generate_batch(profile: str, n: int, use_engine: bool = False,
+                   rng: Optional[StreamRandom] = None) -> List[str]:
+    """Generate n MAC address strings for a profile"""
+    return format_records(generate_batch_bytes(profile, n, use_engine, rng))
+
+
+def generate_mac(profile: str = 'random') -> str:
+    """Generate a single MAC address"""
+    return generate_batch(profile, 1)[0]
+
+
+def _chunk_sizes(n: int, chunk: int) -> List[int]:
+    return [min(chunk, n - start) for start in range(0, max(n, 0), chunk)]
+
+
+def _seeded_chunk(profile: str, size: int, seed: Seed, index: int,
+                  use_engine: bool = False) -> bytes:
+    """Chunk `index` of a run: stream(seed).spawn(index) when seeded"""
+    rng = None if seed is None else stream(seed, index)
+    return generate_batch_bytes(profile, size, use_engine, rng)
+
+
+def iter_batches(profile: str, n: int, chunk: int = DEFAULT_CHUNK,
+                 use_engine: bool = False, seed: Seed = None) -> Iterator[bytes]:
+    """Stream n MACs as packed records in bounded chunks
+
+    With a seed, chunk i is drawn from child stream i of that seed, so the
+    output is identical to parallel_batches() with any worker count
+    """
+    for index, size in enumerate(_chunk_sizes(n, chunk)):
+        yield _seeded_chunk(profile, size, seed, index, use_engine)
+
+
+def parallel_batches(profile: str, n: int, workers: Optional[int] = None,
+                     chunk: int = DEFAULT_CHUNK, seed: Seed = None) -> Iterator[bytes]:
+    """iter_batches() with chunks generated across a process pool, in order
+
+    At most two chunks per worker are in flight, so memory stays bounded
+    whatever n is; each worker only ever touches its own child streams
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = workers or os.cpu_count() or 1
+    sizes = _chunk_sizes(n, chunk)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for index, size in enumerate(sizes):
+            pending.append(pool.submit(_seeded_chunk, profile, size, seed, index))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def oui_weights(profile: str) -> Dict[int, float]:
+    """Exact per-OUI draw probability (24-bit OUI -> p) for a weighted profile"""
+    profile = resolve_profile(profile)
+    if profile not in PROFILE_VENDORS:
+        return {}
+    slots: Dict[int, int] = {}
+    for oui in _oui_table(profile):
+        key = int.from_bytes(oui, 'big')
+        slots[key] = slots.get(key, 0) + 1
+    return {oui: count / _TABLE_SIZE for oui, count in slots.items()}
+
+
+def available_profiles() -> Sequence[str]:
+    """Profiles with vendor weighting (anything else is random)"""
+    return tuple(PROFILE_VENDORS) + ('random',)
+
+
+# Export
+__all__ = [
+    'generate_batch', 'generate_batch_bytes', 'generate_mac', 'iter_batches', 'parallel_batches',
+    'format_records', 'resolve_profile', 'available_profiles', 'oui_weights', 'slot_counts',
+    'PROFILE_VENDORS', 'TOOLKIT_VENDORS', 'ENGINE_COMMANDS',
+]
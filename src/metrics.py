@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+ZSPOOF Metrics - Low-overhead counters and latency histograms
+Each thread writes to its own shard (no locks on the hot path); shards are
+summed on read and rendered in Prometheus text format, and a finished
+thread's shard is folded into a base total so thread-per-request servers
+do not accumulate them
+"""
+
+import functools
+import itertools
+import os
+import threading
+import weakref
+from bisect import bisect_left
+from time import perf_counter
+from typing import Callable, Dict, List, Tuple
+
+ENABLED = os.environ.get('ZSPOOF_METRICS', '1') != '0'
+
+# Seconds; 5 µs .. 10 s covers a lookup through a full ARP scan
+DEFAULT_BUCKETS = (
+    0.000005, 0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class _Owner:
+    """Kept in a thread's local storage; collected when the thread exits"""
+    __slots__ = ('__weakref__',)
+
+
+class _Sharded:
+    """Per-thread value lists, created on a thread's first write
+
+    When a thread exits its owner is collected and the finalizer queues the
+    shard's key (a plain append, safe from any thread); queued shards are
+    added to the base totals on the next read or shard creation
+    """
+
+    def __init__(self, width: int):
+        self._width = width
+        self._local = threading.local()
+        self._shards: Dict[int, list] = {}
+        self._base = [0] * width
+        self._retired: List[int] = []
+        self._keys = itertools.count()
+        self._lock = threading.Lock()
+
+    def _shard(self) -> list:
+        shard = [0] * self._width
+        owner = _Owner()
+        with self._lock:
+            self._fold()
+            key = next(self._keys)
+            self._shards[key] = shard
+        weakref.finalize(owner, self._retired.append, key)
+        self._local.owner = owner
+        self._local.shard = shard
+        return shard
+
+    def _fold(self) -> None:
+        """Add shards of finished threads to the base totals (lock held)"""
+        while self._retired:
+            for i, value in enumerate(self._shards.pop(self._retired.pop())):
+                self._base[i] += value
+
+    def _totals(self) -> list:
+        with self._lock:
+            self._fold()
+            totals = list(self._base)
+            for shard in self._shards.values():
+                for i, value in enumerate(shard):
+                    totals[i] += value
+        return totals
+
+
+class Counter(_Sharded):
+    """Monotonic counter"""
+
+    def __init__(self):
+        super().__init__(1)
+
+    def inc(self, amount: float = 1) -> None:
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._shard()
+        shard[0] += amount
+
+    @property
+    def value(self) -> float:
+        return self._totals()[0]
+
+
+class _Timer:
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram: 'Histogram'):
+        self.histogram = histogram
+
+    def __enter__(self) -> '_Timer':
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.histogram.observe(perf_counter() - self.start)
+
+
+class Histogram(_Sharded):
+    """Fixed-bucket histogram; the last shard slot accumulates the sum"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.bounds = tuple(buckets)
+        super().__init__(len(self.bounds) + 2)
+
+    def observe(self, value: float) -> None:
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._shard()
+        shard[bisect_left(self.bounds, value)] += 1
+        shard[-1] += value
+
+    def time(self) -> _Timer:
+        """Context manager observing the elapsed seconds of its block"""
+        return _Timer(self)
+
+    def snapshot(self) -> Dict:
+        totals = self._totals()
+        counts, total_sum = totals[:-1], totals[-1]
+        cumulative, running = [], 0
+        for count in counts:
+            running += count
+            cumulative.append(running)
+        return {'buckets': list(zip(self.bounds + (float('inf'),), cumulative)),
+                'sum': total_sum, 'count': running}
+
+
+class Registry:
+    """Named metric families keyed by label set"""
+
+    def __init__(self):
+        self._families: Dict[str, Tuple[str, str, Dict[Labels, _Sharded]]] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, kind: str, name: str, help: str, labels: Dict[str, str], factory) -> _Sharded:
+        key: Labels = tuple(sorted(labels.items()))
+        family = self._families.get(name)
+        if family is not None:
+            metric = family[2].get(key)
+            if metric is not None:
+                return metric
+        with self._lock:
+            family = self._families.setdefault(name, (kind, help, {}))
+            if family[0] != kind:
+                raise ValueError(f"{name} already registered as a {family[0]}")
+            return family[2].setdefault(key, factory())
+
+    def counter(self, name: str, help: str = '', **labels: str) -> Counter:
+        return self._get('counter', name, help, labels, Counter)
+
+    def histogram(self, name: str, help: str = '',
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS, **labels: str) -> Histogram:
+        return self._get('histogram', name, help, labels, lambda: Histogram(buckets))
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """JSON-friendly view: name -> {labels string: value or histogram summary}"""
+        result = {}
+        for name, (kind, _, metrics) in list(self._families.items()):
+            series = {}
+            for labels, metric in list(metrics.items()):
+                key = ','.join(f'{k}={v}' for k, v in labels)
+                if kind == 'counter':
+                    series[key] = metric.value
+                else:
+                    snap = metric.snapshot()
+                    series[key] = {'count': snap['count'], 'sum': snap['sum'],
+                                   'mean': snap['sum'] / snap['count'] if snap['count'] else 0.0}
+            result[name] = series
+        return result
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format (0.0.4)"""
+        lines = []
+        for name, (kind, help, metrics) in sorted(self._families.items()):
+            if help:
+                lines.append(f'# HELP {name} {help}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, metric in sorted(metrics.items()):
+                if kind == 'counter':
+                    lines.append(f'{name}{_format_labels(labels)} {_number(metric.value)}')
+                    continue
+                snap = metric.snapshot()
+                for bound, count in snap['buckets']:
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f'{name}_bucket{_format_labels(labels + (("le", le),))} {count}')
+                lines.append(f'{name}_sum{_format_labels(labels)} {_number(snap["sum"])}')
+                lines.append(f'{name}_count{_format_labels(labels)} {snap["count"]}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(str(v))}"' for k, v in labels) + '}'
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+REGISTRY = Registry()
+counter = REGISTRY.counter
+histogram = REGISTRY.histogram
+
+
+def timed(name: str, help: str = '', **labels: str) -> Callable:
+    """Decorator recording call latency into a histogram (errors counted separately)"""
+    def decorate(fn: Callable) -> Callable:
+        if not ENABLED:
+            return fn
+        hist = histogram(name, help, **labels)
+        errors = counter(f'{name.rsplit("_seconds", 1)[0]}_errors_total',
+                         f'Exceptions raised by {fn.__qualname__}', **labels)
+
+        bounds, local = hist.bounds, hist._local
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            except BaseException:
+                errors.inc()
+                raise
+            finally:
+                # Histogram.observe inlined: this wrapper sits on every hot path
+                elapsed = perf_counter() - start
+                try:
+                    shard = local.shard
+                except AttributeError:
+                    shard = hist._shard()
+                shard[bisect_left(bounds, elapsed)] += 1
+                shard[-1] += elapsed
+        return wrapper
+    return decorate
+
+
+# Export
+__all__ = ['Counter', 'Histogram', 'Registry', 'REGISTRY', 'counter', 'histogram', 'timed']
@@ -4,15 +4,29 @@ ZSPOOF ML Engine - AI-Powered MAC Generation
 Uses machine learning for intelligent spoofing
 """
 
+import os
 import random
 import hashlib
+import math
+import threading
 import time
+import weakref
+from array import array
+from itertools import compress
 from datetime import datetime
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Iterable, Iterator, Sequence, Tuple, Optional, Union
 from dataclasses import dataclass
-from collections import defaultdict
+from collections import Counter
 import json
 
+from mac_array import MacArray
+from mac_generator import format_records, slot_counts
+from rng_streams import StreamRandom
+from metrics import counter, timed
+from oui_registry import get_registry, format_oui
+from scan_sources import ScanSource, iter_chunks
+from uniqueness import MAX_REDRAWS
+
 @dataclass
 class NetworkFingerprint:
     """Network environment fingerprint"""
@@ -30,58 +44,380 @@ class MACIntelligence:
     reasoning: str
     risk_level: str  # low, medium, high
 
+@dataclass
+class IntelligenceBatch:
+    """Columnar generate_intelligent_batch result: one row per MAC
+    
+    Every row of a batch shares the strategy, so confidence, reasoning and
+    risk level are stored once; iterating yields MACIntelligence rows
+    """
+    records: bytes  # packed 6-byte MACs
+    vendors: List[str]
+    confidence: float
+    reasoning: str
+    risk_level: str
+    
+    def __len__(self) -> int:
+        return len(self.vendors)
+    
+    def macs(self) -> List[str]:
+        return format_records(self.records)
+    
+    def mac_array(self) -> MacArray:
+        return MacArray.from_records(self.records)
+    
+    def __iter__(self) -> Iterator[MACIntelligence]:
+        for mac, vendor in zip(self.macs(), self.vendors):
+            yield MACIntelligence(mac, self.confidence, vendor, self.reasoning, self.risk_level)
+
+Timestamp = Union[datetime, float, int, str, None]
+
+def _instant(when: Timestamp) -> Timestamp:
+    """Numeric strings (epoch seconds from CSV exports) as floats"""
+    if isinstance(when, str):
+        try:
+            return float(when)
+        except ValueError:
+            pass
+    return when
+
+def _hour_of(when: Timestamp) -> int:
+    """Hour of day for a datetime, epoch seconds (number or numeric string) or ISO string (default: now)"""
+    when = _instant(when)
+    if when is None:
+        return datetime.now().hour
+    if isinstance(when, datetime):
+        return when.hour
+    if isinstance(when, str):
+        return datetime.fromisoformat(when).hour
+    return datetime.fromtimestamp(when).hour
+
+def _presence_hours(device: Dict) -> List[int]:
+    """Hours of day covered by a device's first_seen..last_seen window
+
+    Unparseable timestamps are counted and the device left out of the hours
+    """
+    # Empty CSV cells count as missing
+    first, last = (_instant(device.get(key) or None) for key in ('first_seen', 'last_seen'))
+    first = last if first is None else first
+    last = first if last is None else last
+    if first is None:
+        return []
+    try:
+        start, end = _hour_of(first), _hour_of(last)
+    except (ValueError, TypeError, OverflowError, OSError):
+        counter('zspoof_ml_bad_timestamps_total', 'Scan timestamps that could not be parsed').inc()
+        return []
+    if isinstance(first, (int, float)) and isinstance(last, (int, float)) and last - first >= 86400:
+        return list(range(24))
+    return [(start + i) % 24 for i in range((end - start) % 24 + 1)]
+
+def _time_patterns(hour_counts: List[Counter]) -> Dict[int, List[str]]:
+    """Vendors present per hour, most common first"""
+    return {
+        hour: [vendor for vendor, _ in counts.most_common()]
+        for hour, counts in enumerate(hour_counts) if counts
+    }
+
+def _clog(count: int) -> float:
+    return count * math.log2(count) if count > 0 else 0.0
+
+class FingerprintTracker:
+    """Incrementally maintained network fingerprint
+    
+    Keeps running vendor counts, per-hour presence buckets and the sum of
+    c*log2(c) over vendor counts, so entropy and risk_score update in
+    O(changed devices) and fingerprint() never rescans the network.
+    """
+    
+    def __init__(self, registry=None):
+        self.registry = registry or get_registry()
+        self.devices: Dict[str, List] = {}  # mac -> [vendor, hour bitmask]
+        self.vendor_counts: Counter = Counter()
+        self.hour_counts: List[Counter] = [Counter() for _ in range(24)]
+        self._sum_clog = 0.0
+    
+    def __len__(self) -> int:
+        return len(self.devices)
+    
+    def __contains__(self, mac: str) -> bool:
+        return mac.upper() in self.devices
+    
+    def _bump(self, vendor: str, delta: int):
+        count = self.vendor_counts[vendor]
+        self._sum_clog += _clog(count + delta) - _clog(count)
+        if count + delta:
+            self.vendor_counts[vendor] = count + delta
+        else:
+            del self.vendor_counts[vendor]
+    
+    def add(self, mac: str, when: Timestamp = None, vendor: Optional[str] = None):
+        """Record a device joining the network"""
+        mac = mac.upper()
+        if mac not in self.devices:
+            vendor = vendor or self.registry.lookup(mac) or 'unknown'
+            self.devices[mac] = [vendor, 0]
+            self._bump(vendor, 1)
+        self.seen(mac, when)
+    
+    def remove(self, mac: str):
+        """Record a device leaving the network"""
+        entry = self.devices.pop(mac.upper(), None)
+        if entry is None:
+            return
+        vendor, mask = entry
+        self._bump(vendor, -1)
+        for hour in range(24):
+            if mask >> hour & 1:
+                counts = self.hour_counts[hour]
+                counts[vendor] -= 1
+                if not counts[vendor]:
+                    del counts[vendor]
+    
+    def seen(self, mac: str, when: Timestamp = None):
+        """Mark a known device present in the hour of `when`"""
+        entry = self.devices.get(mac.upper())
+        if entry is None:
+            self.add(mac, when)
+            return
+        hour = _hour_of(when)
+        if not entry[1] >> hour & 1:
+            entry[1] |= 1 << hour
+            self.hour_counts[hour][entry[0]] += 1
+    
+    def apply(self, added: Iterable[str] = (), removed: Iterable[str] = (),
+              seen: Iterable[str] = (), when: Timestamp = None):
+        """Apply one batch of add/remove/seen deltas"""
+        for mac in removed:
+            self.remove(mac)
+        for mac in added:
+            self.add(mac, when)
+        for mac in seen:
+            self.seen(mac, when)
+    
+    def sync(self, macs: Union[Iterable[str], MacArray], when: Timestamp = None) -> Dict[str, int]:
+        """Reconcile with a full scan; only the differences touch the counts"""
+        if isinstance(macs, MacArray):
+            macs = macs.to_strings()
+        current = {mac.upper() for mac in macs}
+        known = self.devices.keys()
+        added, removed = current - known, known - current
+        self.apply(added=added, removed=list(removed), seen=current, when=when)
+        return {'added': len(added), 'removed': len(removed), 'total': len(current)}
+    
+    @property
+    def entropy(self) -> float:
+        """Normalised Shannon entropy of the vendor distribution"""
+        total, vendors = len(self.devices), len(self.vendor_counts)
+        if vendors <= 1:
+            return 0.0
+        entropy = math.log2(total) - self._sum_clog / total
+        return max(0.0, entropy) / math.log2(vendors)
+    
+    def fingerprint(self) -> NetworkFingerprint:
+        """Current fingerprint without rescanning"""
+        total = len(self.devices)
+        if not total:
+            return NetworkFingerprint(
+                vendor_distribution={},
+                common_patterns=[],
+                time_patterns={},
+                risk_score=0.5
+            )
+        return NetworkFingerprint(
+            vendor_distribution={v: c/total for v, c in self.vendor_counts.items()},
+            common_patterns=[v for v, _ in self.vendor_counts.most_common()],
+            time_patterns=_time_patterns(self.hour_counts),
+            risk_score=1.0 - self.entropy
+        )
+
+# Vendor patterns with ML weighting
+VENDOR_PATTERNS: Dict[str, Dict] = {
+    'corporate': {
+        'vendors': ['dell', 'lenovo', 'hp', 'cisco'],
+        'time_preference': [8, 9, 10, 11, 12, 13, 14, 15, 16, 17],  # Business hours
+        'detection_risk': 0.3,
+        'behavioral_pattern': 'stable'
+    },
+    'byod': {
+        'vendors': ['apple', 'samsung', 'google'],
+        'time_preference': [7, 8, 9, 17, 18, 19, 20, 21],
+        'detection_risk': 0.2,
+        'behavioral_pattern': 'dynamic'
+    },
+    'iot': {
+        'vendors': ['espressif', 'amazon', 'tuya'],
+        'time_preference': list(range(24)),  # 24/7
+        'detection_risk': 0.4,
+        'behavioral_pattern': 'consistent'
+    }
+}
+
+
+def _temporal_weight(hour: int) -> float:
+    """Time-based weight for realism"""
+    if 9 <= hour <= 17:    # Peak hours: business
+        return 1.5
+    if 18 <= hour <= 22:   # Evening
+        return 1.2
+    return 0.7             # Night: 23-08
+
+
+# Computed once per process; every engine shares the same tables
+TEMPORAL_WEIGHTS: Dict[int, float] = {hour: _temporal_weight(hour) for hour in range(24)}
+
+# Vendors without registered prefixes draw from the locally administered block
+LOCAL_OUI = 0x020000
+
+# Detection heuristics shared by single and batch scoring
+BASE_RISK = 0.3
+OFF_HOURS_RISK = 0.2      # corporate device outside 07:00-19:59
+UNKNOWN_VENDOR_RISK = 0.3  # OUI not in the registry
+
+# Batch scoring packs the rules into one code byte per MAC:
+# bit 0 = unknown vendor, bit 1 = corporate off-hours
+_UNKNOWN, _OFF_HOURS = 1, 2
+_OFF_HOURS_BY_HOUR = bytes(_OFF_HOURS if hour < 7 or hour > 19 else 0 for hour in range(256))
+_INVERT_BIT = bytes(b ^ 1 for b in range(256))
+RISK_BY_CODE: Tuple[float, ...] = tuple(
+    min(BASE_RISK + OFF_HOURS_RISK * bool(code & _OFF_HOURS)
+        + UNKNOWN_VENDOR_RISK * bool(code & _UNKNOWN), 1.0)
+    for code in range(4)
+)
+# Byte j of each code's native float64, as a translate table per byte lane
+_RISK_LANES = [
+    bytes(array('d', RISK_BY_CODE).tobytes()[8 * (code & 3) + lane] for code in range(256))
+    for lane in range(8)
+]
+
+
+def _alias_table(weights: List[float]) -> Tuple[List[float], List[int]]:
+    """Vose's alias method: (probability, alias) per column"""
+    k = len(weights)
+    total = sum(weights)
+    scaled = [w * k / total for w in weights]
+    prob, alias = [1.0] * k, list(range(k))
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+    while small and large:
+        lo, hi = small.pop(), large.pop()
+        prob[lo], alias[lo] = scaled[lo], hi
+        scaled[hi] += scaled[lo] - 1.0
+        (small if scaled[hi] < 1.0 else large).append(hi)
+    # Leftovers are 1.0 up to rounding and keep their own column
+    return prob, alias
+
+
+def _per_mac(values: bytes, n: int, name: str) -> bytes:
+    if len(values) != n:
+        raise ValueError(f"expected {n} {name}, got {len(values)}")
+    return values
+
+
+def _with_nic(oui: str, nic: int) -> str:
+    return f"{oui}:{nic >> 16:02X}:{nic >> 8 & 0xFF:02X}:{nic & 0xFF:02X}"
+
+
+class VendorSampler:
+    """Weighted (vendor, OUI) picker compiled from a vendor distribution
+    
+    Each vendor's weight is split evenly over its MA-L prefixes, so one draw
+    picks both. Single draws go through a Walker/Vose alias table (one
+    random() per pick, whatever the vendor count); batches resolve uint16
+    draws through a 65536-slot table like mac_generator's profile tables
+    """
+    
+    def __init__(self, weights: Dict[str, float], registry):
+        self.vendor_count = len(weights)
+        self.vendors: List[str] = []
+        ouis, split = [], []
+        for vendor, weight in weights.items():
+            prefixes = registry.prefixes_for(vendor) or (LOCAL_OUI,)
+            for prefix in prefixes:
+                self.vendors.append(vendor)
+                ouis.append(prefix)
+                split.append(weight / len(prefixes))
+        self.weights = split
+        self.oui_strings = [format_oui(oui) for oui in ouis]
+        self.oui_records = [oui.to_bytes(3, 'big') for oui in ouis]
+        self.prob, self.alias = _alias_table(split)
+        self._slots: Optional[Tuple[int, ...]] = None
+    
+    def __len__(self) -> int:
+        return len(self.vendors)
+    
+    def draw(self, rng: random.Random = random) -> int:
+        """Index of one weighted (vendor, OUI) outcome"""
+        u = rng.random() * len(self.prob)
+        i = int(u)
+        return i if u - i < self.prob[i] else self.alias[i]
+    
+    def slots(self) -> Tuple[int, ...]:
+        """65536-entry table mapping a uint16 draw to an outcome index"""
+        if self._slots is None:
+            self._slots = tuple(
+                i for i, count in enumerate(slot_counts(self.weights)) for _ in range(count)
+            )
+        return self._slots
+    
+    def records(self, n: int, rng: Optional[StreamRandom] = None) -> Tuple[bytes, List[int]]:
+        """n packed MACs with random NIC bytes, and the outcome index of each"""
+        rand = os.urandom(5 * n) if rng is None else rng.randbytes(5 * n)
+        picks = list(map(self.slots().__getitem__, memoryview(rand)[:2 * n].cast('H')))
+        ouis = b''.join(map(self.oui_records.__getitem__, picks))
+        raw = bytearray(6 * n)
+        for i in range(3):
+            raw[i::6] = ouis[i::3]
+            raw[3 + i::6] = rand[2 * n + i::3]
+        return bytes(raw), picks
+
+
 class MLMACEngine:
     """Machine Learning-based MAC generation"""
     
     def __init__(self):
-        self.vendor_patterns = self._load_vendor_patterns()
-        self.temporal_weights = self._calculate_temporal_weights()
+        self.registry = get_registry()
+        self.vendor_patterns = VENDOR_PATTERNS
+        self.temporal_weights = TEMPORAL_WEIGHTS
         self.detection_scores = {}
+        self._profile_samplers: Dict[str, VendorSampler] = {}
+        self._fingerprint_samplers: Dict[int, Tuple[weakref.ref, VendorSampler]] = {}
+        self._confidence_tables: Dict[str, List[Tuple[float, str]]] = {}
+        self._vendor_ouis: Dict[str, Tuple[str, ...]] = {}
         
-    def _load_vendor_patterns(self) -> Dict:
-        """Load vendor patterns with ML weighting"""
-        return {
-            'corporate': {
-                'vendors': ['dell', 'lenovo', 'hp', 'cisco'],
-                'time_preference': [8, 9, 10, 11, 12, 13, 14, 15, 16, 17],  # Business hours
-                'detection_risk': 0.3,
-                'behavioral_pattern': 'stable'
-            },
-            'byod': {
-                'vendors': ['apple', 'samsung', 'google'],
-                'time_preference': [7, 8, 9, 17, 18, 19, 20, 21],
-                'detection_risk': 0.2,
-                'behavioral_pattern': 'dynamic'
-            },
-            'iot': {
-                'vendors': ['espressif', 'amazon', 'tuya'],
-                'time_preference': list(range(24)),  # 24/7
-                'detection_risk': 0.4,
-                'behavioral_pattern': 'consistent'
-            }
-        }
-    
-    def _calculate_temporal_weights(self) -> Dict[int, float]:
-        """Calculate time-based weights for realism"""
-        current_hour = datetime.now().hour
-        weights = {}
+    @timed('zspoof_ml_seconds', 'ML engine call latency', method='analyze_network_environment')
+    def analyze_network_environment(
+        self, scan_results: Union[ScanSource, MacArray]
+    ) -> NetworkFingerprint:
+        """Analyze network to determine optimal spoofing strategy
         
-        for hour in range(24):
-            # Peak hours: 9-17 (business)
-            if 9 <= hour <= 17:
-                weights[hour] = 1.5
-            # Evening: 18-22
-            elif 18 <= hour <= 22:
-                weights[hour] = 1.2
-            # Night: 23-06
-            else:
-                weights[hour] = 0.7
-                
-        return weights
-    
-    def analyze_network_environment(self, scan_results: List[Dict]) -> NetworkFingerprint:
-        """Analyze network to determine optimal spoofing strategy"""
-        if not scan_results:
+        Accepts a list of scan dicts, any iterable of dicts or MAC strings, a
+        path to an NDJSON/CSV export or pcap/pcapng capture (consumed in
+        bounded chunks), or a MacArray (vendors counted once per distinct OUI).
+        """
+        # Analyze vendor distribution
+        vendor_count = Counter()
+        hour_counts = [Counter() for _ in range(24)]
+        total = 0
+        lookup = self.registry.lookup
+        if isinstance(scan_results, MacArray):
+            vendor_count = scan_results.vendor_counts(self.registry)
+            total = len(scan_results)
+            scan_results = ()
+        for chunk in iter_chunks(scan_results):
+            vendors = [
+                device.get('vendor') or lookup(device.get('mac', '')) or 'unknown'
+                for device in chunk
+            ]
+            vendor_count.update(vendors)
+            total += len(chunk)
+            
+            # Hour buckets from first_seen/last_seen on devices that carry them
+            for device, vendor in zip(chunk, vendors):
+                for hour in _presence_hours(device):
+                    hour_counts[hour][vendor] += 1
+        
+        if not total:
             return NetworkFingerprint(
                 vendor_distribution={},
                 common_patterns=[],
@@ -89,14 +425,6 @@ class MLMACEngine:
                 risk_score=0.5
             )
         
-        # Analyze vendor distribution
-        vendor_count = defaultdict(int)
-        for device in scan_results:
-            mac = device.get('mac', '')
-            vendor = self._identify_vendor(mac)
-            vendor_count[vendor] += 1
-        
-        total = len(scan_results)
         distribution = {v: c/total for v, c in vendor_count.items()}
         
         # Calculate risk score
@@ -106,121 +434,236 @@ class MLMACEngine:
         return NetworkFingerprint(
             vendor_distribution=distribution,
             common_patterns=list(vendor_count.keys()),
-            time_patterns={},
+            time_patterns=_time_patterns(hour_counts),
             risk_score=risk_score
         )
     
     def _identify_vendor(self, mac: str) -> str:
-        """Identify vendor from MAC OUI"""
-        oui = mac[:8].upper()
-        
-        # Common OUI mappings (simplified)
-        oui_map = {
-            '00:14:22': 'dell',
-            '00:59:07': 'lenovo',
-            'F0:18:98': 'apple',
-            '34:14:5F': 'samsung',
-            '24:0A:C4': 'espressif',
-        }
-        
-        return oui_map.get(oui, 'unknown')
+        """Identify vendor from MAC OUI (longest-prefix registry match)"""
+        return self.registry.lookup(mac) or 'unknown'
     
     def _calculate_entropy(self, distribution: Dict[str, float]) -> float:
         """Calculate Shannon entropy of distribution"""
-        import math
         entropy = 0.0
         for prob in distribution.values():
             if prob > 0:
                 entropy -= prob * math.log2(prob)
-        return entropy / math.log2(len(distribution)) if distribution else 0
+        return entropy / math.log2(len(distribution)) if len(distribution) > 1 else 0
     
+    def _fingerprint_sampler(self, fingerprint: NetworkFingerprint) -> VendorSampler:
+        """Sampler compiled once per fingerprint object (dropped with it)"""
+        key = id(fingerprint)
+        entry = self._fingerprint_samplers.get(key)
+        if entry is not None and entry[0]() is fingerprint:
+            return entry[1]
+        sampler = VendorSampler(fingerprint.vendor_distribution, self.registry)
+        ref = weakref.ref(fingerprint, lambda _, key=key: self._fingerprint_samplers.pop(key, None))
+        self._fingerprint_samplers[key] = (ref, sampler)
+        return sampler
+    
+    def _strategy(
+        self, profile: str, network_fingerprint: Optional[NetworkFingerprint], hour: Optional[int]
+    ) -> Tuple[VendorSampler, float, str, str]:
+        """(sampler, confidence, risk level, reasoning) for one pick or a batch"""
+        # If network fingerprint available, blend in with the existing network
+        if network_fingerprint and network_fingerprint.vendor_distribution:
+            sampler = self._fingerprint_sampler(network_fingerprint)
+            reasoning = f"Blending with {sampler.vendor_count} vendors detected on network"
+            return sampler, 0.9, 'low', reasoning
+        
+        # Profile-based selection: vendors uniform, confidence by hour of day
+        name = profile if profile in self.vendor_patterns else 'corporate'
+        sampler = self._profile_samplers.get(name)
+        if sampler is None:
+            vendors = self.vendor_patterns[name]['vendors']
+            sampler = self._profile_samplers[name] = VendorSampler(
+                dict.fromkeys(vendors, 1.0), self.registry)
+        table = self._confidence_tables.get(name)
+        if table is None:
+            table = self._confidence_tables[name] = [
+                (round(confidence, 2), risk_level)
+                for confidence, risk_level in map(self.profile_confidence, [name] * 24, range(24))
+            ]
+        confidence, risk_level = table[time.localtime().tm_hour if hour is None else hour]
+        return sampler, confidence, risk_level, f"Profile-based selection ({profile})"
+    
+    @timed('zspoof_ml_seconds', 'ML engine call latency', method='generate_intelligent_mac')
     def generate_intelligent_mac(
         self, 
         profile: str,
-        network_fingerprint: Optional[NetworkFingerprint] = None
+        network_fingerprint: Optional[NetworkFingerprint] = None,
+        hour: Optional[int] = None,
+        rng: Optional[StreamRandom] = None,
+        unique=None
     ) -> MACIntelligence:
-        """Generate MAC with AI-powered intelligence"""
-        
-        current_hour = datetime.now().hour
-        temporal_weight = self.temporal_weights.get(current_hour, 1.0)
+        """Generate MAC with AI-powered intelligence (hour defaults to now)
         
-        # If network fingerprint available, use it
-        if network_fingerprint and network_fingerprint.vendor_distribution:
-            # Blend in with existing network
-            vendors = list(network_fingerprint.vendor_distribution.keys())
-            weights = list(network_fingerprint.vendor_distribution.values())
-            selected_vendor = random.choices(vendors, weights=weights)[0]
-            confidence = 0.9
-            risk_level = 'low'
-            reasoning = f"Blending with {len(vendors)} vendors detected on network"
+        Pass a seeded rng_streams stream for reproducible picks, and a
+        uniqueness.UniquenessIndex to redraw MACs it has already recorded
+        """
+        sampler, confidence, risk_level, reasoning = self._strategy(
+            profile, network_fingerprint, hour)
+        rng = rng or random
+        for _ in range(MAX_REDRAWS):
+            pick = sampler.draw(rng)
+            mac = _with_nic(sampler.oui_strings[pick], rng.getrandbits(24))
+            if unique is None or unique.add(mac):
+                break
         else:
-            # Use profile-based selection
-            pattern = self.vendor_patterns.get(profile, self.vendor_patterns['corporate'])
-            
-            # Temporal adjustment
-            if current_hour in pattern['time_preference']:
-                confidence = 0.85 * temporal_weight
-            else:
-                confidence = 0.65 * temporal_weight
-            
-            selected_vendor = random.choice(pattern['vendors'])
-            risk_level = 'medium' if pattern['detection_risk'] > 0.3 else 'low'
-            reasoning = f"Profile-based selection ({profile})"
-        
-        # Generate MAC (simplified - in real implementation, call C++ engine)
-        mac = self._generate_mac_for_vendor(selected_vendor)
-        
+            raise RuntimeError(f"no unused MAC for {profile!r} after {MAX_REDRAWS} draws")
         return MACIntelligence(
             mac=mac,
-            confidence=round(confidence, 2),
-            vendor=selected_vendor,
+            confidence=confidence,
+            vendor=sampler.vendors[pick],
             reasoning=reasoning,
             risk_level=risk_level
         )
     
-    def _generate_mac_for_vendor(self, vendor: str) -> str:
-        """Generate MAC address for specific vendor"""
-        # Vendor OUI prefixes
-        oui_map = {
-            'dell': ['00:14:22', '00:11:43', 'F0:4D:A2'],
-            'lenovo': ['00:59:07', '80:96:B1', 'E0:2C:B2'],
-            'apple': ['F0:18:98', '00:1C:B3', '28:E1:4C'],
-            'samsung': ['34:14:5F', '00:12:47', 'E8:50:8B'],
-            'espressif': ['24:0A:C4', '30:AE:A4', 'A4:CF:12'],
-            'cisco': ['00:40:96', '00:00:0C', 'E8:BA:70'],
-            'google': ['F4:F5:D8', '3C:5A:B4', '84:73:03'],
-            'amazon': ['74:C2:46', 'F0:D2:F1', 'CC:50:E3'],
-        }
+    @timed('zspoof_ml_seconds', 'ML engine call latency', method='generate_intelligent_batch')
+    def generate_intelligent_batch(
+        self,
+        profile: str,
+        n: int,
+        network_fingerprint: Optional[NetworkFingerprint] = None,
+        hour: Optional[int] = None,
+        rng: Optional[StreamRandom] = None,
+        unique=None
+    ) -> IntelligenceBatch:
+        """n generate_intelligent_mac picks in one pass, as columns
         
-        ouis = oui_map.get(vendor, ['02:00:00'])  # Default to locally administered
-        oui = random.choice(ouis)
+        With a uniqueness index, records it already holds are redrawn in bulk
+        """
+        sampler, confidence, risk_level, reasoning = self._strategy(
+            profile, network_fingerprint, hour)
+        if n <= 0:
+            return IntelligenceBatch(b'', [], confidence, reasoning, risk_level)
+        records, picks = sampler.records(n, rng)
+        if unique is not None:
+            records, picks = self._unique_records(sampler, unique, records, picks, n, rng)
+        return IntelligenceBatch(
+            records=records,
+            vendors=list(map(sampler.vendors.__getitem__, picks)),
+            confidence=confidence,
+            reasoning=reasoning,
+            risk_level=risk_level
+        )
+    
+    @staticmethod
+    def _unique_records(sampler: VendorSampler, unique, records: bytes, picks: List[int],
+                        n: int, rng: Optional[StreamRandom]) -> Tuple[bytes, List[int]]:
+        """Keep the records new to `unique` (with their picks), redrawing the rest"""
+        parts, kept, missing = [], [], n
+        for _ in range(MAX_REDRAWS):
+            fresh = unique.fresh(records)
+            if fresh.count(1) == len(picks):
+                parts.append(records)
+                kept.extend(picks)
+            else:
+                parts.append(MacArray.from_records(records).select(fresh).to_records())
+                kept.extend(compress(picks, fresh))
+            missing -= fresh.count(1)
+            if not missing:
+                return b''.join(parts), kept
+            records, picks = sampler.records(missing, rng)
+        raise RuntimeError(f"address space exhausted ({n - missing} of {n} unique MACs drawn)")
+    
+    def profile_confidence(self, profile: str, hour: Optional[int] = None) -> Tuple[float, str]:
+        """(confidence, risk level) of a profile-based pick at this hour"""
+        if hour is None:
+            hour = datetime.now().hour
+        pattern = self.vendor_patterns.get(profile, self.vendor_patterns['corporate'])
+        temporal_weight = self.temporal_weights.get(hour, 1.0)
         
-        # Generate random NIC portion
-        nic = ':'.join([f'{random.randint(0, 255):02X}' for _ in range(3)])
+        # Temporal adjustment
+        if hour in pattern['time_preference']:
+            confidence = 0.85 * temporal_weight
+        else:
+            confidence = 0.65 * temporal_weight
         
-        return f"{oui}:{nic}"
+        risk_level = 'medium' if pattern['detection_risk'] > 0.3 else 'low'
+        return confidence, risk_level
     
-    def predict_detection_probability(self, mac: str, environment: str) -> float:
-        """Predict probability of detection using heuristics"""
+    def _generate_mac_for_vendor(self, vendor: str) -> str:
+        """Generate MAC address for specific vendor"""
+        ouis = self._vendor_ouis.get(vendor)
+        if ouis is None:
+            prefixes = self.registry.prefixes_for(vendor) or (LOCAL_OUI,)
+            ouis = self._vendor_ouis[vendor] = tuple(map(format_oui, prefixes))
+        return _with_nic(random.choice(ouis), random.getrandbits(24))
+    
+    @timed('zspoof_ml_seconds', 'ML engine call latency', method='predict_detection_probability')
+    def predict_detection_probability(self, mac: str, environment: str,
+                                      when: Timestamp = None) -> float:
+        """Predict probability of detection using heuristics (scored at `when`, default now)"""
         
         # Factors that increase detection:
         # 1. MAC doesn't match common vendors in environment
         # 2. Timing anomaly (e.g., corporate device at 3 AM)
         # 3. Behavioral anomaly
         
-        base_risk = 0.3
-        current_hour = datetime.now().hour
+        code = 0
         
         # Time-based risk
-        if environment == 'corporate' and (current_hour < 7 or current_hour > 19):
-            base_risk += 0.2
+        if environment == 'corporate':
+            code |= _OFF_HOURS_BY_HOUR[_hour_of(when)]
         
         # Vendor-based risk
-        vendor = self._identify_vendor(mac)
-        if vendor == 'unknown':
-            base_risk += 0.3
+        if self._identify_vendor(mac) == 'unknown':
+            code |= _UNKNOWN
+        
+        return RISK_BY_CODE[code]
+    
+    @timed('zspoof_ml_seconds', 'ML engine call latency', method='predict_detection_batch')
+    def predict_detection_batch(
+        self,
+        macs: Union[MacArray, bytes, Iterable[str]],
+        environment: Union[str, Sequence[str]],
+        hours: Union[int, Sequence[int], None] = None,
+        when: Timestamp = None
+    ) -> array:
+        """predict_detection_probability for many MACs as an array('d')
+        
+        macs is a MacArray, packed 6-byte records or MAC strings; environment
+        and hours are one value for all or one per MAC. Without hours every
+        MAC is scored at `when` (default now). Vendor matching is one
+        registered-OUI mask over the whole array and the rules combine as
+        byte masks, so no per-MAC lookup runs in Python.
+        Wrap with numpy.frombuffer for a zero-copy float64 vector.
+        """
+        if not isinstance(macs, MacArray):
+            if isinstance(macs, (bytes, bytearray, memoryview)):
+                macs = MacArray.from_records(bytes(macs))
+            else:
+                macs = MacArray.from_strings(macs)
+        n = len(macs)
+        if not n:
+            return array('d')
+        
+        # Off-hours bit: by hour, then kept only for corporate environments
+        if hours is None:
+            hours = _hour_of(when)
+        if isinstance(hours, int):
+            off_hours = bytes([_OFF_HOURS_BY_HOUR[hours]]) * n
+        else:
+            off_hours = _per_mac(bytes(hours).translate(_OFF_HOURS_BY_HOUR), n, 'hours')
+        if isinstance(environment, str):
+            if environment != 'corporate':
+                off_hours = bytes(n)
+        else:
+            corporate = _per_mac(bytes(_OFF_HOURS if env == 'corporate' else 0
+                                       for env in environment), n, 'environments')
+            off_hours = (int.from_bytes(off_hours, 'big') & int.from_bytes(corporate, 'big')
+                         ).to_bytes(n, 'big')
         
-        return min(base_risk, 1.0)
+        # Unknown-vendor bit: registered mask 1 -> 0, 0 -> 1
+        unknown = macs.registered_mask(self.registry).translate(_INVERT_BIT)
+        codes = (int.from_bytes(unknown, 'big') | int.from_bytes(off_hours, 'big')).to_bytes(n, 'big')
+        wide = bytearray(8 * n)
+        for lane, table in enumerate(_RISK_LANES):
+            wide[lane::8] = codes.translate(table)
+        scores = array('d')
+        scores.frombytes(bytes(wide))
+        return scores
     
     def generate_evasion_report(self, mac: str) -> Dict:
         """Generate evasion techniques report"""
@@ -247,14 +690,28 @@ class MLMACEngine:
             ]
         }
 
+_engine: Optional[MLMACEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> MLMACEngine:
+    """Process-wide engine shared by the dashboard, analyzer and CLIs"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = MLMACEngine()
+    return _engine
+
+
 class AdvancedNetworkAnalyzer:
     """Advanced network analysis with ML"""
     
-    def __init__(self):
-        self.ml_engine = MLMACEngine()
+    def __init__(self, ml_engine: Optional[MLMACEngine] = None):
+        self.ml_engine = ml_engine or get_engine()
     
-    def perform_deep_analysis(self, scan_results: List[Dict]) -> Dict:
-        """Perform deep network analysis"""
+    def perform_deep_analysis(self, scan_results: ScanSource) -> Dict:
+        """Perform deep network analysis (lists, iterables or NDJSON/CSV paths)"""
         
         fingerprint = self.ml_engine.analyze_network_environment(scan_results)
         
@@ -300,4 +757,8 @@ class AdvancedNetworkAnalyzer:
             return ['stealth', 'iot']
 
 # Export
-__all__ = ['MLMACEngine', 'AdvancedNetworkAnalyzer', 'MACIntelligence', 'NetworkFingerprint']
+__all__ = [
+    'MLMACEngine', 'AdvancedNetworkAnalyzer', 'MACIntelligence', 'NetworkFingerprint',
+    'IntelligenceBatch', 'VendorSampler', 'FingerprintTracker', 'get_engine',
+    'VENDOR_PATTERNS', 'TEMPORAL_WEIGHTS', 'RISK_BY_CODE',
+]
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+ZSPOOF Neighbors - Passive device source from the kernel neighbour table
+Dumps RTM_GETNEIGH (falling back to /proc/net/arp) and follows neighbour
+add/delete notifications, producing scan-style device dicts without
+sending a single packet
+"""
+
+import errno
+import select
+import socket
+import struct
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import inventory
+from metrics import timed
+from netlink import (
+    NDA_DST, NDA_LLADDR, RTM_DELNEIGH, RTM_GETNEIGH, RTM_NEWNEIGH, RTMGRP_NEIGH,
+    NetlinkSocket, parse_attrs,
+)
+
+PROC_ARP = '/proc/net/arp'
+
+# Neighbour Unreachability Detection states (ndm_state bits)
+NUD_STATES = (
+    (0x01, 'incomplete'), (0x02, 'reachable'), (0x04, 'stale'), (0x08, 'delay'),
+    (0x10, 'probe'), (0x20, 'failed'), (0x40, 'noarp'), (0x80, 'permanent'),
+)
+# No usable link-layer address, or not a real host (multicast/broadcast mappings)
+_UNUSABLE = 0x01 | 0x20 | 0x40
+
+ATF_COM = 0x02   # /proc/net/arp: entry resolved
+ATF_PERM = 0x04  # /proc/net/arp: static entry
+
+_NDMSG = struct.Struct('=BxxxiHBB')  # family, ifindex, state, flags, type
+
+ADDED = 'added'
+REMOVED = 'removed'
+
+
+@dataclass
+class Neighbor:
+    """One resolved neighbour table entry"""
+    ip: str
+    mac: str
+    interface: str
+    state: str
+
+    def to_device(self, registry=None) -> Dict:
+        """Same schema as an ARP scan result"""
+        return {
+            'ip': self.ip,
+            'mac': self.mac,
+            'vendor': (registry.lookup(self.mac) if registry else None) or 'unknown',
+            'interface': self.interface,
+            'state': self.state,
+        }
+
+
+def state_name(state: int) -> str:
+    for bit, name in NUD_STATES:
+        if state & bit:
+            return name
+    return 'none'
+
+
+def parse_neighbor(body, names: Dict[int, str]) -> Tuple[Optional[Neighbor], bool]:
+    """(entry, usable) from an RTM_NEWNEIGH/RTM_DELNEIGH body
+
+    The entry is None only when the message carries no destination address
+    """
+    family, index, state, _, _ = _NDMSG.unpack_from(body, 0)
+    attrs = parse_attrs(body, _NDMSG.size)
+    dst = attrs.get(NDA_DST)
+    if dst is None or family not in (socket.AF_INET, socket.AF_INET6):
+        return None, False
+    lladdr = attrs.get(NDA_LLADDR, b'')
+    entry = Neighbor(
+        ip=socket.inet_ntop(family, dst),
+        mac=lladdr.hex(':').upper(),
+        interface=names.get(index, str(index)),
+        state=state_name(state),
+    )
+    usable = len(lladdr) == 6 and any(lladdr) and not state & _UNUSABLE
+    return entry, usable
+
+
+def _interface_names(refresh: bool = False) -> Dict[int, str]:
+    return {iface.index: iface.name for iface in inventory.get_interfaces(refresh)}
+
+
+@timed('zspoof_neighbors_seconds', 'Neighbour table read latency', source='netlink')
+def _dump_netlink(family: int = socket.AF_INET) -> List[Neighbor]:
+    names = _interface_names()
+    entries = []
+    with NetlinkSocket() as nl:
+        payload = _NDMSG.pack(family, 0, 0, 0, 0)
+        for msg_type, body in nl.dump(RTM_GETNEIGH, payload):
+            if msg_type != RTM_NEWNEIGH:
+                continue
+            entry, usable = parse_neighbor(body, names)
+            if usable:
+                entries.append(entry)
+    return entries
+
+
+@timed('zspoof_neighbors_seconds', 'Neighbour table read latency', source='proc')
+def _read_proc_arp(path: str = PROC_ARP) -> List[Neighbor]:
+    entries = []
+    try:
+        with open(path) as f:
+            next(f, None)  # header
+            for line in f:
+                fields = line.split()
+                if len(fields) < 6:
+                    continue
+                flags = int(fields[2], 16)
+                if not flags & ATF_COM or fields[3] == '00:00:00:00:00:00':
+                    continue
+                entries.append(Neighbor(ip=fields[0], mac=fields[3].upper(), interface=fields[5],
+                                        state='permanent' if flags & ATF_PERM else 'reachable'))
+    except (OSError, ValueError):
+        pass
+    return entries
+
+
+def get_neighbors(interface: Optional[str] = None, family: int = socket.AF_INET) -> List[Neighbor]:
+    """Resolved neighbours (IPv4 by default; AF_UNSPEC adds IPv6)"""
+    try:
+        entries = _dump_netlink(family)
+    except (OSError, AttributeError):  # no AF_NETLINK on this platform
+        entries = _read_proc_arp()
+    if interface:
+        entries = [entry for entry in entries if entry.interface == interface]
+    return entries
+
+
+def get_devices(interface: Optional[str] = None, registry=None,
+                family: int = socket.AF_INET) -> List[Dict]:
+    """Neighbour table as scan-style device dicts, ready for the analyzer"""
+    return [entry.to_device(registry) for entry in get_neighbors(interface, family)]
+
+
+class NeighborWatcher:
+    """Non-blocking subscription to neighbour add/delete notifications
+
+    poll() drains whatever the kernel queued and returns (event, Neighbor)
+    pairs; state churn (reachable -> stale -> delay ...) of an unchanged
+    entry is folded away so only appearances, MAC changes and removals surface
+    """
+
+    def __init__(self, interface: Optional[str] = None, family: int = socket.AF_INET):
+        self.interface = interface
+        self.family = family
+        self.nl = NetlinkSocket(groups=RTMGRP_NEIGH)
+        self.nl.sock.setblocking(False)
+        self.names = _interface_names()
+        self.known: Dict[Tuple[str, str], Neighbor] = {
+            (entry.interface, entry.ip): entry for entry in get_neighbors(interface, family)
+        }
+
+    def __enter__(self) -> 'NeighborWatcher':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.nl.close()
+
+    def fileno(self) -> int:
+        return self.nl.fileno()
+
+    def handle(self, msg_type: int, body) -> Optional[Tuple[str, Neighbor]]:
+        """Fold one notification into the table; returns the event it caused, if any"""
+        if msg_type not in (RTM_NEWNEIGH, RTM_DELNEIGH):
+            return None
+        entry, usable = parse_neighbor(body, self.names)
+        if entry is not None and entry.interface.isdigit():
+            self.names = _interface_names(refresh=True)  # link appeared since startup
+            entry, usable = parse_neighbor(body, self.names)
+        if entry is None or (self.interface and entry.interface != self.interface):
+            return None
+        if self.family == socket.AF_INET and ':' in entry.ip:
+            return None
+
+        key = (entry.interface, entry.ip)
+        previous = self.known.get(key)
+        if msg_type == RTM_NEWNEIGH and usable:
+            self.known[key] = entry
+            if previous is None or previous.mac != entry.mac:
+                return ADDED, entry
+            return None
+        if previous is not None and (msg_type == RTM_DELNEIGH or entry.state == 'failed'):
+            del self.known[key]
+            return REMOVED, previous
+        return None
+
+    def _resync(self) -> List[Tuple[str, Neighbor]]:
+        """Rebuild from a dump after the socket overflowed (ENOBUFS)"""
+        current = {(e.interface, e.ip): e for e in get_neighbors(self.interface, self.family)}
+        events = [(REMOVED, entry) for key, entry in self.known.items() if key not in current]
+        events += [(ADDED, entry) for key, entry in current.items()
+                   if key not in self.known or self.known[key].mac != entry.mac]
+        self.known = current
+        return events
+
+    def poll(self, timeout: float = 0.0) -> List[Tuple[str, Neighbor]]:
+        """Events queued since the last call, waiting up to `timeout` for the first"""
+        events = []
+        if timeout and not select.select([self.nl.sock], [], [], timeout)[0]:
+            return events
+        while True:
+            try:
+                for msg_type, _, _, body in self.nl.receive():
+                    event = self.handle(msg_type, body)
+                    if event:
+                        events.append(event)
+            except BlockingIOError:
+                return events
+            except OSError as e:
+                if e.errno != errno.ENOBUFS:
+                    raise
+                events.extend(self._resync())
+
+    def devices(self, registry=None) -> List[Dict]:
+        """Current table in device schema"""
+        return [entry.to_device(registry) for entry in self.known.values()]
+
+
+# Export
+__all__ = [
+    'Neighbor', 'NeighborWatcher', 'get_neighbors', 'get_devices', 'parse_neighbor',
+    'state_name', 'ADDED', 'REMOVED',
+]
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+ZSPOOF Netlink Backend - rtnetlink link control
+Applies MAC changes over an AF_NETLINK socket instead of spawning ip(8)
+"""
+
+import errno
+import os
+import socket
+import struct
+import time
+from dataclasses import dataclass, field
+from itertools import count
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from metrics import counter, timed
+
+NETLINK_ROUTE = 0
+
+# Message types
+NLMSG_ERROR = 2
+NLMSG_DONE = 3
+RTM_NEWLINK = 16
+RTM_DELLINK = 17
+RTM_GETLINK = 18
+RTM_NEWADDR = 20
+RTM_DELADDR = 21
+RTM_GETADDR = 22
+RTM_NEWNEIGH = 28
+RTM_DELNEIGH = 29
+RTM_GETNEIGH = 30
+
+# Message flags
+NLM_F_REQUEST = 0x001
+NLM_F_MULTI = 0x002
+NLM_F_ACK = 0x004
+NLM_F_EXCL = 0x200
+NLM_F_CREATE = 0x400
+NLM_F_DUMP = 0x300
+
+# Link attributes
+IFLA_ADDRESS = 1
+IFLA_IFNAME = 3
+IFLA_OPERSTATE = 16
+IFLA_LINKINFO = 18
+IFLA_PERM_ADDRESS = 54
+IFLA_INFO_KIND = 1
+
+# Address attributes
+IFA_ADDRESS = 1
+IFA_LOCAL = 2
+
+# Neighbour attributes
+NDA_DST = 1
+NDA_LLADDR = 2
+
+# Multicast groups (bind() bitmask)
+RTMGRP_LINK = 0x1
+RTMGRP_NEIGH = 0x4
+RTMGRP_IPV4_IFADDR = 0x10
+RTMGRP_IPV6_IFADDR = 0x100
+
+IFF_UP = 0x1
+
+_NLA_TYPE_MASK = 0x3FFF
+
+_NLMSGHDR = struct.Struct('=IHHII')    # len, type, flags, seq, pid
+_IFINFOMSG = struct.Struct('=BxHiII')  # family, type, index, flags, change
+_RTATTR = struct.Struct('=HH')         # len, type
+_ERRNO = struct.Struct('=i')
+
+RECV_BUFFER = 1 << 18
+
+# Seconds to wait for each ack or dump datagram before giving up
+REQUEST_TIMEOUT = float(os.environ.get('ZSPOOF_NETLINK_TIMEOUT', 5))
+
+
+def _align4(size: int) -> int:
+    return (size + 3) & ~3
+
+
+def pack_attr(kind: int, data: bytes) -> bytes:
+    """Pack a single rtattr"""
+    length = _RTATTR.size + len(data)
+    return _RTATTR.pack(length, kind) + data + b'\0' * (_align4(length) - length)
+
+
+def parse_attrs(data, offset: int = 0) -> Dict[int, bytes]:
+    """Parse a run of rtattrs into {type: payload}"""
+    attrs = {}
+    end = len(data)
+    while offset + _RTATTR.size <= end:
+        length, kind = _RTATTR.unpack_from(data, offset)
+        if length < _RTATTR.size:
+            break
+        attrs[kind & _NLA_TYPE_MASK] = bytes(data[offset + _RTATTR.size:offset + length])
+        offset += _align4(length)
+    return attrs
+
+
+def link_payload(index: int, flags: int = 0, change: int = 0, attrs: bytes = b'') -> bytes:
+    """ifinfomsg body for RTM_*LINK requests"""
+    return _IFINFOMSG.pack(socket.AF_UNSPEC, 0, index, flags, change) + attrs
+
+
+def unpack_link(body) -> Tuple[int, int, Dict[int, bytes]]:
+    """Split an RTM_NEWLINK body into (index, flags, attrs)"""
+    _, _, index, flags, _ = _IFINFOMSG.unpack_from(body, 0)
+    return index, flags, parse_attrs(body, _IFINFOMSG.size)
+
+
+def parse_mac(mac: str) -> bytes:
+    """Parse XX:XX:XX:XX:XX:XX (or dashed) into 6 raw bytes"""
+    try:
+        raw = bytes.fromhex(mac.replace(':', '').replace('-', ''))
+    except ValueError:
+        raw = b''
+    if len(raw) != 6:
+        raise ValueError(f"Invalid MAC address: {mac!r}")
+    return raw
+
+
+class NetlinkError(OSError):
+    """Kernel rejected a netlink request"""
+
+    def __init__(self, code: int, step: str = ''):
+        super().__init__(code, os.strerror(code))
+        self.step = step
+
+    def __str__(self) -> str:
+        prefix = f"{self.step}: " if self.step else ''
+        return f"{prefix}[Errno {self.errno}] {self.strerror}"
+
+
+class NetlinkTimeout(NetlinkError):
+    """Kernel sent no ack or dump data within the socket timeout"""
+
+    def __init__(self, timeout: float, step: str = ''):
+        super().__init__(errno.ETIMEDOUT, step)
+        self.timeout = timeout
+
+    def __str__(self) -> str:
+        prefix = f"{self.step}: " if self.step else ''
+        return f"{prefix}no reply from the kernel within {self.timeout:g} s"
+
+
+class NetlinkSocket:
+    """Thin NETLINK_ROUTE socket with request/ack and dump helpers
+
+    Blocking reads give up after `timeout` seconds (ZSPOOF_NETLINK_TIMEOUT,
+    default 5) with NetlinkTimeout, so a missing ack never hangs a caller
+    """
+
+    def __init__(self, groups: int = 0, timeout: Optional[float] = REQUEST_TIMEOUT):
+        self.sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_ROUTE)
+        self.sock.settimeout(timeout)
+        self.sock.bind((0, groups))
+        self._seq = count(int(time.time()) & 0xFFFFFF)
+
+    def __enter__(self) -> 'NetlinkSocket':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.sock.close()
+
+    def fileno(self) -> int:
+        return self.sock.fileno()
+
+    def message(self, msg_type: int, payload: bytes, flags: int = NLM_F_ACK) -> Tuple[int, bytes]:
+        """Build one request; returns (seq, bytes)"""
+        seq = next(self._seq)
+        header = _NLMSGHDR.pack(_NLMSGHDR.size + len(payload), msg_type,
+                                NLM_F_REQUEST | flags, seq, 0)
+        return seq, header + payload
+
+    def receive(self) -> Iterator[Tuple[int, int, int, memoryview]]:
+        """Yield (type, flags, seq, payload) for one datagram"""
+        try:
+            data = memoryview(self.sock.recv(RECV_BUFFER))
+        except socket.timeout:
+            raise NetlinkTimeout(self.sock.gettimeout()) from None
+        offset = 0
+        while offset + _NLMSGHDR.size <= len(data):
+            length, msg_type, flags, seq, _ = _NLMSGHDR.unpack_from(data, offset)
+            if length < _NLMSGHDR.size:
+                break
+            yield msg_type, flags, seq, data[offset + _NLMSGHDR.size:offset + length]
+            offset += _align4(length)
+
+    def transact(self, requests: List[Tuple[int, bytes]], flags: int = NLM_F_ACK) -> List[int]:
+        """Send requests in one write and return their errno codes (0 = ok)"""
+        seqs = []
+        chunks = []
+        for msg_type, payload in requests:
+            seq, chunk = self.message(msg_type, payload, flags)
+            seqs.append(seq)
+            chunks.append(chunk)
+        self.sock.send(b''.join(chunks))
+
+        results: Dict[int, int] = {}
+        while len(results) < len(seqs):
+            for msg_type, _, seq, payload in self.receive():
+                if msg_type == NLMSG_ERROR and seq in seqs:
+                    results[seq] = -_ERRNO.unpack_from(payload, 0)[0]
+        return [results[seq] for seq in seqs]
+
+    def request(self, msg_type: int, payload: bytes, step: str = '',
+                flags: int = NLM_F_ACK) -> None:
+        """Send one request and raise NetlinkError on a negative ack"""
+        code = self.transact([(msg_type, payload)], flags)[0]
+        if code:
+            raise NetlinkError(code, step)
+
+    def dump(self, msg_type: int, payload: bytes) -> Iterator[Tuple[int, memoryview]]:
+        """Yield (type, payload) for every message of a dump request"""
+        seq, chunk = self.message(msg_type, payload, NLM_F_DUMP)
+        self.sock.send(chunk)
+        while True:
+            for reply_type, _, reply_seq, body in self.receive():
+                if reply_seq != seq:
+                    continue
+                if reply_type == NLMSG_DONE:
+                    return
+                if reply_type == NLMSG_ERROR:
+                    code = -_ERRNO.unpack_from(body, 0)[0]
+                    if code:
+                        raise NetlinkError(code, 'dump')
+                    return
+                yield reply_type, body
+
+
+@dataclass
+class LinkChangeResult:
+    """Outcome of a MAC change with timings (ms)
+
+    timings has 'down'/'address'/'up' and 'total' for an unbatched change;
+    a batched one only has 'batch' and 'total', because the kernel handles
+    the whole write before the first ack can be read. address_changed is
+    set once the kernel acknowledged the address step, even if bringing
+    the link back up then failed
+    """
+    interface: str
+    mac: str
+    success: bool
+    errno: int = 0
+    error: Optional[str] = None
+    address_changed: bool = False
+    timings: Dict[str, float] = field(default_factory=dict)
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 3)
+
+
+def _failed(result: LinkChangeResult) -> LinkChangeResult:
+    counter('zspoof_link_change_failures_total', 'MAC changes rejected, by errno',
+            errno=errno.errorcode.get(result.errno, str(result.errno))).inc()
+    return result
+
+
+@timed('zspoof_link_change_seconds', 'rtnetlink down/address/up latency')
+def set_link_address(interface: str, mac: str, batch: bool = True,
+                     up: bool = True) -> LinkChangeResult:
+    """Bring a link down, set its MAC and bring it back up over rtnetlink
+
+    With batch=True all three RTM_NEWLINK requests go out in a single write
+    and the kernel applies them back to back; with batch=False each step
+    is its own round trip so the timings break down per step. up=False
+    leaves the link down afterwards (restoring an administratively down link).
+    """
+    start = time.perf_counter()
+    result = LinkChangeResult(interface=interface, mac=mac, success=False)
+    try:
+        address = parse_mac(mac)
+        index = socket.if_nametoindex(interface)
+    except ValueError as e:
+        result.errno, result.error = errno.EINVAL, str(e)
+        return _failed(result)
+    except OSError as e:
+        result.errno, result.error = errno.ENODEV, f"{interface}: {e.strerror or e}"
+        return _failed(result)
+
+    steps = [
+        ('down', link_payload(index, 0, IFF_UP)),
+        ('address', link_payload(index, attrs=pack_attr(IFLA_ADDRESS, address))),
+    ]
+    if up:
+        steps.append(('up', link_payload(index, IFF_UP, IFF_UP)))
+
+    codes: List[int] = []
+    step = 'batch'
+    try:
+        with NetlinkSocket() as nl:
+            if batch:
+                codes = nl.transact([(RTM_NEWLINK, payload) for _, payload in steps])
+                result.timings['batch'] = _elapsed_ms(start)
+            else:
+                codes = []
+                for step, payload in steps:
+                    step_start = time.perf_counter()
+                    codes.append(nl.transact([(RTM_NEWLINK, payload)])[0])
+                    result.timings[step] = _elapsed_ms(step_start)
+    except OSError as e:
+        if isinstance(e, NetlinkTimeout):
+            e.step = step
+        result.errno, result.error = e.errno or errno.EIO, str(e)
+        result.address_changed = len(codes) > 1 and codes[1] == 0
+        result.timings['total'] = _elapsed_ms(start)
+        return _failed(result)
+
+    result.address_changed = codes[1] == 0
+    for (name, _), code in zip(steps, codes):
+        if code:
+            failure = NetlinkError(code, name)
+            result.errno, result.error = failure.errno, str(failure)
+            break
+    else:
+        result.success = True
+
+    result.timings['total'] = _elapsed_ms(start)
+    return result if result.success else _failed(result)
+
+
+def create_link(name: str, kind: str = 'dummy') -> None:
+    """Create a virtual link (dummy/veth-style kinds without peers)"""
+    attrs = pack_attr(IFLA_IFNAME, name.encode() + b'\0')
+    attrs += pack_attr(IFLA_LINKINFO, pack_attr(IFLA_INFO_KIND, kind.encode()))
+    with NetlinkSocket() as nl:
+        nl.request(RTM_NEWLINK, link_payload(0, attrs=attrs), 'create',
+                   NLM_F_ACK | NLM_F_CREATE | NLM_F_EXCL)
+
+
+def delete_link(name: str) -> None:
+    """Delete a link by name"""
+    with NetlinkSocket() as nl:
+        nl.request(RTM_DELLINK, link_payload(socket.if_nametoindex(name)), 'delete')
+
+
+# Export
+__all__ = [
+    'NetlinkSocket', 'NetlinkError', 'NetlinkTimeout', 'LinkChangeResult', 'set_link_address',
+    'create_link', 'delete_link', 'parse_attrs', 'pack_attr', 'link_payload', 'unpack_link',
+    'parse_mac',
+]
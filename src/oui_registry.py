@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+"""
+ZSPOOF OUI Registry - Compiled vendor prefix index
+Compiles the IEEE MA-L/MA-M/MA-S registry into a sorted binary file and
+serves longest-prefix vendor lookups straight from a memory map
+"""
+
+import argparse
+import csv
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+MAGIC = b'ZOUI'
+FORMAT_VERSION = 1
+
+# magic, version, byte order (1 = little), MA-L/MA-M/MA-S counts, vendor count, string table size
+_HEADER = struct.Struct('<4sHHIIIII')
+_HEADER_SIZE = 32
+
+# Registry block sizes in bits, longest prefix first
+PREFIX_BITS = (36, 28, 24)
+
+DEFAULT_DB_PATH = Path(__file__).parent.parent / 'data' / 'oui.bin'
+
+# Curated vendor prefixes shipped with the engine (mirrors vendor_db in core_engine.cpp)
+BUILTIN_VENDOR_OUIS: Dict[str, Tuple[str, ...]] = {
+    'dell': (
+        '00:14:22', '00:11:43', 'F0:4D:A2', '90:B1:1C', 'D4:AE:52',
+        '18:03:73', 'B8:CA:3A', '34:17:EB', 'B0:83:FE', '50:9A:4C',
+    ),
+    'lenovo': (
+        '00:59:07', '80:96:B1', 'E0:2C:B2', '4C:80:93', '54:E0:19',
+        '68:F7:28', 'C8:1F:66', '00:21:CC', 'B0:7B:25', '8C:16:45',
+    ),
+    'hp': (
+        '00:1F:29', '38:EA:A7', 'A4:5D:36', '14:58:D0', '3C:52:82',
+        '9C:B6:54', '2C:76:8A', '00:25:B3', '6C:C2:17', 'FC:15:B4',
+    ),
+    'cisco': (
+        '00:40:96', '00:00:0C', 'E8:BA:70', 'F8:66:F2', '00:1D:A1',
+        '74:A0:2F', '00:07:7D', 'A0:F8:49', '88:43:E1', 'F0:25:72',
+    ),
+    'apple': (
+        'F0:18:98', '00:1C:B3', '28:E1:4C', 'A4:5E:60', 'BC:52:B7',
+        'F0:DB:E2', '3C:06:30', '70:56:81', '88:66:5A', 'D0:23:DB',
+    ),
+    'samsung': (
+        '34:14:5F', '00:12:47', 'E8:50:8B', '40:4E:36', 'D0:59:E4',
+        'AC:36:13', '78:1F:DB', 'C8:98:25', '00:1D:25', '38:AA:3C',
+    ),
+    'xiaomi': (
+        '34:CE:00', '64:09:80', '50:8F:4C', '74:51:BA', '04:CF:4B',
+        '28:6C:07', 'F8:A4:5F', 'AC:C1:EE', '78:02:F8', '34:80:B3',
+    ),
+    'google': (
+        'F4:F5:D8', '3C:5A:B4', '84:73:03', 'B4:F0:AB', '6C:AD:F8',
+        'AC:37:43', '00:1A:11', 'F8:8F:CA', '7C:2F:80', '54:60:09',
+    ),
+    'espressif': (
+        '24:0A:C4', '30:AE:A4', 'A4:CF:12', '48:3F:DA', '84:CC:A8',
+        'C8:2B:96', 'DC:4F:22', '24:62:AB', '3C:71:BF', 'EC:FA:BC',
+    ),
+    'amazon': (
+        '74:C2:46', 'F0:D2:F1', 'CC:50:E3', '6C:56:97', '38:F7:3D',
+        '4C:EF:C0', 'B4:7C:9C', '00:FC:8B', '84:D6:D0', '50:DC:E7',
+    ),
+    'tuya': (
+        '10:5A:17', '68:57:2D', '7C:87:CE', 'D4:A6:51', '84:E3:42',
+        '1C:90:FF', '50:02:91', 'A4:DA:22', '24:A1:60', 'CC:7B:5C',
+    ),
+    'sony': (
+        '00:D9:D1', '00:04:1F', '7C:BB:8A', 'FC:0F:E6', '00:1F:A7',
+        '98:E8:FA', 'B8:8D:12', '30:05:5C', '00:19:C5', '00:24:8D',
+    ),
+    'nintendo': (
+        '98:B6:E9', '00:09:BF', 'A4:5C:27', '78:A2:A0', '58:BD:A3',
+        '00:19:1D', '00:17:AB', '00:1F:32', '00:1B:EA', '00:1E:35',
+    ),
+    'microsoft': (
+        '00:50:F2', '7C:ED:8D', '98:5F:D3', '28:18:78', 'D8:9E:F3',
+        '00:0D:3A', 'E0:0F:EC', '1C:3B:F3', 'B0:C0:90', '68:17:29',
+    ),
+    'intel': (
+        '00:13:20', '00:27:10', '00:1B:21', 'AC:DE:48', '00:15:00',
+        '00:1F:3C', 'E0:DB:55', '94:DE:80', 'A0:36:9F', 'B8:6B:23',
+    ),
+    'realtek': (
+        '00:E0:4C', '52:54:00', '00:0E:2E', '70:4D:7B', '18:DB:F2',
+        '98:FC:84', '30:5A:3A', '08:62:66', 'C8:5B:76', '94:E9:79',
+    ),
+}
+
+# Known vendors keep the engine's short keys; matched on whole leading words
+_VENDOR_ALIASES = {
+    **{vendor: vendor for vendor in BUILTIN_VENDOR_OUIS},
+    'hewlett packard': 'hp',
+    'hon hai': 'foxconn',
+    'lcfc': 'lenovo',
+    'motorola mobility': 'lenovo',
+    'beijing xiaomi': 'xiaomi',
+    'hangzhou tuya': 'tuya',
+}
+
+# Trailing legal forms dropped before keying ("Dell Inc." and "Dell" match)
+_LEGAL_SUFFIXES = frozenset({
+    'inc', 'incorporated', 'co', 'corp', 'corporation', 'company', 'ltd', 'limited',
+    'llc', 'plc', 'lp', 'llp', 'gmbh', 'ag', 'kg', 'sa', 'sas', 'sarl', 'srl', 'spa',
+    'bv', 'nv', 'oy', 'ab', 'as', 'pty', 'pte', 'kk',
+})
+
+_TOKEN = re.compile(r'[^\W_]+')
+
+
+def vendor_key(organization: str) -> str:
+    """Normalise an IEEE organisation name into a vendor key
+
+    Known vendors map to the engine's short keys; any other organisation is
+    keyed on its full name minus legal suffixes, so companies that only
+    share a first word ("Shenzhen ...", "Texas ...") stay distinct
+    """
+    words = _TOKEN.findall(organization.lower())
+    while len(words) > 1 and words[-1] in _LEGAL_SUFFIXES:
+        words.pop()
+    for size in range(len(words), 0, -1):
+        key = _VENDOR_ALIASES.get(' '.join(words[:size]))
+        if key is not None:
+            return key
+    return ' '.join(words) or 'unknown'
+
+
+def mac_to_int(mac: str) -> int:
+    """Parse a MAC address (or bare OUI) into a 48-bit integer"""
+    digits = mac.replace(':', '').replace('-', '').replace('.', '')
+    if len(digits) == 6:
+        return int(digits, 16) << 24
+    if len(digits) != 12:
+        raise ValueError(f"Invalid MAC address: {mac!r}")
+    return int(digits, 16)
+
+
+def format_oui(prefix: int) -> str:
+    """Format a 24-bit prefix as AA:BB:CC"""
+    return f"{prefix >> 16:02X}:{(prefix >> 8) & 0xFF:02X}:{prefix & 0xFF:02X}"
+
+
+def _align(size: int) -> int:
+    return (size + 7) & ~7
+
+
+def read_ieee_csv(path: str) -> Iterator[Tuple[int, int, str]]:
+    """Yield (prefix, bits, vendor) from an IEEE registry CSV export"""
+    with open(path, newline='', encoding='utf-8', errors='replace') as f:
+        for row in csv.DictReader(f):
+            assignment = (row.get('Assignment') or '').strip()
+            bits = len(assignment) * 4
+            if bits not in PREFIX_BITS:
+                continue
+            try:
+                prefix = int(assignment, 16)
+            except ValueError:
+                continue
+            yield prefix, bits, vendor_key(row.get('Organization Name') or '')
+
+
+def _builtin_entries() -> Iterator[Tuple[int, int, str]]:
+    for vendor, ouis in BUILTIN_VENDOR_OUIS.items():
+        for oui in ouis:
+            yield mac_to_int(oui) >> 24, 24, vendor
+
+
+def compile_entries(entries: Iterable[Tuple[int, int, str]]) -> bytes:
+    """Compile (prefix, bits, vendor) entries into the binary index format"""
+    tables: Dict[int, Dict[int, str]] = {bits: {} for bits in PREFIX_BITS}
+    for prefix, bits, vendor in entries:
+        tables[bits].setdefault(prefix, vendor)
+
+    # Vendor indices follow sorted key order so reverse lookups can bisect
+    vendors = sorted({v for table in tables.values() for v in table.values()})
+    vendor_index = {v: i for i, v in enumerate(vendors)}
+
+    encoded = [v.encode('utf-8') for v in vendors]
+    offsets = array('I', [0])
+    for name in encoded:
+        offsets.append(offsets[-1] + len(name))
+    strtab = b''.join(encoded)
+
+    sections: List[bytes] = []
+    for bits in PREFIX_BITS:
+        keys = sorted(tables[bits])
+        sections.append(array('Q', keys).tobytes())
+        sections.append(array('I', (vendor_index[tables[bits][k]] for k in keys)).tobytes())
+
+    # Reverse table: MA-L prefixes grouped by vendor
+    by_vendor = sorted((vendor_index[v], p) for p, v in tables[24].items())
+    starts = array('I', [0] * (len(vendors) + 1))
+    for idx, _ in by_vendor:
+        starts[idx + 1] += 1
+    for i in range(len(vendors)):
+        starts[i + 1] += starts[i]
+    sections.append(offsets.tobytes())
+    sections.append(starts.tobytes())
+    sections.append(array('I', (p for _, p in by_vendor)).tobytes())
+    sections.append(strtab)
+
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, 1 if sys.byteorder == 'little' else 2,
+        len(tables[24]), len(tables[28]), len(tables[36]), len(vendors), len(strtab)
+    )
+    out = bytearray(header.ljust(_HEADER_SIZE, b'\0'))
+    for section in sections:
+        out += section
+        out += b'\0' * (_align(len(out)) - len(out))
+    return bytes(out)
+
+
+def compile_registry(csv_paths: Sequence[str], output_path: str) -> Dict[str, int]:
+    """Compile IEEE CSV exports into a registry file; returns table sizes"""
+    def entries():
+        for path in csv_paths:
+            yield from read_ieee_csv(path)
+
+    data = compile_entries(entries())
+    output = Path(output_path)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp = output.with_suffix(output.suffix + '.tmp')
+    tmp.write_bytes(data)
+    os.replace(tmp, output)
+
+    registry = OUIRegistry(data, source=str(output))
+    return {
+        'ma_l': registry.counts[24],
+        'ma_m': registry.counts[28],
+        'ma_s': registry.counts[36],
+        'vendors': registry.vendor_count,
+        'bytes': len(data),
+    }
+
+
+class OUIRegistry:
+    """Longest-prefix vendor index over a compiled registry buffer"""
+
+    def __init__(self, buffer, source: str = 'builtin'):
+        self.source = source
+        self._buffer = buffer
+        view = memoryview(buffer)
+
+        if len(view) < _HEADER_SIZE:
+            raise ValueError(f"{source}: truncated OUI registry")
+        magic, version, order, n_mal, n_mam, n_mas, n_vendors, strtab_size = \
+            _HEADER.unpack_from(view, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{source}: not a ZSPOOF OUI registry (v{FORMAT_VERSION})")
+        if order != (1 if sys.byteorder == 'little' else 2):
+            raise ValueError(f"{source}: compiled for a different byte order, recompile it")
+
+        self.counts = {24: n_mal, 28: n_mam, 36: n_mas}
+        self.vendor_count = n_vendors
+        pos = _HEADER_SIZE
+
+        def take(fmt: str, count: int):
+            nonlocal pos
+            size = count * struct.calcsize(fmt)
+            section = view[pos:pos + size].cast(fmt)
+            pos = _align(pos + size)
+            return section
+
+        tables = {}
+        for bits in PREFIX_BITS:
+            keys = take('Q', self.counts[bits])
+            tables[bits] = (48 - bits, keys, take('I', self.counts[bits]))
+        # Longest prefix wins: MA-S, then MA-M, then MA-L
+        self._tables = [tables[bits] for bits in PREFIX_BITS if self.counts[bits]]
+        self._offsets = take('I', n_vendors + 1)
+        self._reverse_starts = take('I', n_vendors + 1)
+        self._reverse = take('I', n_mal)
+        self._strtab = view[pos:pos + strtab_size]
+        self._names: Dict[int, str] = {}
+        self._subdivided: Optional[FrozenSet[int]] = None
+        self._registered: Optional[FrozenSet[int]] = None
+
+    @classmethod
+    def open(cls, path) -> 'OUIRegistry':
+        """Memory-map a compiled registry file"""
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapped, source=str(path))
+
+    @classmethod
+    def builtin(cls) -> 'OUIRegistry':
+        """Registry built from the curated engine vendor table"""
+        return cls(compile_entries(_builtin_entries()), source='builtin')
+
+    def __len__(self) -> int:
+        return sum(self.counts.values())
+
+    def _vendor_name(self, index: int) -> str:
+        name = self._names.get(index)
+        if name is None:
+            start, end = self._offsets[index], self._offsets[index + 1]
+            name = self._names[index] = bytes(self._strtab[start:end]).decode('utf-8')
+        return name
+
+    def lookup_int(self, value: int) -> Optional[str]:
+        """Vendor for a 48-bit MAC integer, or None"""
+        for shift, keys, vendors in self._tables:
+            prefix = value >> shift
+            i = bisect_left(keys, prefix)
+            if i < len(keys) and keys[i] == prefix:
+                return self._vendor_name(vendors[i])
+        return None
+
+    def subdivided_ouis(self) -> FrozenSet[int]:
+        """24-bit OUIs split into MA-M/MA-S blocks (need a full-address lookup)"""
+        if self._subdivided is None:
+            self._subdivided = frozenset(
+                key >> (24 - shift)
+                for shift, keys, _ in self._tables if shift < 24
+                for key in keys
+            )
+        return self._subdivided
+
+    def registered_ouis(self) -> FrozenSet[int]:
+        """24-bit OUIs with an MA-L assignment (membership test for bulk matching)"""
+        if self._registered is None:
+            self._registered = frozenset(
+                key for shift, keys, _ in self._tables if shift == 24 for key in keys
+            )
+        return self._registered
+
+    def lookup(self, mac: str) -> Optional[str]:
+        """Vendor for a MAC address string, or None"""
+        try:
+            return self.lookup_int(mac_to_int(mac))
+        except ValueError:
+            return None
+
+    def _vendor_index(self, vendor: str) -> Optional[int]:
+        lo, hi = 0, self.vendor_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._vendor_name(mid) < vendor:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.vendor_count and self._vendor_name(lo) == vendor:
+            return lo
+        return None
+
+    def prefixes_for(self, vendor: str) -> Sequence[int]:
+        """24-bit MA-L prefixes registered to a vendor (zero-copy view)"""
+        index = self._vendor_index(vendor.lower())
+        if index is None:
+            return ()
+        return self._reverse[self._reverse_starts[index]:self._reverse_starts[index + 1]]
+
+    def vendors(self) -> List[str]:
+        """All vendor keys in the registry"""
+        return [self._vendor_name(i) for i in range(self.vendor_count)]
+
+
+_registry: Optional[OUIRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> OUIRegistry:
+    """Process-wide registry: ZSPOOF_OUI_DB, data/oui.bin, or the built-in table"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                path = Path(os.environ.get('ZSPOOF_OUI_DB', DEFAULT_DB_PATH))
+                _registry = OUIRegistry.open(path) if path.exists() else OUIRegistry.builtin()
+    return _registry
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="ZSPOOF OUI registry compiler")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    compile_cmd = sub.add_parser('compile', help='Compile IEEE CSV exports (oui.csv, mam.csv, oui36.csv)')
+    compile_cmd.add_argument('csv', nargs='+')
+    compile_cmd.add_argument('-o', '--output', default=str(DEFAULT_DB_PATH))
+
+    lookup_cmd = sub.add_parser('lookup', help='Look up vendors for MAC addresses')
+    lookup_cmd.add_argument('mac', nargs='+')
+
+    vendor_cmd = sub.add_parser('vendor', help='List MA-L prefixes for a vendor')
+    vendor_cmd.add_argument('name')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'compile':
+        stats = compile_registry(args.csv, args.output)
+        print(f"[+] {args.output}: {stats['ma_l']} MA-L, {stats['ma_m']} MA-M, "
+              f"{stats['ma_s']} MA-S, {stats['vendors']} vendors ({stats['bytes']} bytes)")
+    elif args.command == 'lookup':
+        registry = get_registry()
+        for mac in args.mac:
+            print(f"{mac}  {registry.lookup(mac) or 'unknown'}")
+    else:
+        for prefix in get_registry().prefixes_for(args.name):
+            print(format_oui(prefix))
+    return 0
+
+
+# Export
+__all__ = [
+    'OUIRegistry', 'get_registry', 'compile_registry', 'compile_entries',
+    'read_ieee_csv', 'vendor_key', 'mac_to_int', 'format_oui', 'BUILTIN_VENDOR_OUIS',
+]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+ZSPOOF Capture Reader - Offline fingerprints from pcap/pcapng files
+Memory-maps the capture and walks record headers with struct, slicing only
+the 6 source-MAC bytes of each frame; large files can be split by byte
+offset across processes, each shard resynchronising on a record boundary
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from mac_array import MacArray
+
+CAPTURE_SUFFIXES = {'.pcap', '.pcapng', '.cap', '.dmp'}  # mirrored in scan_sources
+
+# pcap magics as read little-endian
+PCAP_MAGIC = {
+    0xA1B2C3D4: ('<', False), 0xD4C3B2A1: ('>', False),  # microsecond timestamps
+    0xA1B23C4D: ('<', True), 0x4D3CB2A1: ('>', True),    # nanosecond timestamps
+}
+PCAPNG_SHB = 0x0A0D0D0A
+PCAPNG_BYTE_ORDER = 0x1A2B3C4D
+
+# pcapng block types
+BLOCK_IDB = 1
+BLOCK_PB = 2    # obsolete packet block
+BLOCK_SPB = 3
+BLOCK_EPB = 6
+KNOWN_BLOCKS = {PCAPNG_SHB, BLOCK_IDB, BLOCK_PB, BLOCK_SPB, 4, 5, BLOCK_EPB,
+                7, 8, 9, 10, 0x00000BAD, 0x40000BAD}
+
+# Link types and where their source MAC sits
+LINKTYPE_ETHERNET = 1
+LINKTYPE_IEEE802_11 = 105
+LINKTYPE_RADIOTAP = 127
+LINKTYPE_LINUX_SLL = 113
+LINKTYPE_LINUX_SLL2 = 276
+FIXED_SOURCE = {LINKTYPE_ETHERNET: 6, LINKTYPE_LINUX_SLL2: 12}
+
+OPT_IF_TSRESOL = 9
+
+MIN_SHARD = 64 << 20
+RESYNC_CHAIN = 4
+MAX_RECORD = 1 << 24
+
+Seen = Dict[bytes, List[int]]  # source MAC -> [first_seen, last_seen] (epoch seconds)
+
+
+@dataclass
+class CaptureInfo:
+    """What a shard needs to know about the file before its byte range"""
+    kind: str                      # 'pcap' or 'pcapng'
+    endian: str
+    data_start: int                # first packet record
+    linktype: int = 0              # pcap
+    snaplen: int = 0               # pcap
+    nanoseconds: bool = False      # pcap
+    first_ts: int = 0              # pcap: first record's seconds, anchors shard resync
+    interfaces: List[Tuple[int, int]] = field(default_factory=list)  # pcapng: (linktype, units/s)
+
+
+@dataclass
+class CaptureSummary:
+    """Unique source MACs of a capture with first/last-seen times"""
+    path: str
+    seen: Dict[str, Tuple[int, int]]
+    packets: int = 0
+    skipped: int = 0               # frames of unsupported link types or too short
+    bytes: int = 0
+    elapsed_s: float = 0.0
+
+    @property
+    def mb_per_s(self) -> float:
+        return self.bytes / self.elapsed_s / 1e6 if self.elapsed_s else 0.0
+
+    def devices(self) -> Iterator[Dict]:
+        """Device dicts for MLMACEngine.analyze_network_environment"""
+        for mac, (first, last) in sorted(self.seen.items()):
+            yield {'mac': mac, 'first_seen': first, 'last_seen': last}
+
+    def mac_array(self) -> MacArray:
+        return MacArray.from_strings(self.seen)
+
+    def to_dict(self) -> Dict:
+        return {
+            'path': self.path,
+            'unique_macs': len(self.seen),
+            'packets': self.packets,
+            'skipped': self.skipped,
+            'bytes': self.bytes,
+            'elapsed_s': self.elapsed_s,
+            'mb_per_s': self.mb_per_s,
+        }
+
+
+def _source(linktype: int, buf, start: int, caplen: int) -> Optional[bytes]:
+    """Source MAC of one frame for link types without a fixed offset"""
+    if linktype == LINKTYPE_LINUX_SLL:
+        if caplen >= 14 and buf[start + 4:start + 6] == b'\x00\x06':
+            return buf[start + 6:start + 12]
+        return None
+    if linktype == LINKTYPE_RADIOTAP:
+        if caplen < 4:
+            return None
+        skip = buf[start + 2] | buf[start + 3] << 8
+        start, caplen = start + skip, caplen - skip
+        linktype = LINKTYPE_IEEE802_11
+    if linktype == LINKTYPE_IEEE802_11:
+        # addr2 (transmitter) of management and data frames; control frames may lack it
+        if caplen >= 16 and buf[start] & 0x0C != 0x04:
+            return buf[start + 10:start + 16]
+    return None
+
+
+# pcap -------------------------------------------------------------------
+
+def _pcap_info(buf) -> Optional[CaptureInfo]:
+    if len(buf) < 24:
+        return None
+    magic = struct.unpack_from('<I', buf, 0)[0]
+    if magic not in PCAP_MAGIC:
+        return None
+    endian, nanoseconds = PCAP_MAGIC[magic]
+    snaplen, linktype = struct.unpack_from(endian + 'II', buf, 16)
+    first_ts = struct.unpack_from(endian + 'I', buf, 24)[0] if len(buf) >= 28 else 0
+    return CaptureInfo('pcap', endian, 24, linktype & 0x0FFFFFFF, snaplen, nanoseconds, first_ts=first_ts)
+
+
+def _pcap_header_ok(info: CaptureInfo, header: struct.Struct, buf, offset: int) -> bool:
+    """A chain of plausible record headers starts at offset
+
+    Timestamps must stay near the capture's first record, which rules out the
+    all-zero "headers" found inside padding
+    """
+    previous = None
+    limit = 1_000_000_000 if info.nanoseconds else 1_000_000
+    for _ in range(RESYNC_CHAIN):
+        if offset + header.size > len(buf):
+            return previous is not None  # ran into the end of the file on a clean boundary
+        ts, frac, caplen, origlen = header.unpack_from(buf, offset)
+        if (frac >= limit or not 0 < caplen <= origlen or caplen > max(info.snaplen, 65535)
+                or origlen > MAX_RECORD or ts < info.first_ts - 86400
+                or (previous is not None and abs(ts - previous) > 86400)):
+            return False
+        previous = ts
+        offset += header.size + caplen
+        if offset > len(buf):
+            return False
+    return True
+
+
+def _walk_pcap(buf, info: CaptureInfo, start: int, end: int, seen: Seen) -> Tuple[int, int]:
+    header = struct.Struct(info.endian + 'IIII')
+    unpack, hsize, size = header.unpack_from, header.size, len(buf)
+    if start > info.data_start:
+        while start < min(end, size) and not _pcap_header_ok(info, header, buf, start):
+            start += 1
+    fixed = FIXED_SOURCE.get(info.linktype)
+    linktype = info.linktype
+    get = seen.get
+    packets = skipped = 0
+    offset = start
+    while offset < end and offset + hsize <= size:
+        ts, _, caplen, _ = unpack(buf, offset)
+        data = offset + hsize
+        offset = data + caplen
+        if offset > size:
+            break  # truncated final record
+        packets += 1
+        if fixed is not None:
+            if caplen < fixed + 6:
+                skipped += 1
+                continue
+            src = buf[data + fixed:data + fixed + 6]
+        else:
+            src = _source(linktype, buf, data, caplen)
+            if src is None:
+                skipped += 1
+                continue
+        if src[0] & 1:
+            continue  # multicast bit on a source address: malformed frame
+        # Per-packet hot path: one header unpack, one 6-byte slice, one dict probe
+        entry = get(src)
+        if entry is None:
+            seen[src] = [ts, ts]
+        elif ts > entry[1]:
+            entry[1] = ts
+        elif ts < entry[0]:
+            entry[0] = ts
+    return packets, skipped
+
+
+# pcapng -----------------------------------------------------------------
+
+def _tsresol(options, endian: str) -> int:
+    """Timestamp units per second from an IDB's options (default microseconds)"""
+    offset = 0
+    while offset + 4 <= len(options):
+        code, length = struct.unpack_from(endian + 'HH', options, offset)
+        if code == 0:
+            break
+        if code == OPT_IF_TSRESOL and length >= 1:
+            value = options[offset + 4]
+            return 2 ** (value & 0x7F) if value & 0x80 else 10 ** value
+        offset += 4 + ((length + 3) & ~3)
+    return 1_000_000
+
+
+def _pcapng_info(buf) -> Optional[CaptureInfo]:
+    if len(buf) < 28 or struct.unpack_from('<I', buf, 0)[0] != PCAPNG_SHB:
+        return None
+    endian = '<' if struct.unpack_from('<I', buf, 8)[0] == PCAPNG_BYTE_ORDER else '>'
+    info = CaptureInfo('pcapng', endian, 0)
+    # Interface descriptions lead the section in every common writer; collect
+    # them so shards starting mid-file know each interface's link type and clock
+    offset = 0
+    while offset + 12 <= len(buf):
+        kind, length = struct.unpack_from(endian + 'II', buf, offset)
+        if length < 12:
+            break
+        if kind == BLOCK_IDB:
+            linktype = struct.unpack_from(endian + 'H', buf, offset + 8)[0]
+            info.interfaces.append((linktype, _tsresol(buf[offset + 16:offset + length - 4], endian)))
+        elif kind in (BLOCK_EPB, BLOCK_SPB, BLOCK_PB):
+            break
+        offset += length
+    info.data_start = offset
+    return info
+
+
+def _block_ok(buf, endian: str, offset: int) -> bool:
+    """A chain of well-formed blocks (matching leading/trailing lengths) starts at offset"""
+    for _ in range(RESYNC_CHAIN):
+        if offset + 12 > len(buf):
+            return offset == len(buf)
+        kind, length = struct.unpack_from(endian + 'II', buf, offset)
+        if (kind not in KNOWN_BLOCKS or length < 12 or length & 3 or length > MAX_RECORD
+                or offset + length > len(buf)
+                or struct.unpack_from(endian + 'I', buf, offset + length - 4)[0] != length):
+            return False
+        offset += length
+    return True
+
+
+def _walk_pcapng(buf, info: CaptureInfo, start: int, end: int, seen: Seen) -> Tuple[int, int]:
+    endian = info.endian
+    block = struct.Struct(endian + 'II')
+    epb = struct.Struct(endian + 'IIII')   # interface, ts high, ts low, caplen
+    pb = struct.Struct(endian + 'HHIII')   # interface, drops, ts high, ts low, caplen
+    u32 = struct.Struct(endian + 'I')
+    size = len(buf)
+    if start > info.data_start:
+        start = (start + 3) & ~3
+        while start < min(end, size) and not _block_ok(buf, endian, start):
+            start += 4
+    interfaces = list(info.interfaces)
+    get = seen.get
+    packets = skipped = 0
+    offset = start
+    while offset < end and offset + 12 <= size:
+        kind, length = block.unpack_from(buf, offset)
+        if length < 12 or offset + length > size:
+            break
+        body = offset + 8
+        offset += length
+        if kind == BLOCK_EPB:
+            iface, high, low, caplen = epb.unpack_from(buf, body)
+            data = body + 20
+        elif kind == BLOCK_SPB:
+            iface, high, low = 0, 0, 0
+            caplen = min(u32.unpack_from(buf, body)[0], length - 16)
+            data = body + 4
+        elif kind == BLOCK_PB:
+            iface, _, high, low, caplen = pb.unpack_from(buf, body)
+            data = body + 20
+        else:
+            if kind == PCAPNG_SHB:
+                endian = '<' if struct.unpack_from('<I', buf, body)[0] == PCAPNG_BYTE_ORDER else '>'
+                block, epb, pb, u32 = (struct.Struct(endian + fmt)
+                                       for fmt in ('II', 'IIII', 'HHIII', 'I'))
+                interfaces = []
+            elif kind == BLOCK_IDB:
+                linktype = struct.unpack_from(endian + 'H', buf, body)[0]
+                interfaces.append((linktype, _tsresol(buf[body + 8:offset - 4], endian)))
+            continue
+        packets += 1
+        if iface >= len(interfaces):
+            skipped += 1
+            continue
+        linktype, units = interfaces[iface]
+        fixed = FIXED_SOURCE.get(linktype)
+        if fixed is not None:
+            src = buf[data + fixed:data + fixed + 6] if caplen >= fixed + 6 else None
+        else:
+            src = _source(linktype, buf, data, caplen)
+        if src is None:
+            skipped += 1
+            continue
+        if src[0] & 1:
+            continue
+        ts = ((high << 32) | low) // units
+        entry = get(src)
+        if entry is None:
+            seen[src] = [ts, ts]
+        elif ts > entry[1]:
+            entry[1] = ts
+        elif ts < entry[0]:
+            entry[0] = ts
+    return packets, skipped
+
+
+# Driver -----------------------------------------------------------------
+
+def _open(path: str) -> Tuple[mmap.mmap, CaptureInfo]:
+    with open(path, 'rb') as f:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    info = _pcap_info(buf) or _pcapng_info(buf)
+    if info is None:
+        buf.close()
+        raise ValueError(f"Not a pcap or pcapng file: {path}")
+    return buf, info
+
+
+def _scan_range(path: str, start: int, end: int) -> Tuple[Seen, int, int]:
+    """Worker body: walk the records whose headers begin in [start, end)"""
+    buf, info = _open(path)
+    try:
+        seen: Seen = {}
+        walk = _walk_pcap if info.kind == 'pcap' else _walk_pcapng
+        packets, skipped = walk(buf, info, max(start, info.data_start), end, seen)
+        return seen, packets, skipped
+    finally:
+        buf.close()
+
+
+def _shards(size: int, start: int, workers: int) -> List[Tuple[int, int]]:
+    if workers <= 1 or size - start < 2 * MIN_SHARD:
+        return [(start, size)]
+    count = min(workers, (size - start) // MIN_SHARD)
+    step = (size - start) // count
+    bounds = [start + i * step for i in range(count)] + [size]
+    return list(zip(bounds, bounds[1:]))
+
+
+def read_capture(path, workers: int = 1) -> CaptureSummary:
+    """Unique source MACs with first/last-seen epoch seconds
+
+    With workers > 1 a large file is split into byte ranges walked by
+    separate processes; each shard resynchronises on the first record
+    boundary at or after its start and finishes the record crossing its end.
+    """
+    path = os.fspath(path)
+    start_time = time.perf_counter()
+    size = os.path.getsize(path)
+    buf, info = _open(path)
+    buf.close()
+
+    ranges = _shards(size, info.data_start, workers)
+    if len(ranges) == 1:
+        results = [_scan_range(path, *ranges[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+            results = list(pool.map(_scan_range, [path] * len(ranges),
+                                    [s for s, _ in ranges], [e for _, e in ranges]))
+
+    merged: Seen = {}
+    packets = skipped = 0
+    for seen, shard_packets, shard_skipped in results:
+        packets += shard_packets
+        skipped += shard_skipped
+        for src, (first, last) in seen.items():
+            entry = merged.get(src)
+            if entry is None:
+                merged[src] = [first, last]
+            else:
+                entry[0], entry[1] = min(entry[0], first), max(entry[1], last)
+
+    text = b''.join(merged).hex(':').upper()
+    macs = [text[i:i + 17] for i in range(0, len(text), 18)]
+    return CaptureSummary(
+        path=path,
+        seen={mac: (first, last) for mac, (first, last) in zip(macs, merged.values())},
+        packets=packets,
+        skipped=skipped,
+        bytes=size,
+        elapsed_s=time.perf_counter() - start_time,
+    )
+
+
+def iter_capture(path, workers: int = 1) -> Iterator[Dict]:
+    """Device dicts for a capture (scan_sources hands .pcap/.pcapng paths here)"""
+    yield from read_capture(path, workers).devices()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="ZSPOOF offline capture fingerprinting")
+    parser.add_argument('capture', nargs='+', help='pcap or pcapng file')
+    parser.add_argument('-j', '--workers', type=int, default=1, help='processes per file')
+    parser.add_argument('--json', action='store_true', help='print summaries and fingerprints as JSON')
+    args = parser.parse_args(argv)
+
+    from ml_engine import get_engine
+
+    engine = get_engine()
+    reports = []
+    for path in args.capture:
+        summary = read_capture(path, args.workers)
+        fingerprint = engine.analyze_network_environment(list(summary.devices()))
+        reports.append(dict(summary.to_dict(), fingerprint={
+            'vendor_distribution': fingerprint.vendor_distribution,
+            'time_patterns': fingerprint.time_patterns,
+            'risk_score': fingerprint.risk_score,
+        }))
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        for report in reports:
+            print(f"{report['path']}: {report['packets']:,} packets, {report['unique_macs']:,} MACs "
+                  f"in {report['elapsed_s']:.2f} s ({report['mb_per_s']:.0f} MB/s)")
+            top = sorted(report['fingerprint']['vendor_distribution'].items(),
+                         key=lambda item: item[1], reverse=True)[:5]
+            print('  ' + ', '.join(f"{vendor} {share:.0%}" for vendor, share in top))
+    return 0
+
+
+# Export
+__all__ = ['CaptureSummary', 'read_capture', 'iter_capture', 'CAPTURE_SUFFIXES']
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+ZSPOOF Quality - Statistical validation of generated MACs
+Streams packed batches from a generator and checks per-byte uniformity,
+bit balance, OUI weighting, birthday-bound collisions and bit invariants
+with memory bounded by the collision window
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+from array import array
+from collections import Counter
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Iterable, List, Optional
+
+from mac_array import MacArray
+from mac_generator import (PROFILE_VENDORS, DEFAULT_CHUNK, iter_batches,
+                           oui_weights, resolve_profile)
+from oui_registry import BUILTIN_VENDOR_OUIS, mac_to_int
+
+DEFAULT_COUNT = 10_000_000
+DEFAULT_ALPHA = 1e-6
+DEFAULT_WINDOW = 1 << 21
+Z_LIMIT = 5.0
+
+_MULTICAST = bytes(b & 0x01 for b in range(256))
+_LOCAL = bytes((b >> 1) & 0x01 for b in range(256))
+
+_OUI_VENDOR = {mac_to_int(oui) >> 24: vendor
+               for vendor, ouis in BUILTIN_VENDOR_OUIS.items() for oui in ouis}
+
+
+def chi2_sf(x: float, dof: int) -> float:
+    """Chi-square upper tail (Wilson-Hilferty normal approximation)"""
+    if dof <= 0:
+        return 1.0
+    k = 2.0 / (9.0 * dof)
+    z = ((x / dof) ** (1.0 / 3.0) - (1.0 - k)) / math.sqrt(k)
+    return 0.5 * math.erfc(z / math.sqrt(2.0))
+
+
+def chi2(observed: Dict[int, int], expected: Dict[int, float]) -> Dict:
+    """Chi-square of observed counts against expected counts over `expected` keys"""
+    stat = sum((observed.get(k, 0) - e) ** 2 / e for k, e in expected.items() if e > 0)
+    dof = len(expected) - 1
+    return {'chi2': stat, 'dof': dof, 'p_value': chi2_sf(stat, dof)}
+
+
+class DuplicateWindow:
+    """Open-addressing set over the first `capacity` addresses (array-backed)"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        bits = max(4, (2 * capacity - 1).bit_length())
+        self.mask = (1 << bits) - 1
+        self.shift = 64 - bits
+        self.table = array('Q', bytes(8 << bits))
+        self.size = 0
+        self.duplicates = 0
+
+    def add_all(self, values) -> None:
+        table, mask, shift = self.table, self.mask, self.shift
+        size, duplicates = self.size, self.duplicates
+        for value in values:
+            if size >= self.capacity:
+                break
+            key = value + 1  # 0 marks an empty slot
+            i = ((value * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) >> shift
+            while True:
+                slot = table[i]
+                if slot == 0:
+                    table[i] = key
+                    break
+                if slot == key:
+                    duplicates += 1
+                    break
+                i = (i + 1) & mask
+            size += 1
+        self.size, self.duplicates = size, duplicates
+
+    @property
+    def full(self) -> bool:
+        return self.size >= self.capacity
+
+
+@dataclass
+class QualityReport:
+    """Machine-readable outcome of a quality run"""
+    profile: str
+    count: int
+    elapsed_s: float
+    checks: Dict[str, Dict] = field(default_factory=dict)
+
+    @property
+    def passed(self) -> bool:
+        return all(check['passed'] for check in self.checks.values())
+
+    def to_dict(self) -> Dict:
+        return dict(asdict(self), passed=self.passed)
+
+
+def _byte_domain(position: int, random_profile: bool) -> Optional[List[int]]:
+    """Values a byte may take if uniform, or None when it is not tested"""
+    if random_profile:
+        # First octet: multicast clear, LAA set; 64 values remain
+        return [b for b in range(256) if b & 0x03 == 0x02] if position == 0 else list(range(256))
+    return list(range(256)) if position >= 3 else None
+
+
+def analyze_chunks(
+    chunks: Iterable[bytes],
+    profile: str = 'random',
+    alpha: float = DEFAULT_ALPHA,
+    window: int = DEFAULT_WINDOW
+) -> QualityReport:
+    """Run every check over a stream of packed 6-byte record chunks"""
+    start = time.perf_counter()
+    profile = resolve_profile(profile)
+    random_profile = profile not in PROFILE_VENDORS
+
+    byte_counts = [Counter() for _ in range(6)]
+    tested = [p for p in range(6) if _byte_domain(p, random_profile) is not None]
+    oui_counts: Counter = Counter()
+    multicast = local = total = 0
+    dup = DuplicateWindow(window)
+
+    for raw in chunks:
+        n = len(raw) // 6
+        total += n
+        for position in tested:
+            byte_counts[position].update(raw[position::6])
+        first = raw[0::6]
+        multicast += first.translate(_MULTICAST).count(1)
+        local += first.translate(_LOCAL).count(1)
+        macs = MacArray.from_records(raw)
+        if not random_profile:
+            oui_counts.update(macs.ouis())
+        if not dup.full:
+            dup.add_all(macs)
+
+    report = QualityReport(profile=profile, count=total, elapsed_s=0.0)
+    if not total:
+        report.elapsed_s = time.perf_counter() - start
+        return report
+
+    # Per-byte chi-square over the positions that should be uniform
+    bytes_check = {'passed': True, 'positions': {}}
+    for position in tested:
+        domain = _byte_domain(position, random_profile)
+        expected = {b: total / len(domain) for b in domain}
+        result = chi2(byte_counts[position], expected)
+        result['out_of_domain'] = total - sum(byte_counts[position][b] for b in domain)
+        result['passed'] = result['p_value'] > alpha and not result['out_of_domain']
+        bytes_check['positions'][position] = result
+        bytes_check['passed'] &= result['passed']
+    report.checks['byte_chi2'] = bytes_check
+
+    # Bit balance from the byte histograms (free once counted)
+    bits, worst = {}, 0.0
+    for position in tested:
+        for bit in range(8):
+            if position == 0 and random_profile and bit < 2:
+                continue
+            ones = sum(c for b, c in byte_counts[position].items() if b >> bit & 1)
+            z = (ones - total / 2) / math.sqrt(total / 4)
+            bits[position * 8 + (7 - bit)] = {'ones': ones / total, 'z': z}
+            worst = max(worst, abs(z))
+    report.checks['bit_balance'] = {'passed': worst < Z_LIMIT, 'max_abs_z': worst, 'bits': bits}
+
+    # OUI distribution against the profile's exact draw probabilities
+    if not random_profile:
+        weights = oui_weights(profile)
+        result = chi2(oui_counts, {oui: p * total for oui, p in weights.items()})
+        unexpected = sum(c for oui, c in oui_counts.items() if oui not in weights)
+        vendor_totals = dict(PROFILE_VENDORS[profile])
+        share_sum = sum(vendor_totals.values())
+        observed_vendors: Counter = Counter()
+        for oui, c in oui_counts.items():
+            observed_vendors[_OUI_VENDOR.get(oui, 'unknown')] += c
+        vendors = {
+            vendor: {'expected': share / share_sum, 'observed': observed_vendors[vendor] / total}
+            for vendor, share in vendor_totals.items()
+        }
+        result.update(
+            passed=result['p_value'] > alpha and not unexpected,
+            unexpected_ouis=unexpected,
+            vendors=vendors,
+        )
+        report.checks['oui_distribution'] = result
+
+    # Collisions in the window against the birthday expectation
+    m = dup.size
+    if random_profile:
+        sum_p2 = 2.0 ** -46
+    else:
+        sum_p2 = sum(p * p for p in oui_weights(profile).values()) * 2.0 ** -24
+    expected = m * (m - 1) / 2 * sum_p2
+    tolerance = Z_LIMIT * math.sqrt(expected) + 3
+    report.checks['collisions'] = {
+        'passed': abs(dup.duplicates - expected) <= tolerance,
+        'window': m,
+        'observed': dup.duplicates,
+        'expected': expected,
+    }
+
+    # Bit invariants: never multicast; LAA exactly when random
+    expected_local = total if random_profile else 0
+    report.checks['invariants'] = {
+        'passed': multicast == 0 and local == expected_local,
+        'multicast': multicast,
+        'locally_administered': local,
+        'expected_locally_administered': expected_local,
+    }
+
+    report.elapsed_s = time.perf_counter() - start
+    return report
+
+
+def run(
+    profile: str = 'random',
+    count: int = DEFAULT_COUNT,
+    chunk: int = DEFAULT_CHUNK * 16,
+    use_engine: bool = False,
+    alpha: float = DEFAULT_ALPHA,
+    window: int = DEFAULT_WINDOW
+) -> QualityReport:
+    """Validate `count` addresses pulled from the batch generator"""
+    return analyze_chunks(iter_batches(profile, count, chunk, use_engine), profile, alpha, window)
+
+
+def _summary(report: QualityReport) -> str:
+    lines = [f"{report.profile}: {report.count:,} MACs in {report.elapsed_s:.2f} s"]
+    for name, check in report.checks.items():
+        status = 'PASS' if check['passed'] else 'FAIL'
+        detail = {k: v for k, v in check.items()
+                  if k not in ('passed', 'positions', 'bits', 'vendors')}
+        lines.append(f"  {status}  {name:17s} {json.dumps(detail, default=str)}")
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="ZSPOOF generator quality validator")
+    parser.add_argument('-p', '--profile', action='append',
+                        help='profile to test (repeatable, default: all)')
+    parser.add_argument('-n', '--count', type=int, default=DEFAULT_COUNT)
+    parser.add_argument('--engine', action='store_true', help='pull batches from bin/core_engine')
+    parser.add_argument('--alpha', type=float, default=DEFAULT_ALPHA,
+                        help='p-value below which a distribution check fails')
+    parser.add_argument('--window', type=int, default=DEFAULT_WINDOW,
+                        help='addresses kept for the collision check')
+    parser.add_argument('--json', action='store_true', help='print the full report as JSON')
+    args = parser.parse_args(argv)
+
+    profiles = args.profile or list(PROFILE_VENDORS) + ['random']
+    reports = [run(p, args.count, use_engine=args.engine, alpha=args.alpha, window=args.window)
+               for p in profiles]
+    if args.json:
+        print(json.dumps([r.to_dict() for r in reports], indent=2))
+    else:
+        print('\n'.join(_summary(r) for r in reports))
+    return 0 if all(r.passed for r in reports) else 1
+
+
+# Export
+__all__ = ['QualityReport', 'analyze_chunks', 'run', 'chi2', 'chi2_sf']
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+ZSPOOF RNG Streams - Deterministic, splittable random streams
+Counter-mode SHAKE-256 keyed by (seed, spawn path): block i of a stream is
+SHAKE-256(key || i), so any position is reachable in O(1), the same seed
+gives the same bytes on every platform, and spawn(i) derives child streams
+that share no state with the parent or each other
+"""
+
+import hashlib
+import os
+import random
+from typing import Optional, Tuple, Union
+
+Seed = Union[int, str, bytes, None]
+
+BLOCK_SIZE = 1 << 16
+KEY_SIZE = 32
+STATE_VERSION = 1
+
+_PERSON = b'zspoof-rng'
+
+
+def _seed_bytes(seed: Union[int, str, bytes]) -> bytes:
+    if isinstance(seed, bool) or not isinstance(seed, (int, str, bytes)):
+        raise TypeError(f"seed must be an int, str or bytes, not {type(seed).__name__}")
+    if isinstance(seed, int):
+        if seed < 0:
+            raise ValueError("seed must be non-negative")
+        return b'i' + seed.to_bytes((seed.bit_length() + 7) // 8, 'little')
+    if isinstance(seed, str):
+        return b's' + seed.encode('utf-8')
+    return b'b' + seed
+
+
+def derive_key(seed: Union[int, str, bytes], path: Tuple[int, ...] = ()) -> bytes:
+    """Stream key for a seed and spawn path"""
+    key = hashlib.blake2b(_seed_bytes(seed), digest_size=KEY_SIZE, person=_PERSON).digest()
+    for index in path:
+        key = hashlib.blake2b(index.to_bytes(8, 'little'), key=key,
+                              digest_size=KEY_SIZE, person=_PERSON).digest()
+    return key
+
+
+class StreamRandom(random.Random):
+    """random.Random over one counter-mode stream
+
+    randbytes() reads the stream sequentially, so output depends only on the
+    seed, the spawn path and the total bytes consumed, not on how reads are
+    chunked; every other Random method (choice, randrange, shuffle, ...)
+    draws from the same stream. Without a seed the key comes from os.urandom.
+    """
+
+    def __init__(self, seed: Seed = None, path: Tuple[int, ...] = ()):
+        self.path = tuple(path)
+        super().__init__(seed)
+
+    def seed(self, a: Seed = None, version: int = 2) -> None:
+        self._seed = os.urandom(KEY_SIZE) if a is None else a
+        self.key = derive_key(self._seed, self.path)
+        self.position = 0
+        self._index = -1
+        self._block = b''
+
+    def spawn(self, index: int) -> 'StreamRandom':
+        """Independent child stream (same seed, path + (index,))"""
+        return StreamRandom(self._seed, self.path + (index,))
+
+    def _load(self, index: int) -> bytes:
+        if index != self._index:
+            self._block = hashlib.shake_256(
+                self.key + index.to_bytes(8, 'little')).digest(BLOCK_SIZE)
+            self._index = index
+        return self._block
+
+    def randbytes(self, n: int) -> bytes:
+        start, end = self.position, self.position + n
+        index, offset = divmod(start, BLOCK_SIZE)
+        if offset + n <= BLOCK_SIZE:
+            self.position = end
+            return self._load(index)[offset:offset + n]
+        parts = []
+        while start < end:
+            index, offset = divmod(start, BLOCK_SIZE)
+            take = min(end - start, BLOCK_SIZE - offset)
+            if offset == 0 and take == BLOCK_SIZE:
+                # Whole blocks skip the cache
+                parts.append(hashlib.shake_256(
+                    self.key + index.to_bytes(8, 'little')).digest(BLOCK_SIZE))
+            else:
+                parts.append(self._load(index)[offset:offset + take])
+            start += take
+        self.position = end
+        return b''.join(parts)
+
+    def getrandbits(self, k: int) -> int:
+        if k < 0:
+            raise ValueError("number of bits must be non-negative")
+        n = (k + 7) // 8
+        return int.from_bytes(self.randbytes(n), 'little') >> (8 * n - k)
+
+    def random(self) -> float:
+        return (int.from_bytes(self.randbytes(7), 'little') >> 3) * (1.0 / (1 << 53))
+
+    def getstate(self) -> Tuple:
+        return (STATE_VERSION, self.key, self.position, self._seed, self.path)
+
+    def setstate(self, state: Tuple) -> None:
+        version, self.key, self.position, self._seed, self.path = state
+        if version != STATE_VERSION:
+            raise ValueError(f"state version {version} is not supported")
+        self._index = -1
+        self._block = b''
+
+
+def stream(seed: Seed = None, index: Optional[int] = None) -> StreamRandom:
+    """Root stream for a seed, or its index-th child"""
+    root = StreamRandom(seed)
+    return root if index is None else root.spawn(index)
+
+
+# Export
+__all__ = ['StreamRandom', 'stream', 'derive_key', 'BLOCK_SIZE']
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+ZSPOOF Scan Sources - Lazy scan-result ingestion
+Iterates in-memory scan lists, arbitrary iterables, NDJSON/CSV exports,
+JSON-array exports or packet captures on disk without materialising the
+whole inventory
+"""
+
+import csv
+import gzip
+import io
+import json
+import os
+import re
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Union
+
+ScanSource = Union[Iterable[Dict], Iterable[str], str, os.PathLike]
+
+NDJSON_SUFFIXES = {'.ndjson', '.jsonl', '.json'}
+CSV_SUFFIXES = {'.csv'}
+CAPTURE_SUFFIXES = {'.pcap', '.pcapng', '.cap', '.dmp'}  # mirrored in pcap_reader
+
+DEFAULT_CHUNK = 8192
+
+# JSON-array exports are decoded element by element from reads of this size
+_READ_SIZE = 1 << 16
+_SEPARATORS = re.compile(r'[\s,]*')
+_decoder = json.JSONDecoder()
+
+
+def _open_text(path: Path) -> io.TextIOBase:
+    if path.suffix == '.gz':
+        return gzip.open(path, 'rt', encoding='utf-8', newline='')
+    return open(path, 'r', encoding='utf-8', newline='')
+
+
+def _record_format(path: Path, first_line: str) -> str:
+    if first_line.lstrip('\ufeff \t').startswith('['):
+        return 'json'
+    suffixes = {s.lower() for s in path.suffixes}
+    if suffixes & NDJSON_SUFFIXES:
+        return 'ndjson'
+    if suffixes & CSV_SUFFIXES:
+        return 'csv'
+    return 'ndjson' if first_line.lstrip().startswith('{') else 'csv'
+
+
+def _chain(first: str, rest: Iterable[str]) -> Iterator[str]:
+    yield first
+    yield from rest
+
+
+def _iter_array(first: str, f: io.TextIOBase) -> Iterator:
+    """Elements of a top-level JSON array, decoded as the text arrives"""
+    buf, pos = first, first.index('[') + 1
+    while True:
+        pos = _SEPARATORS.match(buf, pos).end()
+        if pos == len(buf):
+            buf, pos = f.read(_READ_SIZE), 0
+            if not buf:
+                raise ValueError("JSON array export ends before its closing ']'")
+            continue
+        if buf[pos] == ']':
+            return
+        try:
+            item, pos = _decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            # Element cut by the read boundary: extend the buffer and retry
+            more = f.read(_READ_SIZE)
+            if not more:
+                raise
+            buf, pos = buf[pos:] + more, 0
+            continue
+        yield item
+
+
+def iter_file(path: Union[str, os.PathLike]) -> Iterator[Dict]:
+    """Yield device dicts from an NDJSON or CSV export, one line at a time
+
+    A .json file holding one JSON array (a leading '[') is streamed element
+    by element instead; bare MAC strings in it become {'mac': ...}. Packet
+    captures (.pcap/.pcapng) yield one device per source MAC instead
+    """
+    path = Path(path)
+    if path.suffix.lower() in CAPTURE_SUFFIXES:
+        from pcap_reader import iter_capture
+        yield from iter_capture(path)
+        return
+    with _open_text(path) as f:
+        # Bounded: a compact JSON array is one line as long as the file
+        first = f.readline(_READ_SIZE)
+        fmt = _record_format(path, first)
+        if fmt != 'json' and not first.endswith('\n'):
+            first += f.readline()
+        if fmt == 'json':
+            for item in _iter_array(first, f):
+                yield {'mac': item} if isinstance(item, str) else item
+        elif fmt == 'ndjson':
+            for line in _chain(first, f):
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+        else:
+            # Header names are matched case-insensitively (MAC, mac, Mac Address...)
+            header = [name.strip().lower().replace(' address', '') for name in next(csv.reader([first]))]
+            for row in csv.reader(f):
+                yield dict(zip(header, row))
+
+
+def iter_devices(source: ScanSource) -> Iterator[Dict]:
+    """Yield device dicts from a path, an iterable of dicts, or bare MAC strings"""
+    if isinstance(source, (str, os.PathLike)):
+        yield from iter_file(source)
+        return
+    for item in source:
+        yield {'mac': item} if isinstance(item, str) else item
+
+
+def iter_chunks(source: ScanSource, chunk_size: int = DEFAULT_CHUNK) -> Iterator[List[Dict]]:
+    """Group devices into bounded lists for batch processing"""
+    devices = iter_devices(source)
+    while True:
+        chunk = list(islice(devices, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# Export
+__all__ = ['ScanSource', 'iter_devices', 'iter_file', 'iter_chunks']
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+ZSPOOF Session Store - Persistent spoof-operation log
+Append-only SQLite (WAL) table indexed on interface, profile and time, with
+aggregate counters kept in step by the batched background writer
+"""
+
+import atexit
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_DB_PATH = Path(__file__).resolve().parent.parent / "data" / "sessions.db"
+BATCH_SIZE = 512
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id           INTEGER PRIMARY KEY,
+    ts           REAL    NOT NULL,
+    interface    TEXT    NOT NULL,
+    profile      TEXT    NOT NULL,
+    mac          TEXT    NOT NULL,
+    original_mac TEXT,
+    success      INTEGER NOT NULL,
+    source       TEXT    NOT NULL,
+    latency_ms   REAL,
+    error        TEXT
+);
+CREATE INDEX IF NOT EXISTS sessions_ts ON sessions (ts);
+CREATE INDEX IF NOT EXISTS sessions_interface ON sessions (interface, id);
+CREATE INDEX IF NOT EXISTS sessions_profile ON sessions (profile, id);
+CREATE TABLE IF NOT EXISTS counters (
+    key   TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+_COLUMNS = ('ts', 'interface', 'profile', 'mac', 'original_mac',
+            'success', 'source', 'latency_ms', 'error')
+
+_INSERT = f"INSERT INTO sessions ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})"
+_BUMP = ("INSERT INTO counters (key, value) VALUES (?, ?) "
+         "ON CONFLICT(key) DO UPDATE SET value = value + excluded.value")
+
+
+@dataclass
+class Session:
+    """One recorded MAC change"""
+    interface: str
+    mac: str
+    profile: str = 'custom'
+    original_mac: Optional[str] = None
+    success: bool = True
+    source: str = 'dashboard'
+    latency_ms: Optional[float] = None
+    error: Optional[str] = None
+    ts: float = 0.0
+    id: Optional[int] = None
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def _session(row: sqlite3.Row) -> Session:
+    session = Session(**dict(row))
+    session.success = bool(session.success)
+    return session
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(path), timeout=30, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class SessionStore:
+    """Session log shared by the dashboard and both CLIs"""
+
+    def __init__(self, path=None):
+        self.path = Path(path or os.environ.get('ZSPOOF_SESSION_DB', DEFAULT_DB_PATH))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = _connect(self.path)
+        conn.executescript(_SCHEMA)
+        conn.close()
+        self._queue: 'queue.Queue[Optional[Session]]' = queue.Queue()
+        self._local = threading.local()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+
+    # Writes -----------------------------------------------------------
+
+    def record(self, session: Session) -> None:
+        """Queue a session; the caller never waits on disk"""
+        if not session.ts:
+            session.ts = time.time()
+        if self._writer is None:
+            self._start_writer()
+        self._queue.put(session)
+
+    def _start_writer(self) -> None:
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name='zspoof-sessions',
+                                                daemon=True)
+                self._writer.start()
+                atexit.register(self.close)
+
+    def _write_loop(self) -> None:
+        conn = _connect(self.path)
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            sessions = [s for s in batch if s is not None]
+            try:
+                if sessions:
+                    self._write(conn, sessions)
+            except sqlite3.Error as e:
+                # Never take the writer down; the request path must not stall
+                print(f"[session_store] dropped {len(sessions)} sessions: {e}", file=sys.stderr)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if len(sessions) < len(batch):
+                conn.close()
+                return
+
+    def _write(self, conn: sqlite3.Connection, sessions: List[Session]) -> None:
+        deltas: Dict[str, int] = {'total': len(sessions)}
+        for s in sessions:
+            for key in ('success' if s.success else 'failed',
+                        f'interface:{s.interface}', f'profile:{s.profile}', f'source:{s.source}'):
+                deltas[key] = deltas.get(key, 0) + 1
+        rows = [(s.ts, s.interface, s.profile, s.mac, s.original_mac, int(s.success),
+                 s.source, s.latency_ms, s.error) for s in sessions]
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(_INSERT, rows)
+            conn.executemany(_BUMP, deltas.items())
+            conn.execute("INSERT OR REPLACE INTO counters (key, value) "
+                         "SELECT 'last_id', MAX(id) FROM sessions")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def flush(self) -> None:
+        """Block until every queued session is on disk"""
+        if self._writer is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        """Flush and stop the writer thread"""
+        with self._writer_lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            self._queue.put(None)
+            writer.join()
+
+    # Reads ------------------------------------------------------------
+
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = _connect(self.path)
+            conn.row_factory = sqlite3.Row
+        return conn
+
+    def stats(self) -> Dict:
+        """Aggregate counters (a single small-table read) plus the last session"""
+        conn = self._reader()
+        counters = dict(conn.execute("SELECT key, value FROM counters").fetchall())
+        last_id = counters.pop('last_id', None)
+        last = conn.execute("SELECT * FROM sessions WHERE id = ?", (last_id,)).fetchone()
+
+        def group(prefix: str) -> Dict[str, int]:
+            return {k[len(prefix):]: v for k, v in counters.items() if k.startswith(prefix)}
+
+        return {
+            'total_sessions': counters.get('total', 0),
+            'successful': counters.get('success', 0),
+            'failed': counters.get('failed', 0),
+            'by_profile': group('profile:'),
+            'by_interface': group('interface:'),
+            'by_source': group('source:'),
+            'last_session': _session(last).to_dict() if last else None,
+        }
+
+    def sessions(
+        self,
+        limit: int = 50,
+        before: Optional[int] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        interface: Optional[str] = None,
+        profile: Optional[str] = None
+    ) -> Tuple[List[Session], Optional[int]]:
+        """Newest-first page; pass the returned cursor as `before` for the next page"""
+        clauses, params = [], []
+        for column, op, value in (('id', '<', before), ('ts', '>=', since), ('ts', '<', until),
+                                  ('interface', '=', interface), ('profile', '=', profile)):
+            if value is not None:
+                clauses.append(f"{column} {op} ?")
+                params.append(value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._reader().execute(
+            f"SELECT * FROM sessions {where} ORDER BY id DESC LIMIT ?", (*params, limit)
+        ).fetchall()
+        sessions = [_session(row) for row in rows]
+        cursor = sessions[-1].id if len(sessions) == limit else None
+        return sessions, cursor
+
+
+_store: Optional[SessionStore] = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> SessionStore:
+    """Process-wide store at ZSPOOF_SESSION_DB or data/sessions.db"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = SessionStore()
+    return _store
+
+
+def log_session(session: Session) -> bool:
+    """Record a session; an unusable store never fails the MAC change itself"""
+    try:
+        get_store().record(session)
+        return True
+    except (OSError, sqlite3.Error) as e:
+        print(f"[session_store] {e}", file=sys.stderr)
+        return False
+
+
+# Export
+__all__ = ['Session', 'SessionStore', 'get_store', 'log_session']
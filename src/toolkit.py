@@ -1,14 +1,10 @@
-import subprocess
-import re
 import sys
-import argparse
 import os
-import time
-from tqdm import tqdm
+
+import inventory
 
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-BIN_PATH = os.path.join(BASE_DIR, "../bin/heavylifting")
 
 
 class Colors:
@@ -28,47 +24,29 @@ def print_banner():
     else:
         print(f"{Colors.HEADER}--- ZSPOOF ---\nIdentity is a surface.{Colors.ENDC}")
 
-def get_cpp_mac(profile="random"):
-    if not os.path.exists(BIN_PATH):
-        print(f"{Colors.FAIL}[!] Binary missing. Run 'make' first.{Colors.ENDC}")
-        sys.exit(1)
-    try:
-        result = subprocess.run([BIN_PATH, profile], capture_output=True, text=True)
-        return result.stdout.strip()
-    except Exception as e:
-        print(f"{Colors.FAIL}[!] C++ Engine Failure: {e}{Colors.ENDC}")
-        sys.exit(1)
-
 def get_current_state(iface):
-    try:
-
-        mac = subprocess.check_output(f"cat /sys/class/net/{iface}/address", shell=True).decode().strip()
-
-        state = subprocess.check_output(f"cat /sys/class/net/{iface}/operstate", shell=True).decode().strip()
-        return mac, state
-    except:
+    info = inventory.get_interface(iface)
+    if info is None:
         return "Unknown", "Unknown"
+    return info.mac, info.operstate
 
-def set_interface_state(iface, state):
-    subprocess.run(["ip", "link", "set", "dev", iface, state], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+def change_mac(iface, new_mac, profile='custom', original_mac=None):
+    # Deferred so the menu is on screen before the rtnetlink/sqlite modules load
+    from bulk_apply import apply_one
+    from session_store import Session, log_session
 
-def change_mac(iface, new_mac):
-    print(f"\n{Colors.BLUE}[*] Disengaging {iface}...{Colors.ENDC}")
-    set_interface_state(iface, "down")
-    
-    print(f"{Colors.BLUE}[*] Burning new identity: {new_mac}{Colors.ENDC}")
-    time.sleep(0.5) 
-    
-    try:
-        subprocess.run(["ip", "link", "set", "dev", iface, "address", new_mac], check=True)
-        success = True
-    except subprocess.CalledProcessError:
-        print(f"{Colors.FAIL}[!] Hardware Rejected the new MAC.{Colors.ENDC}")
-        success = False
+    print(f"\n{Colors.BLUE}[*] Burning new identity on {iface}: {new_mac}{Colors.ENDC}")
+    result = apply_one(iface, new_mac)
+    log_session(Session(interface=iface, mac=new_mac, profile=profile, original_mac=original_mac,
+                        success=result.success, source='toolkit',
+                        latency_ms=result.timings.get('total'), error=result.error))
+
+    if not result.success:
+        print(f"{Colors.FAIL}[!] Hardware Rejected the new MAC: {result.error}{Colors.ENDC}")
+        return False
 
-    print(f"{Colors.BLUE}[*] Re-engaging {iface}...{Colors.ENDC}")
-    set_interface_state(iface, "up")
-    return success
+    print(f"{Colors.BLUE}[*] {iface} re-engaged after {result.timings['total']:.2f} ms{Colors.ENDC}")
+    return True
 
 def main():
     print_banner()
@@ -78,10 +56,8 @@ def main():
         sys.exit(1)
 
 
-    try:
-        route = subprocess.check_output("ip route show default", shell=True).decode()
-        current_iface = route.split("dev")[1].split()[0]
-    except:
+    current_iface = inventory.default_interface()
+    if current_iface is None:
         print(f"{Colors.WARNING}[!] No active network found. Pick an interface manually (eth0/wlan0):{Colors.ENDC}")
         current_iface = input("Interface name: ").strip()
 
@@ -109,13 +85,11 @@ def main():
         sys.exit(0)
         
     if choice in profile_map:
-        new_mac = get_cpp_mac(profile_map[choice])
-        
-
-        for _ in tqdm(range(100), desc="Rewriting Firmware Headers", ncols=70, bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt}"):
-            time.sleep(0.005)
+        from mac_generator import TOOLKIT_VENDORS
+        from uniqueness import unique_mac
+        new_mac = unique_mac(profile_map[choice], TOOLKIT_VENDORS)
             
-        if change_mac(current_iface, new_mac):
+        if change_mac(current_iface, new_mac, profile_map[choice], original_mac):
             print(f"\n{Colors.GREEN}[+] SPOOF SUCCESSFUL.{Colors.ENDC}")
             print(f"    Your new digital fingerprint: {Colors.BOLD}{new_mac}{Colors.ENDC}")
             print(f"    Profile loaded: {profile_map[choice].upper()}")
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+ZSPOOF Uniqueness Index - Never issue the same MAC twice
+Universally administered addresses are tracked exactly in a 2 MiB bitmap
+per OUI (one bit for each of the 2^24 NICs); the locally administered
+random space is too large for bitmaps and goes to a fixed-size blocked
+Bloom filter (all of an address's bits in one 64-bit word), whose false
+positives only cost a redraw. Both tiers are memory maps (anonymous, or
+files under a directory for persistence), so memory and lookup cost stay
+flat however many addresses have been issued. Bloom words and masks for a
+batch come from a handful of big-integer operations, one lane per address.
+"""
+
+import math
+
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from itertools import compress
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Tuple, Union
+
+from mac_array import MacArray
+from mac_generator import PROFILE_VENDORS, format_records, generate_batch_bytes
+from metrics import timed
+from rng_streams import StreamRandom
+from scan_sources import ScanSource, iter_chunks
+
+ENABLED = os.environ.get('ZSPOOF_UNIQUE', '1') != '0'
+
+MAGIC = b'ZUNQ'
+FORMAT_VERSION = 2  # v2: blocked Bloom filter, words in host byte order
+
+# magic, version, hash count, Bloom size in bits (log2), bitmap entries, Bloom entries
+_HEADER = struct.Struct('<4sHHIQQ')
+_HEADER_SIZE = 4096  # keeps the filter page-aligned
+
+NIC_BITS = 24
+BITMAP_SIZE = 1 << (NIC_BITS - 3)  # 2 MiB
+
+DEFAULT_DIR = Path(__file__).parent.parent / 'data' / 'unique'
+DEFAULT_BLOOM_BITS = 29  # 64 MiB: ~6e-4 false positives at 20M random addresses
+DEFAULT_HASHES = 7
+MAX_HASHES = 8  # one 6-bit position per byte of a 64-bit hash
+MAX_REDRAWS = 64
+
+_M64 = (1 << 64) - 1
+_LOCAL = 1 << 41  # locally administered bit of the first octet
+_LITTLE = sys.byteorder == 'little'
+
+# Odd multipliers of the two multiply-shift hashes (word index, bit positions)
+_MUL1 = 0x9E3779B97F4A7C15
+_MUL2 = 0xC2B2AE3D27D4EB4F
+
+# _LANE_BYTE[j][b]: byte j of the 64-bit mask with bit (b >> 2) set
+_LANE_BYTE = [bytes(1 << ((b >> 2) & 7) if b >> 5 == j else 0 for b in range(256))
+              for j in range(8)]
+_NONZERO = bytes([0] + [1] * 255)
+_IS_ZERO = bytes([1] + [0] * 255)
+
+
+def _to_int(words: array) -> int:
+    """Big integer whose 64-bit lane i is words[i]"""
+    if not _LITTLE:
+        words = array('Q', words)
+        words.byteswap()
+    return int.from_bytes(words.tobytes(), 'little')
+
+
+def _to_words(value: int, n: int) -> array:
+    """Inverse of _to_int for n lanes"""
+    words = array('Q')
+    words.frombytes(value.to_bytes(8 * n, 'little'))
+    if not _LITTLE:
+        words.byteswap()
+    return words
+
+
+def _repeat(word: int, n: int) -> int:
+    """word in each of n 64-bit lanes"""
+    return int.from_bytes(word.to_bytes(8, 'little') * n, 'little')
+
+
+def _map(path: Optional[Path], size: int) -> mmap.mmap:
+    """Zero-filled shared map of `size` bytes (sparse file or anonymous)"""
+    if path is None:
+        return mmap.mmap(-1, size)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if os.fstat(fd).st_size < size:
+            os.ftruncate(fd, size)
+        return mmap.mmap(fd, size)
+    finally:
+        os.close(fd)
+
+
+class UniquenessIndex:
+    """Addresses already issued or seen on the network
+
+    claim() marks a batch and returns only the records that were new, which
+    is all a generator needs to reject and redraw; generate() does that loop.
+    Safe across threads; one process at a time should write a directory.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike, None] = None,
+                 bloom_bits: int = DEFAULT_BLOOM_BITS, hashes: int = DEFAULT_HASHES):
+        self.path = Path(path) if path is not None else None
+        self._lock = threading.Lock()
+        self._bitmaps: Dict[int, mmap.mmap] = {}
+        if self.path is not None:
+            self.path.mkdir(parents=True, exist_ok=True)
+            bloom_path = self.path / 'bloom.bin'
+            if bloom_path.exists():
+                with open(bloom_path, 'rb') as f:
+                    magic, version, hashes, bloom_bits, _, _ = _HEADER.unpack(f.read(_HEADER.size))
+                if magic != MAGIC or version != FORMAT_VERSION:
+                    raise ValueError(f"{bloom_path}: not a ZSPOOF uniqueness index (v{FORMAT_VERSION})")
+        if not 1 <= hashes <= MAX_HASHES or bloom_bits < 9:
+            raise ValueError(f"need 1-{MAX_HASHES} hashes and at least 2^9 Bloom bits")
+        self.hashes = hashes
+        self.bloom_bits = bloom_bits
+        self._word_bits = bloom_bits - 6  # log2 of the number of 64-bit words
+        self._header = _map(self.path and self.path / 'bloom.bin', _HEADER_SIZE + (1 << bloom_bits >> 3))
+        magic, _, _, _, self.bitmap_count, self.bloom_count = _HEADER.unpack_from(self._header, 0)
+        if magic != MAGIC:
+            _HEADER.pack_into(self._header, 0, MAGIC, FORMAT_VERSION, hashes, bloom_bits, 0, 0)
+        self._bloom = memoryview(self._header)[_HEADER_SIZE:].cast('Q')
+        if self.path is not None:
+            for bitmap in self.path.glob('*.bitmap'):
+                self._bitmap(int(bitmap.stem, 16))
+
+    def __len__(self) -> int:
+        """Addresses recorded (the Bloom tier counts inserts it saw as new)"""
+        return self.bitmap_count + self.bloom_count
+
+    def _bitmap(self, oui: int) -> mmap.mmap:
+        bitmap = self._bitmaps.get(oui)
+        if bitmap is None:
+            path = self.path and self.path / f'{oui:06X}.bitmap'
+            bitmap = self._bitmaps[oui] = _map(path, BITMAP_SIZE)
+        return bitmap
+
+    def _block(self, value: int) -> Tuple[int, int]:
+        """(Bloom word, bit mask) of one address"""
+        low1 = (value * _MUL1) & _M64
+        low2 = (value * _MUL2) & _M64
+        mask = 0
+        for i in range(self.hashes):
+            mask |= 1 << ((low2 >> (58 - 8 * i)) & 63)  # top 6 bits of byte 7 - i
+        return low1 >> (64 - self._word_bits), mask
+
+    def _batch_blocks(self, values: array) -> Tuple[array, int]:
+        """_block for a batch: (word indexes, masks as one big integer of 64-bit lanes)
+
+        Each address gets a 128-bit lane of one big integer, so a single
+        multiplication hashes them all (48 x 64-bit products never carry into
+        the next lane); the bit positions are the top 6 bits of the hash bytes,
+        spread into their mask lanes by eight translate() tables
+        """
+        n = len(values)
+        wide = array('Q', bytes(16 * n))
+        wide[0::2] = values
+        lanes = _to_int(wide)
+        low1 = _to_int(_to_words(lanes * _MUL1, 2 * n)[0::2])
+        low2 = _to_int(_to_words(lanes * _MUL2, 2 * n)[0::2])
+        words = _to_words((low1 >> (64 - self._word_bits)) & _repeat((1 << self._word_bits) - 1, n), n)
+        masks = 0
+        lane = bytearray(8 * n)
+        hashed = low2.to_bytes(8 * n, 'little')
+        for i in range(self.hashes):
+            positions = hashed[7 - i::8]
+            for j in range(8):
+                lane[j::8] = positions.translate(_LANE_BYTE[j])
+            masks |= int.from_bytes(lane, 'little')
+        return words, masks
+
+    def _mark_local(self, values: array) -> bytes:
+        """Bloom tier for a batch; 1 per address that was new (first copy only)"""
+        n = len(values)
+        bloom = self._bloom
+        words, masks = self._batch_blocks(values)
+        stored = _to_int(array('Q', map(bloom.__getitem__, words)))
+        # A lane is new when any of its mask bits is unset; fold each lane onto its low byte
+        missing = (stored & masks) ^ masks
+        missing |= missing >> 32
+        missing |= missing >> 16
+        missing |= missing >> 8
+        fresh = missing.to_bytes(8 * n + 8, 'little')[0:8 * n:8].translate(_NONZERO)
+        new = fresh.count(1)
+        if new > 1 and len(set(compress(values, fresh))) < new:
+            # Repeats inside the batch: only the first copy is new
+            seen, flags = set(), bytearray(fresh)
+            for i in range(n):
+                if flags[i]:
+                    if values[i] in seen:
+                        flags[i] = 0
+                    seen.add(values[i])
+            fresh = bytes(flags)
+        for word, mask in zip(compress(words, fresh), compress(_to_words(masks, n), fresh)):
+            bloom[word] |= mask
+        self.bloom_count += fresh.count(1)
+        return fresh
+
+    def _mark_universal(self, values: array) -> bytes:
+        """Bitmap tier for a batch; 1 per address that was new"""
+        flags = bytearray(len(values))
+        bitmaps = self._bitmaps
+        for i, value in enumerate(values):
+            bitmap = bitmaps.get(value >> NIC_BITS)
+            if bitmap is None:
+                bitmap = self._bitmap(value >> NIC_BITS)
+            byte, mask = (value & 0xFFFFFF) >> 3, 1 << (value & 7)
+            if not bitmap[byte] & mask:
+                bitmap[byte] |= mask
+                flags[i] = 1
+        self.bitmap_count += flags.count(1)
+        return bytes(flags)
+
+    def _mark(self, value: int) -> bool:
+        """Record one address; False when it was already present"""
+        if value & _LOCAL:
+            word, mask = self._block(value)
+            if self._bloom[word] & mask == mask:
+                return False
+            self._bloom[word] |= mask
+            self.bloom_count += 1
+            return True
+        bitmap = self._bitmap(value >> NIC_BITS)
+        nic = value & 0xFFFFFF
+        byte, mask = nic >> 3, 1 << (nic & 7)
+        if bitmap[byte] & mask:
+            return False
+        bitmap[byte] |= mask
+        self.bitmap_count += 1
+        return True
+
+    def __contains__(self, mac: Union[int, str]) -> bool:
+        value = mac if isinstance(mac, int) else MacArray.from_strings([mac]).data[0]
+        if value & _LOCAL:
+            word, mask = self._block(value)
+            return self._bloom[word] & mask == mask
+        bitmap = self._bitmaps.get(value >> NIC_BITS)
+        nic = value & 0xFFFFFF
+        return bitmap is not None and bool(bitmap[nic >> 3] >> (nic & 7) & 1)
+
+    def add(self, mac: Union[int, str]) -> bool:
+        """Record one address; True if it was new"""
+        value = mac if isinstance(mac, int) else MacArray.from_strings([mac]).data[0]
+        with self._lock:
+            return self._mark(value)
+
+    def fresh(self, raw: bytes) -> bytes:
+        """Mark packed records; one flag byte each, 1 where the record was new
+
+        A record repeated inside raw is new only the first time
+        """
+        macs = MacArray.from_records(raw)
+        values = macs.data
+        local = macs.local_mask()
+        count = local.count(1)
+        with self._lock:
+            if count == len(values):
+                return self._mark_local(values)
+            if count == 0:
+                return self._mark_universal(values)
+            local_flags = iter(self._mark_local(array('Q', compress(values, local))))
+            universal_flags = iter(self._mark_universal(
+                array('Q', compress(values, local.translate(_IS_ZERO)))))
+            return bytes(next(local_flags) if is_local else next(universal_flags)
+                         for is_local in local)
+
+    def claim(self, raw: bytes) -> bytes:
+        """Mark packed records; returns those not seen before (repeats in raw included)"""
+        fresh = self.fresh(raw)
+        if fresh.count(1) == len(fresh):
+            return raw
+        return MacArray.from_records(raw).select(fresh).to_records()
+
+    def observe(self, source: Union[ScanSource, MacArray]) -> int:
+        """Seed from scan results, a neighbour table, an export or a capture; returns new count"""
+        if isinstance(source, MacArray):
+            return len(self.claim(source.to_records())) // 6
+        added = 0
+        for chunk in iter_chunks(source):
+            macs = MacArray.from_devices(device for device in chunk if device.get('mac'))
+            added += len(self.claim(macs.to_records())) // 6
+        return added
+
+    @timed('zspoof_unique_seconds', 'Unique MAC batch latency (redraws included)')
+    def generate(self, profile: str, n: int, rng: Optional[StreamRandom] = None,
+                 vendors: Mapping = PROFILE_VENDORS) -> bytes:
+        """n packed MACs that were never issued or observed, redrawing rejects"""
+        parts, missing, rounds = [], n, 0
+        while missing > 0:
+            if rounds == MAX_REDRAWS:
+                raise RuntimeError(f"address space for {profile!r} is exhausted "
+                                   f"({n - missing} of {n} unique MACs drawn)")
+            fresh = self.claim(generate_batch_bytes(profile, missing, rng=rng, vendors=vendors))
+            parts.append(fresh)
+            missing -= len(fresh) // 6
+            rounds += 1
+        return b''.join(parts)
+
+    def false_positive_rate(self) -> float:
+        """Expected Bloom false-positive rate at the current fill
+
+        Words hold a Poisson number of addresses; a probe fails when all its
+        bits are already set in its word
+        """
+        load = self.bloom_count / (1 << self._word_bits)
+        rate, weight, j = 0.0, math.exp(-load), 0
+        while j <= load or weight > 1e-15:
+            rate += weight * (1.0 - (63 / 64) ** (self.hashes * j)) ** self.hashes
+            j += 1
+            weight *= load / j
+        return rate
+
+    def flush(self) -> None:
+        """Write counters and dirty pages back (no-op without a path)"""
+        with self._lock:
+            _HEADER.pack_into(self._header, 0, MAGIC, FORMAT_VERSION, self.hashes,
+                              self.bloom_bits, self.bitmap_count, self.bloom_count)
+            if self.path is not None:
+                self._header.flush()
+                for bitmap in self._bitmaps.values():
+                    bitmap.flush()
+
+    def close(self) -> None:
+        self.flush()
+        self._bloom.release()
+        self._header.close()
+        for bitmap in self._bitmaps.values():
+            bitmap.close()
+        self._bitmaps.clear()
+
+    def __enter__(self) -> 'UniquenessIndex':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+_index: Optional[UniquenessIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_index() -> UniquenessIndex:
+    """Process-wide index persisted under ZSPOOF_UNIQUE_DIR or data/unique/"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = UniquenessIndex(os.environ.get('ZSPOOF_UNIQUE_DIR', DEFAULT_DIR))
+    return _index
+
+
+def unique_mac(profile: str = 'random', vendors: Mapping = PROFILE_VENDORS) -> str:
+    """One MAC never issued or observed before (plain generate_mac with ZSPOOF_UNIQUE=0)"""
+    if not ENABLED:
+        return format_records(generate_batch_bytes(profile, 1, vendors=vendors))[0]
+    index = get_index()
+    raw = index.generate(profile, 1, vendors=vendors)
+    index.flush()
+    return format_records(raw)[0]
+
+
+def observe(source: Union[ScanSource, MacArray]) -> int:
+    """Record addresses seen on the network in the process-wide index; returns new count"""
+    if not ENABLED:
+        return 0
+    index = get_index()
+    added = index.observe(source)
+    if added:
+        index.flush()
+    return added
+
+
+# Export
+__all__ = [
+    'UniquenessIndex', 'get_index', 'unique_mac', 'observe', 'BITMAP_SIZE', 'DEFAULT_BLOOM_BITS',
+]
@@ -6,9 +6,8 @@ Professional MAC spoofing with machine learning
 
 import sys
 import os
-import subprocess
-import time
-from pathlib import Path
+
+import inventory
 
 # Color codes
 class Colors:
@@ -24,8 +23,7 @@ class ZSpoofCLI:
     """Command-line interface for ZSPOOF"""
     
     def __init__(self):
-        self.base_dir = Path(__file__).parent.parent
-        self.bin_path = self.base_dir / "bin" / "core_engine"
+        self.base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         
     def print_banner(self):
         banner = f"""{Colors.HEADER}
@@ -44,69 +42,47 @@ class ZSpoofCLI:
             print(f"    Run with: sudo python3 {sys.argv[0]}")
             sys.exit(1)
     
-    def check_engine(self):
-        if not self.bin_path.exists():
-            print(f"{Colors.FAIL}[!] Engine not compiled.{Colors.ENDC}")
-            print(f"    Run: make")
-            sys.exit(1)
-    
     def get_interfaces(self):
         """Get network interfaces"""
-        try:
-            result = subprocess.run(['ip', 'link', 'show'], capture_output=True, text=True)
-            interfaces = []
-            for line in result.stdout.split('\n'):
-                if ': ' in line and 'state' in line.lower():
-                    parts = line.split(': ')
-                    if len(parts) >= 2:
-                        name = parts[1].split(':')[0].split('@')[0]
-                        if name != 'lo':
-                            interfaces.append(name)
-            return interfaces
-        except:
-            return []
+        return [iface.name for iface in inventory.get_interfaces() if iface.name != 'lo']
     
     def get_current_mac(self, interface):
         """Get current MAC address"""
-        try:
-            result = subprocess.run(['cat', f'/sys/class/net/{interface}/address'], 
-                                  capture_output=True, text=True)
-            return result.stdout.strip()
-        except:
-            return "Unknown"
+        iface = inventory.get_interface(interface)
+        return iface.mac if iface else "Unknown"
     
     def generate_mac(self, profile):
-        """Generate MAC address"""
+        """Generate MAC address (never one issued or seen before, see uniqueness)"""
+        # Generator, netlink writer and session log load on first use, not at startup
+        from uniqueness import unique_mac
         try:
-            result = subprocess.run([str(self.bin_path), profile], 
-                                  capture_output=True, text=True)
-            return result.stdout.strip()
+            return unique_mac(profile)
         except Exception as e:
             print(f"{Colors.FAIL}[!] Generation failed: {e}{Colors.ENDC}")
             return None
     
-    def set_mac(self, interface, mac):
+    def set_mac(self, interface, mac, profile='custom', original_mac=None):
         """Set MAC address"""
-        try:
-            print(f"{Colors.BLUE}[*] Bringing interface down...{Colors.ENDC}")
-            subprocess.run(['ip', 'link', 'set', 'dev', interface, 'down'], check=True)
-            
-            print(f"{Colors.BLUE}[*] Setting new MAC: {mac}{Colors.ENDC}")
-            subprocess.run(['ip', 'link', 'set', 'dev', interface, 'address', mac], check=True)
-            
-            print(f"{Colors.BLUE}[*] Bringing interface up...{Colors.ENDC}")
-            subprocess.run(['ip', 'link', 'set', 'dev', interface, 'up'], check=True)
-            
-            return True
-        except subprocess.CalledProcessError as e:
-            print(f"{Colors.FAIL}[!] Failed to set MAC: {e}{Colors.ENDC}")
+        from bulk_apply import apply_one
+        from session_store import Session, log_session
+
+        print(f"{Colors.BLUE}[*] Setting new MAC: {mac}{Colors.ENDC}")
+        result = apply_one(interface, mac)
+        log_session(Session(interface=interface, mac=mac, profile=profile,
+                            original_mac=original_mac, success=result.success, source='cli',
+                            latency_ms=result.timings.get('total'), error=result.error))
+        
+        if not result.success:
+            print(f"{Colors.FAIL}[!] Failed to set MAC: {result.error}{Colors.ENDC}")
             return False
+        
+        print(f"{Colors.BLUE}[*] Interface cycled in {result.timings['total']:.2f} ms{Colors.ENDC}")
+        return True
     
     def run(self):
         """Main CLI loop"""
         self.print_banner()
         self.check_root()
-        self.check_engine()
         
         # Get interfaces
         interfaces = self.get_interfaces()
@@ -178,7 +154,7 @@ class ZSpoofCLI:
             sys.exit(0)
         
         # Apply
-        if self.set_mac(interface, new_mac):
+        if self.set_mac(interface, new_mac, profile_id, original_mac):
             print(f"\n{Colors.GREEN}[✓] SUCCESS{Colors.ENDC}")
             print(f"    Interface: {interface}")
             print(f"    Original:  {original_mac}")
@@ -189,6 +165,17 @@ class ZSpoofCLI:
             print(f"\n{Colors.FAIL}[✗] FAILED{Colors.ENDC}")
             sys.exit(1)
 
+def main(argv=None):
+    """Console entry point: ``zspoof`` (interactive), ``zspoof generate ...`` or ``zspoof capture ...``"""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ['generate']:
+        from generate import main as generate_main
+        return generate_main(argv[1:])
+    if argv[:1] == ['capture']:
+        from pcap_reader import main as capture_main
+        return capture_main(argv[1:])
+    ZSpoofCLI().run()
+    return 0
+
 if __name__ == "__main__":
-    cli = ZSpoofCLI()
-    cli.run()
+    sys.exit(main())
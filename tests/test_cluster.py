@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+ZSPOOF v3.0.0 - Multi-Worker Dashboard Tests
+Event-bus fan-out, shared state store, shared scan cache and cross-worker jobs
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "dashboard" / "backend"))
+
+from event_bus import BusClient, EventBus, FrameReader, encode
+from jobs import CANCELLED, RUNNING, JobManager
+from scan_cache import STALE, ScanCache
+from shared_state import StateStore
+
+RANGE = '10.0.0.0/24'
+
+class Colors:
+    GREEN = '\033[92m'
+    RED = '\033[91m'
+    YELLOW = '\033[93m'
+    BLUE = '\033[94m'
+    ENDC = '\033[0m'
+
+def report(ok, message):
+    status = f"{Colors.GREEN}✓ PASS{Colors.ENDC}" if ok else f"{Colors.RED}✗ FAIL{Colors.ENDC}"
+    print(f"{status} {message}")
+    return ok
+
+def collect(client, count, out, timeout=5.0):
+    """Listener thread body: gather `count` messages"""
+    deadline = time.time() + timeout
+    for message in client.listen():
+        out.append(message)
+        if len(out) >= count or time.time() > deadline:
+            return
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while not predicate() and time.time() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+def test_framing():
+    """Test frames split across arbitrary recv() boundaries reassemble in order"""
+    stream = b''.join(encode({'n': i, 'pad': 'x' * (i * 37 % 500)}) for i in range(200))
+    reader = FrameReader()
+    messages = []
+    for i in range(0, len(stream), 7):
+        messages += reader.messages(stream[i:i + 7])
+    return report([m['n'] for m in messages] == list(range(200)), "Length-prefixed framing")
+
+def test_fan_out():
+    """Test every worker (publisher included) receives every message, each publisher's in order"""
+    with tempfile.TemporaryDirectory() as tmp:
+        with EventBus(os.path.join(tmp, 'bus.sock')) as bus:
+            clients = [BusClient(bus.path) for _ in range(3)]
+            received = [[] for _ in clients]
+            threads = [threading.Thread(target=collect, args=(c, 101, out), daemon=True)
+                       for c, out in zip(clients, received)]
+            for thread in threads:
+                thread.start()
+            wait_for(lambda: bus.peers == 3)
+            for i in range(100):
+                clients[i % 3].publish({'method': 'emit', 'event': 'job_update', 'data': {'n': i}})
+            clients[0].publish({'method': 'emit', 'event': 'scan_complete', 'data': {'blob': 'x' * 1_000_000}})
+            for thread in threads:
+                thread.join(5)
+            for client in clients:
+                client.close()
+    per_client = [[m['data'].get('n') for m in out[:100]] for out in received]
+    in_order = all(sorted(order) == list(range(100))
+                   and all([n for n in order if n % 3 == p] == list(range(p, 100, 3)) for p in range(3))
+                   for order in per_client)
+    ok = (in_order
+          and all(len(out) == 101 and len(out[100]['data']['blob']) == 1_000_000 for out in received))
+    return report(ok, f"Fan-out to {len(received)} workers ({[len(r) for r in received]} messages)")
+
+def test_reconnect():
+    """Test a worker reconnects once the hub comes back"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bus.sock')
+        bus = EventBus(path).start()
+        client = BusClient(path)
+        received = []
+        thread = threading.Thread(target=collect, args=(client, 1, received, 10), daemon=True)
+        thread.start()
+        wait_for(lambda: bus.peers == 1)
+        bus.close()
+        offline = client.publish({'event': 'lost'})
+        bus = EventBus(path).start()
+        wait_for(lambda: bus.peers == 1)
+        online = client.publish({'event': 'after'})
+        thread.join(5)
+        client.close()
+        bus.close()
+    ok = online and not offline and [m['event'] for m in received] == ['after']
+    return report(ok, "Reconnect after hub restart")
+
+def _increment(path, times):
+    store = StateStore(path)
+    for _ in range(times):
+        with store.update('counter', 0) as doc:
+            doc.value += 1
+    return True
+
+def test_state_store():
+    """Test read-modify-write updates from several processes never lose a write"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'state.db')
+        with ProcessPoolExecutor(max_workers=4) as pool:
+            list(pool.map(_increment, [path] * 4, [100] * 4))
+        store = StateStore(path)
+        version, value = store.get('counter')
+        store.put('job:a', {'id': 'a'})
+        store.put('jobx', 1)
+        ok = value == 400 and version == 400 and [k for k, _ in store.items('job:')] == ['job:a']
+    return report(ok, f"Concurrent updates from 4 processes (counter {value})")
+
+def test_shared_scan_cache():
+    """Test one worker's merge is visible to another's plan and device table"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'state.db')
+        first, second = ScanCache(ttl=60, store=StateStore(path)), ScanCache(ttl=60, store=StateStore(path))
+        targets = first.plan('eth0', RANGE, STALE, now=1000)
+        first.merge('eth0', RANGE, targets, [('10.0.0.1', 'AA:00:00:00:00:01', 'unknown')], now=1000)
+        seen = second.devices('eth0', RANGE)
+        planned = second.plan('eth0', RANGE, STALE, now=1030)
+        second.merge('eth0', RANGE, [], [('10.0.0.2', 'AA:00:00:00:00:02', 'unknown')], now=1030)
+        merged = [d['ip'] for d in first.devices('eth0', RANGE)]
+        second.invalidate('eth0')
+        ok = ([d['ip'] for d in seen] == ['10.0.0.1'] and planned == []
+              and merged == ['10.0.0.1', '10.0.0.2'] and first.devices('eth0', RANGE) == [])
+    return report(ok, "Scan tables shared between workers")
+
+def test_cross_worker_jobs():
+    """Test a job is visible from and cancellable by another worker's manager"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'state.db')
+        owner = JobManager(max_workers=1, store=StateStore(path))
+        other = JobManager(max_workers=1, store=StateStore(path))
+        started = threading.Event()
+
+        def body(job):
+            started.set()
+            while True:
+                job.check()
+                time.sleep(0.01)
+
+        job = owner.submit('scan', body)
+        started.wait(5)
+        wait_for(lambda: other.get(job.id).state == RUNNING)
+        listed = [j.id for j in other.list(kind='scan')]
+        other.cancel(job.id)
+        wait_for(lambda: job.finished is not None)
+        remote = other.get(job.id)
+        owner.shutdown()
+        other.shutdown()
+    ok = listed == [job.id] and job.state == CANCELLED and remote.state == CANCELLED
+    return report(ok, f"Job {job.id[:8]} listed and cancelled across workers")
+
+def main():
+    """Run all tests"""
+    print(f"\n{Colors.BLUE}{'='*60}{Colors.ENDC}")
+    print(f"{Colors.BLUE}ZSPOOF v3.0.0 - Multi-Worker Dashboard Tests{Colors.ENDC}")
+    print(f"{Colors.BLUE}{'='*60}{Colors.ENDC}\n")
+
+    tests = [
+        test_framing(),
+        test_fan_out(),
+        test_reconnect(),
+        test_state_store(),
+        test_shared_scan_cache(),
+        test_cross_worker_jobs(),
+    ]
+
+    passed = sum(tests)
+    total = len(tests)
+    print(f"\n{Colors.BLUE}{'='*60}{Colors.ENDC}")
+    if passed == total:
+        print(f"{Colors.GREEN}✓ ALL TESTS PASSED ({passed}/{total}){Colors.ENDC}")
+        return 0
+    print(f"{Colors.RED}✗ SOME TESTS FAILED ({passed}/{total}){Colors.ENDC}")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
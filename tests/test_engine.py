@@ -9,6 +9,12 @@ import re
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from mac_array import MacArray
+from mac_generator import ENGINE_COMMANDS, TOOLKIT_VENDORS, generate_batch, generate_batch_bytes
+from oui_registry import BUILTIN_VENDOR_OUIS
+
 class Colors:
     GREEN = '\033[92m'
     RED = '\033[91m'
@@ -33,51 +39,56 @@ def test_mac_format(mac):
 
 def test_profile(profile):
     """Test MAC generation for a profile"""
+    try:
+        macs = generate_batch(profile, 1000)
+        invalid = [mac for mac in macs if not test_mac_format(mac)]
+        
+        if len(macs) == 1000 and not invalid:
+            print(f"{Colors.GREEN}✓ PASS{Colors.ENDC} Generate {profile} profile: {macs[0]}")
+            return True
+        else:
+            print(f"{Colors.RED}✗ FAIL{Colors.ENDC} Invalid MAC format for {profile}: {invalid[:3]}")
+            return False
+    except Exception as e:
+        print(f"{Colors.RED}✗ FAIL{Colors.ENDC} Profile {profile} error: {e}")
+        return False
+
+def test_engine_batch():
+    """Test the compiled engine emits a batch in one invocation"""
     engine = Path(__file__).parent.parent / "bin" / "core_engine"
     try:
-        result = subprocess.run([str(engine), profile], 
+        result = subprocess.run([str(engine), "corporate", "100"], 
                               capture_output=True, text=True, timeout=5)
-        mac = result.stdout.strip()
+        macs = result.stdout.split()
         
-        if test_mac_format(mac):
-            print(f"{Colors.GREEN}✓ PASS{Colors.ENDC} Generate {profile} profile: {mac}")
+        if len(macs) == 100 and all(test_mac_format(mac) for mac in macs):
+            print(f"{Colors.GREEN}✓ PASS{Colors.ENDC} Engine batch output: {len(macs)} MACs")
             return True
         else:
-            print(f"{Colors.RED}✗ FAIL{Colors.ENDC} Invalid MAC format for {profile}: {mac}")
+            print(f"{Colors.RED}✗ FAIL{Colors.ENDC} Engine batch output: {macs[:3]}")
             return False
     except Exception as e:
-        print(f"{Colors.RED}✗ FAIL{Colors.ENDC} Profile {profile} error: {e}")
+        print(f"{Colors.RED}✗ FAIL{Colors.ENDC} Engine batch error: {e}")
         return False
 
 def test_uniqueness():
     """Test MAC uniqueness"""
-    engine = Path(__file__).parent.parent / "bin" / "core_engine"
-    macs = set()
-    
-    for _ in range(100):
-        result = subprocess.run([str(engine), "random"], 
-                              capture_output=True, text=True, timeout=5)
-        macs.add(result.stdout.strip())
+    macs = MacArray.from_records(generate_batch_bytes("random", 100000)).unique()
     
-    if len(macs) > 95:  # Allow small collision probability
-        print(f"{Colors.GREEN}✓ PASS{Colors.ENDC} Uniqueness test: {len(macs)}/100 unique")
+    if len(macs) > 99990:  # Allow small collision probability
+        print(f"{Colors.GREEN}✓ PASS{Colors.ENDC} Uniqueness test: {len(macs)}/100000 unique")
         return True
     else:
-        print(f"{Colors.RED}✗ FAIL{Colors.ENDC} Too many collisions: {len(macs)}/100")
+        print(f"{Colors.RED}✗ FAIL{Colors.ENDC} Too many collisions: {len(macs)}/100000")
         return False
 
 def test_unicast_bit():
     """Test that generated MACs are unicast (not multicast)"""
-    engine = Path(__file__).parent.parent / "bin" / "core_engine"
-    
-    for _ in range(20):
-        result = subprocess.run([str(engine), "random"], 
-                              capture_output=True, text=True, timeout=5)
-        mac = result.stdout.strip()
-        first_byte = int(mac[:2], 16)
+    for profile in ['random', 'corporate', 'cafe', 'iot', 'gamer', 'stealth']:
+        macs = MacArray.from_records(generate_batch_bytes(profile, 100000))
         
-        if first_byte & 0x01:  # Check multicast bit
-            print(f"{Colors.RED}✗ FAIL{Colors.ENDC} Multicast MAC generated: {mac}")
+        if macs.count_multicast():  # Check multicast bit
+            print(f"{Colors.RED}✗ FAIL{Colors.ENDC} Multicast MAC generated for {profile}")
             return False
     
     print(f"{Colors.GREEN}✓ PASS{Colors.ENDC} All MACs are unicast")
@@ -85,20 +96,42 @@ def test_unicast_bit():
 
 def test_local_admin_bit():
     """Test locally administered bit for random MACs"""
-    engine = Path(__file__).parent.parent / "bin" / "core_engine"
+    macs = MacArray.from_records(generate_batch_bytes("random", 100000))
     
-    for _ in range(20):
-        result = subprocess.run([str(engine), "random"], 
-                              capture_output=True, text=True, timeout=5)
-        mac = result.stdout.strip()
-        first_byte = int(mac[:2], 16)
-        
-        if not (first_byte & 0x02):  # Check local admin bit
-            print(f"{Colors.YELLOW}⚠ WARN{Colors.ENDC} Not locally administered: {mac}")
+    if macs.count_local() != len(macs):  # Check local admin bit
+        print(f"{Colors.RED}✗ FAIL{Colors.ENDC} Random MAC not locally administered")
+        return False
     
     print(f"{Colors.GREEN}✓ PASS{Colors.ENDC} Local admin bit test completed")
     return True
 
+def test_toolkit_weights():
+    """Test the toolkit's heavylifting weights survive the in-process generator"""
+    raw = generate_batch_bytes('iot', 100000, vendors=TOOLKIT_VENDORS)
+    macs = MacArray.from_records(raw).to_strings()
+    apple = set(BUILTIN_VENDOR_OUIS['apple'])
+    share = sum(mac[:8] in apple for mac in macs) / len(macs)
+
+    if 0.18 < share < 0.22:
+        print(f"{Colors.GREEN}✓ PASS{Colors.ENDC} Toolkit iot profile keeps apple at {share:.1%}")
+        return True
+    else:
+        print(f"{Colors.RED}✗ FAIL{Colors.ENDC} Toolkit iot apple share {share:.1%}, expected 20%")
+        return False
+
+def test_engine_commands():
+    """Test engine subcommands are refused as profile names"""
+    for command in sorted(ENGINE_COMMANDS):
+        try:
+            generate_batch_bytes(command, 10, use_engine=True)
+        except ValueError:
+            continue
+        print(f"{Colors.RED}✗ FAIL{Colors.ENDC} Engine command {command!r} accepted as a profile")
+        return False
+
+    print(f"{Colors.GREEN}✓ PASS{Colors.ENDC} Engine commands rejected as profiles")
+    return True
+
 def main():
     """Run all tests"""
     print(f"\n{Colors.BLUE}{'='*60}{Colors.ENDC}")
@@ -109,6 +142,7 @@ def main():
     
     # Engine tests
     tests.append(test_engine_exists())
+    tests.append(test_engine_batch())
     
     # Profile tests
     profiles = ['corporate', 'cafe', 'iot', 'gamer', 'stealth', 'random']
@@ -119,6 +153,8 @@ def main():
     tests.append(test_uniqueness())
     tests.append(test_unicast_bit())
     tests.append(test_local_admin_bit())
+    tests.append(test_toolkit_weights())
+    tests.append(test_engine_commands())
     
     # Summary
     passed = sum(tests)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+ZSPOOF v3.0.0 - Generate Command Tests
+Text, NDJSON and binary output, intelligence fields and pipe behaviour
+"""
+
+import io
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+from generate import format_ndjson, format_text, write
+from mac_array import MacArray
+from mac_generator import format_records, generate_batch_bytes
+
+class Colors:
+    GREEN = '\033[92m'
+    RED = '\033[91m'
+    YELLOW = '\033[93m'
+    BLUE = '\033[94m'
+    ENDC = '\033[0m'
+
+def report(ok, message):
+    status = f"{Colors.GREEN}✓ PASS{Colors.ENDC}" if ok else f"{Colors.RED}✗ FAIL{Colors.ENDC}"
+    print(f"{status} {message}")
+    return ok
+
+def test_formats():
+    """Test text and NDJSON encode the same records as format_records"""
+    raw = generate_batch_bytes('stealth', 1000)
+    macs = format_records(raw)
+    text = bytes(format_text(raw)).decode().splitlines()
+    ndjson = [json.loads(line)['mac'] for line in format_ndjson(raw).decode().splitlines()]
+    ok = text == macs and ndjson == macs and format_text(b'') == bytearray()
+    return report(ok, "Text and NDJSON match the formatted records")
+
+def test_binary_file():
+    """Test binary output is count packed records that load back as unicast MACs"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'macs.bin'
+        with open(path, 'wb') as out:
+            written = write(out, 'corporate', 300_000, 'binary', chunk=65_536)
+        macs = MacArray.from_records(path.read_bytes())
+    ok = written == 300_000 * 6 and len(macs) == 300_000 and macs.count_multicast() == 0
+    return report(ok, f"Binary records round-trip ({written:,} bytes)")
+
+def test_intel_fields():
+    """Test --intel adds vendor, confidence and risk level per record"""
+    out = io.BytesIO()
+    write(out, 'cafe', 500, 'ndjson', intel=True)
+    records = [json.loads(line) for line in out.getvalue().decode().splitlines()]
+    vendors = {r['vendor'] for r in records}
+    ok = (len(records) == 500 and vendors <= {'apple', 'samsung', 'xiaomi', 'google'}
+          and all(isinstance(r['confidence'], float) and r['risk_level'] in ('low', 'medium')
+                  for r in records))
+    return report(ok, f"Intelligence fields per record {sorted(vendors)}")
+
+def test_intel_text():
+    """Test --intel text rows are mac, vendor, confidence and risk level"""
+    out = io.BytesIO()
+    write(out, 'gamer', 500, 'text', intel=True)
+    rows = [line.split('\t') for line in out.getvalue().decode().splitlines()]
+    ok = (len(rows) == 500 and all(len(row) == 4 for row in rows)
+          and all(len(mac) == 17 and float(confidence) >= 0 and risk in ('low', 'medium', 'high')
+                  for mac, _, confidence, risk in rows))
+    return report(ok, f"Intelligence text row {rows[0]}")
+
+def test_pipe():
+    """Test the entry point streams into a closed pipe without a traceback"""
+    producer = subprocess.Popen(
+        [sys.executable, str(SRC_DIR / 'zspoof_ultimate.py'), 'generate', '-n', '5000000'],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    head = [producer.stdout.readline() for _ in range(3)]
+    producer.stdout.close()
+    stderr = producer.stderr.read()
+    producer.wait(timeout=60)
+    ok = len(head) == 3 and all(len(line) == 18 for line in head) and not stderr
+    return report(ok, f"Closed pipe ends quietly (exit {producer.returncode})")
+
+def main():
+    """Run all tests"""
+    print(f"\n{Colors.BLUE}{'='*60}{Colors.ENDC}")
+    print(f"{Colors.BLUE}ZSPOOF v3.0.0 - Generate Command Tests{Colors.ENDC}")
+    print(f"{Colors.BLUE}{'='*60}{Colors.ENDC}\n")
+
+    tests = [
+        test_formats(),
+        test_binary_file(),
+        test_intel_fields(),
+        test_intel_text(),
+        test_pipe(),
+    ]
+
+    passed = sum(tests)
+    total = len(tests)
+    print(f"\n{Colors.BLUE}{'='*60}{Colors.ENDC}")
+    if passed == total:
+        print(f"{Colors.GREEN}✓ ALL TESTS PASSED ({passed}/{total}){Colors.ENDC}")
+        return 0
+    print(f"{Colors.RED}✗ SOME TESTS FAILED ({passed}/{total}){Colors.ENDC}")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+ZSPOOF v3.0.0 - Dashboard Job Tests
+Background execution, limits, progress events and cancellation
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "dashboard" / "backend"))
+
+from jobs import CANCELLED, FAILED, SUCCEEDED, JobLimitError, JobManager
+
+class Colors:
+    GREEN = '\033[92m'
+    RED = '\033[91m'
+    YELLOW = '\033[93m'
+    BLUE = '\033[94m'
+    ENDC = '\033[0m'
+
+def report(ok, message):
+    status = f"{Colors.GREEN}✓ PASS{Colors.ENDC}" if ok else f"{Colors.RED}✗ FAIL{Colors.ENDC}"
+    print(f"{status} {message}")
+    return ok
+
+def wait(job, timeout=5.0):
+    deadline = time.time() + timeout
+    while job.finished is None and time.time() < deadline:
+        time.sleep(0.01)
+    return job
+
+def drain(manager):
+    events = []
+    while not manager.events.empty():
+        events.append(manager.events.get_nowait())
+    return events
+
+def test_submit_returns_immediately():
+    """Test submit does not wait for the job body"""
+    manager = JobManager(max_workers=2)
+    release = threading.Event()
+
+    def body(job, steps):
+        for i in range(steps):
+            job.report(i / steps, f'step {i}')
+        release.wait(5)
+        return {'steps': steps}
+
+    start = time.perf_counter()
+    job = manager.submit('scan', body, 4)
+    submitted = time.perf_counter() - start
+    release.set()
+    wait(job)
+    names = [event for event, _ in drain(manager)]
+    ok = (submitted < 0.05 and job.state == SUCCEEDED and job.result == {'steps': 4}
+          and names.count('job_update') >= 5 and names[-1] == 'job_complete')
+    return report(ok, f"Submit returned in {submitted * 1000:.2f} ms, {len(names)} events")
+
+def test_limits():
+    """Test per-kind and global limits reject excess submits"""
+    manager = JobManager(max_workers=1, max_pending=3, limits={'scan': 1})
+    release = threading.Event()
+    body = lambda job: release.wait(5)
+    running = manager.submit('scan', body)
+    rejected = []
+    for kind in ('scan', 'analysis', 'analysis', 'analysis'):
+        try:
+            manager.submit(kind, body)
+        except JobLimitError:
+            rejected.append(kind)
+    release.set()
+    wait(running)
+    return report(rejected == ['scan', 'analysis'], f"Limits rejected {rejected}")
+
+def test_cancel():
+    """Test queued and running jobs can be cancelled"""
+    manager = JobManager(max_workers=1)
+    started = threading.Event()
+
+    def body(job):
+        started.set()
+        while True:
+            job.check()
+            time.sleep(0.01)
+
+    running = manager.submit('scan', body)
+    queued = manager.submit('scan', body)
+    started.wait(5)
+    manager.cancel(queued.id)
+    manager.cancel(running.id)
+    wait(running)
+    wait(queued)
+    failing = wait(manager.submit('analysis', lambda job: 1 / 0))
+    ok = (running.state == CANCELLED and queued.state == CANCELLED and queued.started is None
+          and failing.state == FAILED and 'division' in failing.error)
+    return report(ok, "Cancellation of queued and running jobs")
+
+def main():
+    """Run all tests"""
+    print(f"\n{Colors.BLUE}{'='*60}{Colors.ENDC}")
+    print(f"{Colors.BLUE}ZSPOOF v3.0.0 - Dashboard Job Tests{Colors.ENDC}")
+    print(f"{Colors.BLUE}{'='*60}{Colors.ENDC}\n")
+
+    tests = [
+        test_submit_returns_immediately(),
+        test_limits(),
+        test_cancel(),
+    ]
+
+    passed = sum(tests)
+    total = len(tests)
+    print(f"\n{Colors.BLUE}{'='*60}{Colors.ENDC}")
+    if passed == total:
+        print(f"{Colors.GREEN}✓ ALL TESTS PASSED ({passed}/{total}){Colors.ENDC}")
+        return 0
+    print(f"{Colors.RED}✗ SOME TESTS FAILED ({passed}/{total}){Colors.ENDC}")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+ZSPOOF v3.0.0 - MacArray Tests
+Packed parsing, formatting, bit tests and set operations
+"""
+
+import sys
+import tempfile
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from mac_array import MacArray
+from mac_generator import generate_batch, generate_batch_bytes
+from oui_registry import OUIRegistry, compile_registry
+
+class Colors:
+    GREEN = '\033[92m'
+    RED = '\033[91m'
+    YELLOW = '\033[93m'
+    BLUE = '\033[94m'
+    ENDC = '\033[0m'
+
+def report(ok, message):
+    status = f"{Colors.GREEN}✓ PASS{Colors.ENDC}" if ok else f"{Colors.RED}✗ FAIL{Colors.ENDC}"
+    print(f"{status} {message}")
+    return ok
+
+def test_round_trip():
+    """Test records and strings survive pack/unpack"""
+    raw = generate_batch_bytes('stealth', 10000)
+    macs = MacArray.from_records(raw)
+    strings = macs.to_strings()
+    ok = (macs.to_records() == raw
+          and MacArray.from_strings(strings) == macs
+          and macs[0] == int(strings[0].replace(':', ''), 16)
+          and MacArray.from_strings(['f0-18-98-00-00-01'])[0] == 0xF01898000001
+          and macs.nbytes == 8 * len(macs))
+    return report(ok, f"Round trip ({len(macs)} addresses, {macs.nbytes} bytes)")
+
+def test_invalid():
+    """Test malformed strings are rejected, including ones whose digits add up to 24"""
+    cases = [
+        ['00:11:22:33:44:55', '00:11:22:33:44'],
+        ['AA:BB:CC:DD:EE:F', 'FAA:BB:CC:DD:EE:FF'],
+        ['AA:BB:CC:DD:EE:FF\nAA:BB:CC:DD:EE:FF'],
+        ['AA BB CC DD EE FF'],
+        ['GG:BB:CC:DD:EE:FF'],
+    ]
+    rejected = 0
+    for case in cases:
+        try:
+            MacArray.from_strings(case)
+        except ValueError:
+            rejected += 1
+    return report(rejected == len(cases), f"Malformed MACs rejected ({rejected}/{len(cases)})")
+
+def test_bit_fields():
+    """Test OUI extraction and multicast/LAA masks against per-address math"""
+    macs = MacArray.from_records(bytes(range(256)) * 6)
+    ok = (list(macs.ouis()) == [v >> 24 for v in macs]
+          and list(macs.multicast_mask()) == [(v >> 40) & 1 for v in macs]
+          and list(macs.local_mask()) == [(v >> 41) & 1 for v in macs]
+          and all(v >> 40 & 1 for v in macs.select(macs.multicast_mask())))
+    return report(ok, f"Bit fields ({macs.count_multicast()} multicast, "
+                      f"{macs.count_local()} local)")
+
+def test_set_operations():
+    """Test unique/union/intersection/difference and sorted membership"""
+    a = MacArray.from_strings(['00:00:00:00:00:03', '00:00:00:00:00:01', '00:00:00:00:00:03'])
+    b = MacArray.from_strings(['00:00:00:00:00:02', '00:00:00:00:00:03'])
+    unique = a.unique()
+    ok = (list(unique) == [1, 3]
+          and list(a.union(b)) == [1, 2, 3]
+          and list(a.intersection(b)) == [3]
+          and list(a.difference(b)) == [1]
+          and '00:00:00:00:00:03' in unique and 2 not in unique)
+    return report(ok, "Set operations")
+
+def test_vendor_counts():
+    """Test OUI-grouped counting matches per-address lookups"""
+    tmp = Path(tempfile.mkdtemp())
+    (tmp / "oui.csv").write_text(
+        "Registry,Assignment,Organization Name,Organization Address\n"
+        "MA-L,F01898,Apple Inc.,US\n"
+        "MA-M,F018981,Hewlett Packard Enterprise,US\n"
+    )
+    compile_registry([str(tmp / "oui.csv")], str(tmp / "oui.bin"))
+    registry = OUIRegistry.open(tmp / "oui.bin")
+
+    strings = generate_batch('corporate', 2000) + ['F0:18:98:1A:00:00', 'F0:18:98:2A:00:00']
+    expected = Counter(registry.lookup(mac) or 'unknown' for mac in strings)
+    ok = MacArray.from_strings(strings).vendor_counts(registry) == expected
+    return report(ok, f"Vendor counts by OUI: {dict(expected)}")
+
+def main():
+    """Run all tests"""
+    print(f"\n{Colors.BLUE}{'='*60}{Colors.ENDC}")
+    print(f"{Colors.BLUE}ZSPOOF v3.0.0 - MacArray Tests{Colors.ENDC}")
+    print(f"{Colors.BLUE}{'='*60}{Colors.ENDC}\n")
+
+    tests = [
+        test_round_trip(),
+        test_invalid(),
+        test_bit_fields(),
+        test_set_operations(),
+        test_vendor_counts(),
+    ]
+
+    passed = sum(tests)
+    total = len(tests)
+    print(f"\n{Colors.BLUE}{'='*60}{Colors.ENDC}")
+    if passed == total:
+        print(f"{Colors.GREEN}✓ ALL TESTS PASSED ({passed}/{total}){Colors.ENDC}")
+        return 0
+    print(f"{Colors.RED}✗ SOME TESTS FAILED ({passed}/{total}){Colors.ENDC}")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+ZSPOOF v3.0.0 - Metrics Tests
+Sharded counters, histograms, Prometheus rendering and overhead
+"""
+
+import sys
+import threading
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from metrics import Registry, timed, REGISTRY
+from mac_generator import generate_mac
+
+class Colors:
+    GREEN = '\033[92m'
+    RED = '\033[91m'
+    YELLOW = '\033[93m'
+    BLUE = '\033[94m'
+    ENDC = '\033[0m'
+
+def report(ok, message):
+    status = f"{Colors.GREEN}✓ PASS{Colors.ENDC}" if ok else f"{Colors.RED}✗ FAIL{Colors.ENDC}"
+    print(f"{status} {message}")
+    return ok
+
+def test_threaded_counts():
+    """Test per-thread shards add up exactly"""
+    registry = Registry()
+    hits = registry.counter('hits_total')
+    latency = registry.histogram('latency_seconds', buckets=(0.001, 0.01))
+
+    def worker():
+        for i in range(10000):
+            hits.inc()
+            latency.observe(0.0005 if i % 2 else 0.005)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    snap = latency.snapshot()
+    ok = (hits.value == 80000 and snap['count'] == 80000
+          and snap['buckets'] == [(0.001, 40000), (0.01, 80000), (float('inf'), 80000)])
+    return report(ok, f"Sharded counts across 8 threads ({hits.value})")
+
+def test_thread_churn():
+    """Test shards of finished threads fold into the totals instead of piling up"""
+    registry = Registry()
+    hits = registry.counter('requests_total')
+    latency = registry.histogram('request_seconds', buckets=(0.001,))
+
+    def request():
+        hits.inc()
+        latency.observe(0.0005)
+
+    for _ in range(20):
+        threads = [threading.Thread(target=request) for _ in range(100)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    snap = latency.snapshot()
+    live = len(hits._shards) + len(latency._shards)
+    ok = hits.value == 2000 and snap['count'] == 2000 and live <= 20
+    return report(ok, f"2000 short-lived threads leave {live} live shards")
+
+def test_prometheus_format():
+    """Test text exposition for counters and labelled histograms"""
+    registry = Registry()
+    registry.counter('requests_total', 'Requests', status='200').inc(3)
+    registry.histogram('op_seconds', 'Op latency', buckets=(0.1,), route='/api/x').observe(0.05)
+    text = registry.render_prometheus()
+    expected = [
+        '# HELP op_seconds Op latency',
+        '# TYPE op_seconds histogram',
+        'op_seconds_bucket{route="/api/x",le="0.1"} 1',
+        'op_seconds_bucket{route="/api/x",le="+Inf"} 1',
+        'op_seconds_sum{route="/api/x"} 0.05',
+        'op_seconds_count{route="/api/x"} 1',
+        '# TYPE requests_total counter',
+        'requests_total{status="200"} 3',
+    ]
+    ok = all(line in text.splitlines() for line in expected)
+    return report(ok, "Prometheus text format")
+
+def test_timed_wiring():
+    """Test decorated hot paths record samples and errors"""
+    generate_mac('stealth')
+
+    @timed('test_failing_seconds')
+    def failing():
+        raise RuntimeError('boom')
+
+    try:
+        failing()
+    except RuntimeError:
+        pass
+    snapshot = REGISTRY.snapshot()
+    ok = (snapshot['zspoof_generate_seconds']['']['count'] >= 1
+          and snapshot['test_failing_seconds']['']['count'] == 1
+          and snapshot['test_failing_errors_total'][''] == 1)
+    return report(ok, "Decorated paths record latency and errors")
+
+def test_overhead():
+    """Test a histogram sample costs under 1 µs"""
+    hist = Registry().histogram('overhead_seconds')
+    observe = hist.observe
+    noop = lambda value: None
+    n = 200000
+    call = min(timeit.repeat(lambda: noop(0.0001), number=n, repeat=3)) / n
+    cost = min(timeit.repeat(lambda: observe(0.0001), number=n, repeat=3)) / n - call
+    ok = cost < 1e-6
+    return report(ok, f"Histogram sample cost {cost * 1e9:.0f} ns")
+
+def main():
+    """Run all tests"""
+    print(f"\n{Colors.BLUE}{'='*60}{Colors.ENDC}")
+    print(f"{Colors.BLUE}ZSPOOF v3.0.0 - Metrics Tests{Colors.ENDC}")
+    print(f"{Colors.BLUE}{'='*60}{Colors.ENDC}\n")
+
+    tests = [
+        test_threaded_counts(),
+        test_thread_churn(),
+        test_prometheus_format(),
+        test_timed_wiring(),
+        test_overhead(),
+    ]
+
+    passed = sum(tests)
+    total = len(tests)
+    print(f"\n{Colors.BLUE}{'='*60}{Colors.ENDC}")
+    if passed == total:
+        print(f"{Colors.GREEN}✓ ALL TESTS PASSED ({passed}/{total}){Colors.ENDC}")
+        return 0
+    print(f"{Colors.RED}✗ SOME TESTS FAILED ({passed}/{total}){Colors.ENDC}")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
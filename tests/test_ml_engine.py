@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+ZSPOOF v3.0.0 - ML Engine Tests
+Fingerprinting and intelligent generation
+"""
+
+import json
+import random
+import sys
+import tempfile
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from mac_array import MacArray
+from ml_engine import FingerprintTracker, MLMACEngine, VendorSampler
+from oui_registry import get_registry
+from mac_generator import generate_batch
+import scan_sources
+
+class Colors:
+    GREEN = '\033[92m'
+    RED = '\033[91m'
+    YELLOW = '\033[93m'
+    BLUE = '\033[94m'
+    ENDC = '\033[0m'
+
+SCAN = [
+    {'ip': '10.0.0.1', 'mac': 'F0:18:98:00:00:01'},
+    {'ip': '10.0.0.2', 'mac': 'F0:18:98:00:00:02'},
+    {'ip': '10.0.0.3', 'mac': '00:14:22:00:00:03'},
+    {'ip': '10.0.0.4', 'mac': '02:00:00:00:00:04'},
+]
+
+def report(ok, message):
+    status = f"{Colors.GREEN}✓ PASS{Colors.ENDC}" if ok else f"{Colors.RED}✗ FAIL{Colors.ENDC}"
+    print(f"{status} {message}")
+    return ok
+
+def test_streaming_sources():
+    """Test list, generator, NDJSON, CSV and JSON-array sources give the same fingerprint"""
+    engine = MLMACEngine()
+    expected = engine.analyze_network_environment(SCAN)
+
+    tmp = Path(tempfile.mkdtemp())
+    ndjson = tmp / "scan.ndjson"
+    ndjson.write_text(''.join(json.dumps(d) + '\n' for d in SCAN))
+    csv = tmp / "scan.csv"
+    csv.write_text('IP,MAC Address\n' + ''.join(f"{d['ip']},{d['mac']}\n" for d in SCAN))
+    pretty = tmp / "scan.json"
+    pretty.write_text(json.dumps(SCAN, indent=2))
+    compact = tmp / "macs.json"
+    compact.write_text(json.dumps([d['mac'] for d in SCAN]))
+
+    # Reads shorter than one element exercise decoding across read boundaries
+    scan_sources._READ_SIZE, read_size = 7, scan_sources._READ_SIZE
+    try:
+        arrays = [engine.analyze_network_environment(p) for p in (pretty, compact)]
+    finally:
+        scan_sources._READ_SIZE = read_size
+
+    results = arrays + [
+        engine.analyze_network_environment(d for d in SCAN),
+        engine.analyze_network_environment(str(ndjson)),
+        engine.analyze_network_environment(csv),
+    ]
+    ok = (expected.vendor_distribution == {'apple': 0.5, 'dell': 0.25, 'unknown': 0.25}
+          and all(r == expected for r in results))
+    return report(ok, f"Streaming sources agree: {expected.vendor_distribution}")
+
+def test_time_patterns():
+    """Test CSV epoch strings, per-device timestamps and bad values in hour buckets"""
+    engine = MLMACEngine()
+    hour = datetime.fromtimestamp(1700000000).hour
+    csv = Path(tempfile.mkdtemp()) / "seen.csv"
+    csv.write_text('mac,last_seen\n' + ''.join(f"{d['mac']},1700000000\n" for d in SCAN))
+    from_csv = engine.analyze_network_environment(csv)
+    # First device of the chunk has no timestamp; the second still counts
+    mixed = engine.analyze_network_environment([SCAN[0], dict(SCAN[1], last_seen=1700000000)])
+    bad = engine.analyze_network_environment([dict(SCAN[0], last_seen='not a time'),
+                                              dict(SCAN[2], last_seen='')])
+    ok = (list(from_csv.time_patterns) == [hour] and list(mixed.time_patterns) == [hour]
+          and bad.time_patterns == {} and len(bad.vendor_distribution) == 2)
+    return report(ok, f"Hour buckets from CSV epoch strings and mixed chunks (hour {hour})")
+
+def test_empty_source():
+    """Test empty sources keep the neutral fingerprint"""
+    engine = MLMACEngine()
+    ok = all(engine.analyze_network_environment(s).risk_score == 0.5 for s in ([], iter(())))
+    return report(ok, "Empty source fingerprint")
+
+def test_fingerprint_tracker():
+    """Test delta updates match a full re-analysis"""
+    engine = MLMACEngine()
+    tracker = FingerprintTracker()
+    present = set()
+    pool = generate_batch('stealth', 300) + generate_batch('random', 100)
+
+    for _ in range(20):
+        added = random.sample(pool, 25)
+        removed = random.sample(sorted(present), min(10, len(present)))
+        tracker.apply(added=added, removed=removed, when=1700000000)
+        present = (present - set(removed)) | set(added)
+
+    full = engine.analyze_network_environment(sorted(present))
+    current = tracker.fingerprint()
+    ok = (len(tracker) == len(present)
+          and current.vendor_distribution.keys() == full.vendor_distribution.keys()
+          and all(abs(current.vendor_distribution[v] - p) < 1e-9
+                  for v, p in full.vendor_distribution.items())
+          and abs(current.risk_score - full.risk_score) < 1e-9
+          and list(current.time_patterns) == [datetime.fromtimestamp(1700000000).hour])
+    return report(ok, f"Tracker matches full analysis ({len(present)} devices, "
+                      f"risk {current.risk_score:.3f})")
+
+def test_alias_sampler():
+    """Test alias draws and the batch slot table follow the vendor weights"""
+    weights = {'apple': 0.5, 'dell': 0.3, 'unknown': 0.2}
+    sampler = VendorSampler(weights, get_registry())
+    n = 200_000
+    drawn = Counter(sampler.vendors[sampler.draw()] for _ in range(n))
+    slotted = Counter(sampler.vendors[i] for i in sampler.slots())
+    ok = (len(sampler.slots()) == 65536
+          and all(abs(drawn[v] / n - p) < 0.01 for v, p in weights.items())
+          and all(abs(slotted[v] / 65536 - p) < 0.001 for v, p in weights.items()))
+    return report(ok, f"Alias sampler: {dict(drawn)}")
+
+def test_intelligent_batch():
+    """Test a batch matches single picks: vendors own their OUIs, per-hour confidence"""
+    engine = MLMACEngine()
+    registry = get_registry()
+    batch = engine.generate_intelligent_batch('byod', 50_000, hour=20)
+    single = engine.generate_intelligent_mac('byod', hour=20)
+    rows = list(batch)
+    confidence, risk_level = engine.profile_confidence('byod', 20)
+    fingerprint = engine.analyze_network_environment(SCAN)
+    blended = engine.generate_intelligent_batch('byod', 1000, fingerprint)
+    ok = (len(rows) == 50_000 and len(set(batch.macs())) > 49_900
+          and set(batch.vendors) == {'apple', 'samsung', 'google'}
+          and all(registry.lookup(row.mac) == row.vendor for row in rows[:1000])
+          and batch.confidence == single.confidence == round(confidence, 2)
+          and batch.risk_level == single.risk_level == risk_level
+          and set(blended.vendors) == {'apple', 'dell', 'unknown'}
+          and all(mac.startswith('02:00:00') for mac, vendor in zip(blended.macs(), blended.vendors)
+                  if vendor == 'unknown')
+          and len(engine.generate_intelligent_batch('iot', 0)) == 0)
+    return report(ok, f"Intelligent batch ({len(rows)} rows, confidence {batch.confidence})")
+
+def test_batch_scoring():
+    """Test batch scores equal single scores for per-MAC environments and hours"""
+    engine = MLMACEngine()
+    macs = generate_batch('corporate', 500) + generate_batch('random', 500)
+    random.shuffle(macs)
+    envs = [random.choice(['corporate', 'cafe']) for _ in macs]
+    hours = [random.randrange(24) for _ in macs]
+    scores = engine.predict_detection_batch(MacArray.from_strings(macs), envs, hours)
+    expected = [engine.predict_detection_probability(mac, env, datetime(2024, 1, 1, hour))
+                for mac, env, hour in zip(macs, envs, hours)]
+    at_3am = datetime(2024, 1, 1, 3)
+    fixed = engine.predict_detection_batch(macs, 'corporate', when=at_3am)
+    records = engine.predict_detection_batch(MacArray.from_strings(macs).to_records(), 'cafe', hours=3)
+    try:
+        engine.predict_detection_batch(macs, envs[:10])
+        mismatch = False
+    except ValueError:
+        mismatch = True
+    ok = (list(scores) == expected and set(scores) == {0.3, 0.5, 0.6, 0.8}
+          and list(fixed) == [engine.predict_detection_probability(m, 'corporate', at_3am) for m in macs]
+          and list(records) == [engine.predict_detection_probability(m, 'cafe', at_3am) for m in macs]
+          and mismatch and len(engine.predict_detection_batch([], 'cafe')) == 0)
+    return report(ok, f"Batch scoring matches single calls ({len(scores)} MACs)")
+
+def main():
+    """Run all tests"""
+    print(f"\n{Colors.BLUE}{'='*60}{Colors.ENDC}")
+    print(f"{Colors.BLUE}ZSPOOF v3.0.0 - ML Engine Tests{Colors.ENDC}")
+    print(f"{Colors.BLUE}{'='*60}{Colors.ENDC}\n")
+
+    tests = [
+        test_streaming_sources(),
+        test_time_patterns(),
+        test_empty_source(),
+        test_fingerprint_tracker(),
+        test_alias_sampler(),
+        test_intelligent_batch(),
+        test_batch_scoring(),
+    ]
+
+    passed = sum(tests)
+    total = len(tests)
+    print(f"\n{Colors.BLUE}{'='*60}{Colors.ENDC}")
+    if passed == total:
+        print(f"{Colors.GREEN}✓ ALL TESTS PASSED ({passed}/{total}){Colors.ENDC}")
+        return 0
+    print(f"{Colors.RED}✗ SOME TESTS FAILED ({passed}/{total}){Colors.ENDC}")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
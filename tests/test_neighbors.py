@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+ZSPOOF v3.0.0 - Neighbour Source Tests
+Passive device discovery from RTM_GETNEIGH, /proc/net/arp and notifications
+"""
+
+import shutil
+import socket
+import struct
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+import neighbors
+from netlink import NDA_DST, NDA_LLADDR, RTM_DELNEIGH, RTM_NEWNEIGH, pack_attr
+
+DEVICE_KEYS = {'ip', 'mac', 'vendor', 'interface', 'state'}
+
+WATCH_SCRIPT = r"""
+import socket, struct, sys, time
+sys.path.insert(0, sys.argv[1])
+from netlink import (NDA_DST, NDA_LLADDR, NLM_F_ACK, NLM_F_CREATE, NLM_F_EXCL, RTM_DELNEIGH,
+                     RTM_NEWNEIGH, NetlinkSocket, create_link, pack_attr)
+import inventory, neighbors
+
+def neigh(nl, msg_type, index, ip, mac=None):
+    attrs = pack_attr(NDA_DST, socket.inet_aton(ip))
+    if mac:
+        attrs += pack_attr(NDA_LLADDR, bytes.fromhex(mac.replace(':', '')))
+    payload = struct.pack('=BxxxiHBB', socket.AF_INET, index, 0x80, 0, 0) + attrs
+    flags = NLM_F_ACK | (NLM_F_CREATE | NLM_F_EXCL if msg_type == RTM_NEWNEIGH else 0)
+    nl.request(msg_type, payload, 'neigh', flags)
+
+create_link('zspn0', 'veth')
+index = {i.name: i.index for i in inventory.get_interfaces(refresh=True)}['zspn0']
+with NetlinkSocket() as nl, neighbors.NeighborWatcher('zspn0') as watcher:
+    for i in range(50):
+        neigh(nl, RTM_NEWNEIGH, index, f'10.77.0.{i + 1}', f'02:5A:4E:00:00:{i:02X}')
+    added = watcher.poll(1.0)
+    start = time.perf_counter()
+    table = neighbors.get_devices('zspn0')
+    elapsed = (time.perf_counter() - start) * 1000
+    neigh(nl, RTM_DELNEIGH, index, '10.77.0.1')
+    removed = watcher.poll(1.0)
+ok = (len(added) == 50 and all(e == 'added' for e, _ in added) and len(table) == 50
+      and removed == [('removed', added[0][1])] and len(watcher.known) == 49)
+print('OK' if ok else 'FAIL', f"{len(table)} neighbours dumped in {elapsed:.3f} ms, "
+      f"{len(added)} added / {len(removed)} removed events")
+"""
+
+class Colors:
+    GREEN = '\033[92m'
+    RED = '\033[91m'
+    YELLOW = '\033[93m'
+    BLUE = '\033[94m'
+    ENDC = '\033[0m'
+
+def report(ok, message):
+    status = f"{Colors.GREEN}✓ PASS{Colors.ENDC}" if ok else f"{Colors.RED}✗ FAIL{Colors.ENDC}"
+    print(f"{status} {message}")
+    return ok
+
+def ndmsg(ip, state, mac=None, index=2):
+    attrs = pack_attr(NDA_DST, socket.inet_aton(ip))
+    if mac:
+        attrs += pack_attr(NDA_LLADDR, bytes.fromhex(mac.replace(':', '')))
+    return struct.pack('=BxxxiHBB', socket.AF_INET, index, state, 0, 0) + attrs
+
+def test_parse_states():
+    """Test only resolved unicast entries count as devices"""
+    names = {2: 'eth0'}
+    stale, stale_ok = neighbors.parse_neighbor(ndmsg('10.0.0.1', 0x04, '02:00:00:00:00:01'), names)
+    _, failed_ok = neighbors.parse_neighbor(ndmsg('10.0.0.2', 0x20, '02:00:00:00:00:02'), names)
+    _, noarp_ok = neighbors.parse_neighbor(ndmsg('224.0.0.1', 0x40, '01:00:5E:00:00:01'), names)
+    _, bare_ok = neighbors.parse_neighbor(ndmsg('10.0.0.3', 0x01), names)
+    ok = (stale_ok and not (failed_ok or noarp_ok or bare_ok)
+          and set(stale.to_device()) == DEVICE_KEYS
+          and (stale.ip, stale.mac, stale.interface, stale.state)
+          == ('10.0.0.1', '02:00:00:00:00:01', 'eth0', 'stale'))
+    return report(ok, "Neighbour states filtered")
+
+def test_proc_fallback():
+    """Test /proc/net/arp parsing skips incomplete entries"""
+    table = (
+        "IP address       HW type     Flags       HW address            Mask     Device\n"
+        "192.168.1.1      0x1         0x2         a4:cf:12:00:00:01     *        wlan0\n"
+        "192.168.1.7      0x1         0x0         00:00:00:00:00:00     *        wlan0\n"
+        "192.168.1.9      0x1         0x6         f0:18:98:00:00:09     *        wlan0\n"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'arp'
+        path.write_text(table)
+        entries = neighbors._read_proc_arp(str(path))
+    ok = [(e.ip, e.mac, e.state) for e in entries] == [
+        ('192.168.1.1', 'A4:CF:12:00:00:01', 'reachable'),
+        ('192.168.1.9', 'F0:18:98:00:00:09', 'permanent'),
+    ]
+    return report(ok, f"/proc/net/arp fallback ({len(entries)} entries)")
+
+def test_watcher_folding():
+    """Test state churn is folded and removals report the last known entry"""
+    watcher = neighbors.NeighborWatcher.__new__(neighbors.NeighborWatcher)
+    watcher.interface, watcher.family, watcher.known = None, socket.AF_INET, {}
+    watcher.names = {2: 'eth0'}
+    events = [
+        watcher.handle(RTM_NEWNEIGH, ndmsg('10.0.0.1', 0x02, '02:00:00:00:00:01')),
+        watcher.handle(RTM_NEWNEIGH, ndmsg('10.0.0.1', 0x04, '02:00:00:00:00:01')),
+        watcher.handle(RTM_NEWNEIGH, ndmsg('10.0.0.1', 0x02, '02:00:00:00:00:AA')),
+        watcher.handle(RTM_NEWNEIGH, ndmsg('10.0.0.1', 0x20)),
+        watcher.handle(RTM_DELNEIGH, ndmsg('10.0.0.1', 0x20)),
+    ]
+    kinds = [event and (event[0], event[1].mac) for event in events]
+    ok = kinds == [('added', '02:00:00:00:00:01'), None, ('added', '02:00:00:00:00:AA'),
+                   ('removed', '02:00:00:00:00:AA'), None]
+    return report(ok, "Notifications folded into add/remove events")
+
+def test_live_dump():
+    """Test the host neighbour table reads back in device schema"""
+    devices = neighbors.get_devices()
+    ok = all(set(device) == DEVICE_KEYS for device in devices)
+    return report(ok, f"Host neighbour table ({len(devices)} devices)")
+
+def test_namespace_watch():
+    """Test dump and subscription against a veth inside a user+net namespace"""
+    if not shutil.which('unshare') or subprocess.run(['unshare', '-rn', 'true'],
+                                                     capture_output=True).returncode != 0:
+        print(f"{Colors.YELLOW}⚠ WARN{Colors.ENDC} User namespaces unavailable, skipping watch test")
+        return True
+    result = subprocess.run(['unshare', '-rn', sys.executable, '-c', WATCH_SCRIPT, str(SRC_DIR)],
+                            capture_output=True, text=True, timeout=10)
+    output = result.stdout.strip()
+    return report(output.startswith('OK'), f"Namespace neighbour watch: {output[3:] or result.stderr.strip()}")
+
+def main():
+    """Run all tests"""
+    print(f"\n{Colors.BLUE}{'='*60}{Colors.ENDC}")
+    print(f"{Colors.BLUE}ZSPOOF v3.0.0 - Neighbour Source Tests{Colors.ENDC}")
+    print(f"{Colors.BLUE}{'='*60}{Colors.ENDC}\n")
+
+    tests = [
+        test_parse_states(),
+        test_proc_fallback(),
+        test_watcher_folding(),
+        test_live_dump(),
+        test_namespace_watch(),
+    ]
+
+    passed = sum(tests)
+    total = len(tests)
+    print(f"\n{Colors.BLUE}{'='*60}{Colors.ENDC}")
+    if passed == total:
+        print(f"{Colors.GREEN}✓ ALL TESTS PASSED ({passed}/{total}){Colors.ENDC}")
+        return 0
+    print(f"{Colors.RED}✗ SOME TESTS FAILED ({passed}/{total}){Colors.ENDC}")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
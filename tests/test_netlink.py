@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+ZSPOOF v3.0.0 - Netlink Backend Tests
+Link changes run inside an unprivileged user+net namespace (unshare -rn)
+"""
+
+import errno
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+from netlink import (RTM_GETLINK, LinkChangeResult, NetlinkSocket, NetlinkTimeout, link_payload,
+                     set_link_address)
+import bulk_apply
+import inventory
+
+class Colors:
+    GREEN = '\033[92m'
+    RED = '\033[91m'
+    YELLOW = '\033[93m'
+    BLUE = '\033[94m'
+    ENDC = '\033[0m'
+
+# Runs inside the namespace: create a dummy link (falling back to lo when
+# the dummy driver is unavailable), change its MAC and read it back
+NAMESPACE_SCRIPT = r"""
+import socket, sys
+sys.path.insert(0, sys.argv[1])
+from netlink import (IFLA_ADDRESS, RTM_GETLINK, NetlinkError, NetlinkSocket, create_link,
+                     link_payload, set_link_address, unpack_link)
+
+name = 'zsp0'
+try:
+    create_link(name, 'dummy')
+except NetlinkError:
+    name = 'lo'
+
+stepped = set_link_address(name, '02:5A:53:50:4F:47', batch=False)
+result = set_link_address(name, '02:5A:53:50:4F:46')
+if not result.success or not stepped.success:
+    print('FAIL', result.error or stepped.error)
+    sys.exit(0)
+if set(stepped.timings) != {'down', 'address', 'up', 'total'} or set(result.timings) != {'batch', 'total'}:
+    print('FAIL', stepped.timings, result.timings)
+    sys.exit(0)
+
+index = socket.if_nametoindex(name)
+with NetlinkSocket() as nl:
+    for _, body in nl.dump(RTM_GETLINK, link_payload(0)):
+        link_index, _, attrs = unpack_link(body)
+        if link_index == index:
+            address = attrs.get(IFLA_ADDRESS, b'')
+print('OK' if address.hex(':').upper() == '02:5A:53:50:4F:46' and result.address_changed else 'FAIL', name,
+      address.hex(':'), result.timings)
+"""
+
+# Runs inside the namespace: one good change plus one bad interface must
+# leave the good interface back on its original MAC
+BULK_ROLLBACK_SCRIPT = r"""
+import sys
+sys.path.insert(0, sys.argv[1])
+from bulk_apply import apply_many
+from netlink import NetlinkError, create_link
+import inventory
+
+names = []
+for i in range(4):
+    try:
+        create_link(f'zsp{i}', 'dummy')
+        names.append(f'zsp{i}')
+    except NetlinkError:
+        break
+names = names or ['lo']
+
+before = {i.name: i.mac for i in inventory.get_interfaces(refresh=True)}
+changes = [(name, f'02:5A:53:00:00:{n:02X}') for n, name in enumerate(names)]
+ok = apply_many(changes)
+after_ok = {i.name: i.mac for i in inventory.get_interfaces(refresh=True)}
+bad = apply_many(changes[:1] + [('zsp-missing0', '02:5A:53:00:00:FF')])
+after_bad = {i.name: i.mac for i in inventory.get_interfaces(refresh=True)}
+
+applied = all(after_ok[name] == mac.lower() for name, mac in changes)
+restored = after_bad[names[0]] == after_ok[names[0]] and bad.results[0].rolled_back
+print('OK' if ok.success and applied and not bad.success and restored else 'FAIL',
+      f"{len(names)} interface(s) in {ok.elapsed_ms} ms, rollback {bad.results[0].rolled_back}")
+"""
+
+# Runs inside the namespace: a veth left administratively down must come
+# back down (with its MAC) when a bulk apply rolls back
+DOWN_ROLLBACK_SCRIPT = r"""
+import sys
+sys.path.insert(0, sys.argv[1])
+from bulk_apply import apply_many
+from netlink import create_link
+import inventory
+
+create_link('zsd0', 'veth')
+before = inventory.get_interface('zsd0', refresh=True)
+bad = apply_many([('zsd0', '02:5A:44:00:00:01'), ('zsp-missing0', '02:5A:44:00:00:FF')])
+after = inventory.get_interface('zsd0', refresh=True)
+ok = (before.admin_up is False and bad.results[0].rolled_back
+      and after.admin_up is False and after.mac == before.mac)
+print('OK' if ok else 'FAIL', f"admin_up {before.admin_up} -> {after.admin_up}, mac {after.mac}")
+"""
+
+# Runs inside the namespace: a watcher sees links come and go, reports a
+# down/address/up burst as one change and cancels out a change reverted
+# within the same poll
+WATCH_SCRIPT = r"""
+import sys
+sys.path.insert(0, sys.argv[1])
+from netlink import create_link, delete_link, set_link_address
+import inventory
+
+create_link('zsw0', 'veth')
+
+with inventory.InterfaceWatcher() as watcher:
+    create_link('zsw1', 'veth')
+    added = watcher.poll(1.0, 0.05)
+    set_link_address('zsw0', '02:5A:57:00:00:01')
+    changed = watcher.poll(1.0, 0.05)
+    set_link_address('zsw0', '02:5A:57:00:00:02')
+    set_link_address('zsw0', '02:5A:57:00:00:01')
+    flapped = watcher.poll(0.2, 0.05)
+    delete_link('zsw1')
+    removed = watcher.poll(1.0, 0.05)
+    cached = inventory.get_interfaces() == watcher.interfaces()
+
+# veth peers come and go with their link; follow the named ends only. The
+# kernel's linkwatch settles operstate asynchronously (at most once a
+# second), so an operstate-only update may land in a later poll
+summary = [(event, info.name, fields) for event, info, fields in added + changed + flapped + removed
+           if info.name.startswith('zsw') and fields != ['operstate']]
+kinds = [(event, name) for event, name, _ in summary]
+ok = (kinds == [('added', 'zsw1'), ('changed', 'zsw0'), ('removed', 'zsw1')]
+      and 'mac' in summary[1][2] and changed[0][1].mac == '02:5a:57:00:00:01' and cached)
+print('OK' if ok else 'FAIL', summary)
+"""
+
+def test_invalid_mac():
+    """Test malformed MACs are rejected before touching the kernel"""
+    result = set_link_address('lo', '02:00:00:00:00')
+    if not result.success and result.errno == errno.EINVAL:
+        print(f"{Colors.GREEN}✓ PASS{Colors.ENDC} Invalid MAC rejected (EINVAL)")
+        return True
+    print(f"{Colors.RED}✗ FAIL{Colors.ENDC} Invalid MAC accepted: {result}")
+    return False
+
+def test_missing_interface():
+    """Test unknown interfaces report ENODEV"""
+    result = set_link_address('zspoof-missing0', '02:00:00:00:00:01')
+    if not result.success and result.errno == errno.ENODEV:
+        print(f"{Colors.GREEN}✓ PASS{Colors.ENDC} Missing interface reported (ENODEV)")
+        return True
+    print(f"{Colors.RED}✗ FAIL{Colors.ENDC} Missing interface: {result}")
+    return False
+
+def test_request_timeout():
+    """Test a request the kernel never acks times out instead of hanging"""
+    # A plain RTM_GETLINK is answered with the link, never with an ack
+    start = time.perf_counter()
+    try:
+        with NetlinkSocket(timeout=0.2) as nl:
+            nl.transact([(RTM_GETLINK, link_payload(socket.if_nametoindex('lo')))], flags=0)
+        error = None
+    except NetlinkTimeout as e:
+        error = e
+    elapsed = time.perf_counter() - start
+    if error is not None and error.errno == errno.ETIMEDOUT and elapsed < 2:
+        print(f"{Colors.GREEN}✓ PASS{Colors.ENDC} Missing ack times out ({error}, {elapsed:.2f} s)")
+        return True
+    print(f"{Colors.RED}✗ FAIL{Colors.ENDC} Missing ack: {error!r} after {elapsed:.2f} s")
+    return False
+
+def test_inventory():
+    """Test the netlink inventory agrees with sysfs and caches until invalidated"""
+    interfaces = inventory.get_interfaces(refresh=True)
+    sysfs = {iface.name: iface.mac for iface in inventory._scan_sysfs()}
+    cached = inventory.get_interfaces() == interfaces
+    inventory.invalidate()
+    
+    if interfaces and cached and all(sysfs.get(i.name) == i.mac for i in interfaces):
+        names = ', '.join(i.name for i in interfaces)
+        print(f"{Colors.GREEN}✓ PASS{Colors.ENDC} Inventory matches sysfs: {names}")
+        return True
+    print(f"{Colors.RED}✗ FAIL{Colors.ENDC} Inventory mismatch: {interfaces} vs {sysfs}")
+    return False
+
+def run_in_namespace(description, script):
+    """Run a script under unshare -rn and report its OK/FAIL line"""
+    if not shutil.which('unshare') or subprocess.run(['unshare', '-rn', 'true'],
+                                                     capture_output=True).returncode != 0:
+        print(f"{Colors.YELLOW}⚠ WARN{Colors.ENDC} User namespaces unavailable, skipping {description}")
+        return True
+
+    result = subprocess.run(['unshare', '-rn', sys.executable, '-c', script, str(SRC_DIR)],
+                            capture_output=True, text=True, timeout=10)
+    output = result.stdout.strip()
+    if output.startswith('OK'):
+        print(f"{Colors.GREEN}✓ PASS{Colors.ENDC} {description}: {output[3:]}")
+        return True
+    print(f"{Colors.RED}✗ FAIL{Colors.ENDC} {description}: {output or result.stderr.strip()}")
+    return False
+
+def test_namespace_change():
+    """Test a full down/address/up change inside a user+net namespace"""
+    return run_in_namespace("Namespace MAC change", NAMESPACE_SCRIPT)
+
+def test_bulk_rollback():
+    """Test a failed bulk apply restores every interface already changed"""
+    return run_in_namespace("Bulk apply rollback", BULK_ROLLBACK_SCRIPT)
+
+def test_down_rollback():
+    """Test rollback leaves an administratively down interface down"""
+    return run_in_namespace("Rollback keeps link down", DOWN_ROLLBACK_SCRIPT)
+
+def test_partial_rollback():
+    """Test an interface whose address changed but link-up failed is restored too"""
+    originals = {'zsp0': '02:00:00:00:00:a0', 'zsp1': '02:00:00:00:00:a1', 'zsp2': '02:00:00:00:00:a2'}
+    calls = []
+
+    def fake_set(interface, mac, up=True):
+        calls.append((interface, mac, up))
+        if mac == '02:5A:00:00:00:01':  # address written, link-up refused
+            return LinkChangeResult(interface, mac, False, errno.ENETDOWN, 'up: network is down',
+                                    address_changed=True)
+        if mac == '02:5A:00:00:00:02':  # failed before the address step
+            return LinkChangeResult(interface, mac, False, errno.EPERM, 'down: not permitted')
+        return LinkChangeResult(interface, mac, True, address_changed=True)
+
+    saved = bulk_apply.set_link_address, inventory.get_interfaces
+    bulk_apply.set_link_address = fake_set
+    # zsp1 starts administratively down and must be left down again
+    inventory.get_interfaces = lambda refresh=False: [
+        inventory.InterfaceInfo(name, i, mac, None, 'up', None, admin_up=name != 'zsp1')
+        for i, (name, mac) in enumerate(originals.items())]
+    try:
+        result = bulk_apply.apply_many([('zsp0', '02:5A:00:00:00:00'), ('zsp1', '02:5A:00:00:00:01'),
+                                        ('zsp2', '02:5A:00:00:00:02')])
+    finally:
+        bulk_apply.set_link_address, inventory.get_interfaces = saved
+    restored = sorted(calls[3:])
+    flags = [r.rolled_back for r in result.results]
+    ok = (not result.success
+          and restored == [('zsp0', originals['zsp0'], True), ('zsp1', originals['zsp1'], False)]
+          and flags == [True, True, False] and not result.rollback_errors)
+    if ok:
+        print(f"{Colors.GREEN}✓ PASS{Colors.ENDC} Rollback covers failed link-up ({len(restored)} restored)")
+        return True
+    print(f"{Colors.RED}✗ FAIL{Colors.ENDC} Partial rollback: {calls} {result}")
+    return False
+
+def test_cross_process_lock():
+    """Test an interface lock held here blocks another process (a second worker or the CLI)"""
+    code = f"""
+import sys, time
+sys.path.insert(0, {str(SRC_DIR)!r})
+from bulk_apply import interface_locks
+start = time.monotonic()
+with interface_locks(['zspl0']):
+    print(round(time.monotonic() - start, 3))
+"""
+    saved = bulk_apply.LOCK_DIRS
+    with tempfile.TemporaryDirectory() as tmp:
+        bulk_apply.LOCK_DIRS = (Path(tmp),)
+        try:
+            with bulk_apply.interface_locks(['zspl0', 'zspl1']):
+                child = subprocess.Popen([sys.executable, '-c', code], stdout=subprocess.PIPE,
+                                         text=True, env=dict(os.environ, ZSPOOF_LOCK_DIR=tmp))
+                time.sleep(0.8)
+            waited = float(child.communicate(timeout=10)[0])
+        finally:
+            bulk_apply.LOCK_DIRS = saved
+    if waited > 0.3:
+        print(f"{Colors.GREEN}✓ PASS{Colors.ENDC} Interface lock spans processes (waited {waited:.2f} s)")
+        return True
+    print(f"{Colors.RED}✗ FAIL{Colors.ENDC} Second process took the lock after {waited:.2f} s")
+    return False
+
+def test_interface_watch():
+    """Test the interface watcher coalesces link notifications inside a namespace"""
+    return run_in_namespace("Interface watch", WATCH_SCRIPT)
+
+def main():
+    """Run all tests"""
+    print(f"\n{Colors.BLUE}{'='*60}{Colors.ENDC}")
+    print(f"{Colors.BLUE}ZSPOOF v3.0.0 - Netlink Backend Tests{Colors.ENDC}")
+    print(f"{Colors.BLUE}{'='*60}{Colors.ENDC}\n")
+
+    tests = [
+        test_invalid_mac(),
+        test_missing_interface(),
+        test_request_timeout(),
+        test_inventory(),
+        test_namespace_change(),
+        test_bulk_rollback(),
+        test_down_rollback(),
+        test_partial_rollback(),
+        test_cross_process_lock(),
+        test_interface_watch(),
+    ]
+
+    passed = sum(tests)
+    total = len(tests)
+    print(f"\n{Colors.BLUE}{'='*60}{Colors.ENDC}")
+    if passed == total:
+        print(f"{Colors.GREEN}✓ ALL TESTS PASSED ({passed}/{total}){Colors.ENDC}")
+        return 0
+    print(f"{Colors.RED}✗ SOME TESTS FAILED ({passed}/{total}){Colors.ENDC}")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+ZSPOOF v3.0.0 - OUI Registry Tests
+Compiler, memory-mapped lookup and reverse vendor table
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from oui_registry import OUIRegistry, compile_registry, format_oui, vendor_key
+
+class Colors:
+    GREEN = '\033[92m'
+    RED = '\033[91m'
+    YELLOW = '\033[93m'
+    BLUE = '\033[94m'
+    ENDC = '\033[0m'
+
+SAMPLE_CSV = """Registry,Assignment,Organization Name,Organization Address
+MA-L,F01898,"Apple, Inc.",1 Infinite Loop Cupertino CA US
+MA-L,70B3D5,IEEE Registration Authority,445 Hoes Lane Piscataway NJ US
+MA-L,001422,Dell Inc.,One Dell Way Round Rock TX US
+MA-M,F018981,Hewlett Packard Enterprise,Houston TX US
+MA-S,70B3D5123,Acme Widgets,Springfield US
+MA-L,ACE215,"Shenzhen Bilian Electronic Co.,Ltd",Shenzhen CN
+MA-L,C83A35,"Shenzhen Tenda Technology Co.,Ltd.",Shenzhen CN
+"""
+
+def report(ok, message):
+    status = f"{Colors.GREEN}✓ PASS{Colors.ENDC}" if ok else f"{Colors.RED}✗ FAIL{Colors.ENDC}"
+    print(f"{status} {message}")
+    return ok
+
+def compiled_sample():
+    """Compile SAMPLE_CSV and memory-map the result"""
+    tmp = Path(tempfile.mkdtemp())
+    csv_path = tmp / "oui.csv"
+    csv_path.write_text(SAMPLE_CSV)
+    compile_registry([str(csv_path)], str(tmp / "oui.bin"))
+    return OUIRegistry.open(tmp / "oui.bin")
+
+def test_builtin_lookup():
+    """Test built-in table covers the engine vendors"""
+    registry = OUIRegistry.builtin()
+    ok = (registry.lookup('F0:18:98:12:34:56') == 'apple'
+          and registry.lookup('00-14-22-AA-BB-CC') == 'dell'
+          and registry.lookup('02:00:00:00:00:01') is None
+          and registry.lookup('not-a-mac') is None)
+    return report(ok, f"Built-in registry lookup ({len(registry)} prefixes)")
+
+def test_longest_prefix():
+    """Test MA-S beats MA-M beats MA-L"""
+    registry = compiled_sample()
+    ok = (registry.lookup('70:B3:D5:12:3F:FF') == 'acme widgets'
+          and registry.lookup('70:B3:D5:FF:00:00') == 'ieee registration authority'
+          and registry.lookup('F0:18:98:1A:00:00') == 'hp'
+          and registry.lookup('F0:18:98:2A:00:00') == 'apple')
+    return report(ok, "Longest-prefix match across MA-L/MA-M/MA-S")
+
+def test_reverse_table():
+    """Test vendor -> prefix lookups"""
+    registry = compiled_sample()
+    apple = [format_oui(p) for p in registry.prefixes_for('apple')]
+    ok = apple == ['F0:18:98'] and len(registry.prefixes_for('missing')) == 0
+    return report(ok, f"Reverse vendor table: apple -> {apple}")
+
+def test_vendor_key():
+    """Test known vendors get engine keys and others keep their full names"""
+    cases = {
+        'Apple, Inc.': 'apple',
+        'Samsung Electronics Co.,Ltd': 'samsung',
+        'Hewlett Packard Enterprise': 'hp',
+        'Espressif Inc.': 'espressif',
+        'Cisco Systems, Inc': 'cisco',
+        'Texas Instruments': 'texas instruments',
+        'Intellicom Co., Ltd.': 'intellicom',
+    }
+    ok = all(vendor_key(name) == key for name, key in cases.items())
+    return report(ok, "Vendor name normalisation")
+
+def test_distinct_organisations():
+    """Test organisations sharing a first word stay separate vendors"""
+    registry = compiled_sample()
+    bilian = registry.lookup('AC:E2:15:00:00:01')
+    tenda = registry.lookup('C8:3A:35:00:00:01')
+    ok = (bilian == 'shenzhen bilian electronic' and tenda == 'shenzhen tenda technology'
+          and [format_oui(p) for p in registry.prefixes_for(tenda)] == ['C8:3A:35'])
+    return report(ok, f"Distinct organisations: {bilian!r}, {tenda!r}")
+
+def main():
+    """Run all tests"""
+    print(f"\n{Colors.BLUE}{'='*60}{Colors.ENDC}")
+    print(f"{Colors.BLUE}ZSPOOF v3.0.0 - OUI Registry Tests{Colors.ENDC}")
+    print(f"{Colors.BLUE}{'='*60}{Colors.ENDC}\n")
+
+    tests = [
+        test_builtin_lookup(),
+        test_longest_prefix(),
+        test_reverse_table(),
+        test_vendor_key(),
+        test_distinct_organisations(),
+    ]
+
+    passed = sum(tests)
+    total = len(tests)
+    print(f"\n{Colors.BLUE}{'='*60}{Colors.ENDC}")
+    if passed == total:
+        print(f"{Colors.GREEN}✓ ALL TESTS PASSED ({passed}/{total}){Colors.ENDC}")
+        return 0
+    print(f"{Colors.RED}✗ SOME TESTS FAILED ({passed}/{total}){Colors.ENDC}")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
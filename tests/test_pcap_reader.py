@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+ZSPOOF v3.0.0 - Capture Reader Tests
+pcap/pcapng parsing, link types, sharded reads and engine ingestion
+"""
+
+import os
+import struct
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pcap_reader
+from ml_engine import MLMACEngine
+from pcap_reader import read_capture
+
+T0 = 1_700_000_000  # 2023-11-14 22:13:20 UTC
+APPLE = bytes.fromhex('705681000001')
+DELL = bytes.fromhex('001422000002')
+BROADCAST = b'\xff' * 6
+
+class Colors:
+    GREEN = '\033[92m'
+    RED = '\033[91m'
+    YELLOW = '\033[93m'
+    BLUE = '\033[94m'
+    ENDC = '\033[0m'
+
+def report(ok, message):
+    status = f"{Colors.GREEN}✓ PASS{Colors.ENDC}" if ok else f"{Colors.RED}✗ FAIL{Colors.ENDC}"
+    print(f"{status} {message}")
+    return ok
+
+def ethernet(src, size=60):
+    return BROADCAST + src + b'\x08\x06' + bytes(size - 14)
+
+def write_pcap(path, frames, endian='<', nano=False, linktype=1):
+    """frames: (seconds, frame bytes)"""
+    magic = 0xA1B23C4D if nano else 0xA1B2C3D4
+    with open(path, 'wb') as f:
+        f.write(struct.pack(endian + 'IHHiIII', magic, 2, 4, 0, 0, 65535, linktype))
+        for seconds, frame in frames:
+            frac = 123_456_789 if nano else 123_456
+            f.write(struct.pack(endian + 'IIII', seconds, frac, len(frame), len(frame)) + frame)
+
+def block(endian, kind, body):
+    body += bytes(-len(body) % 4)
+    length = len(body) + 12
+    return struct.pack(endian + 'II', kind, length) + body + struct.pack(endian + 'I', length)
+
+def write_pcapng(path, interfaces, packets, endian='<'):
+    """interfaces: (linktype, tsresol byte or None); packets: (iface, seconds, frame)"""
+    out = [block(endian, 0x0A0D0D0A, struct.pack(endian + 'IHHq', 0x1A2B3C4D, 1, 0, -1))]
+    units = []
+    for linktype, tsresol in interfaces:
+        options = b''
+        if tsresol is not None:
+            options = struct.pack(endian + 'HH', 9, 1) + bytes([tsresol, 0, 0, 0])
+            options += struct.pack(endian + 'HH', 0, 0)
+        out.append(block(endian, 1, struct.pack(endian + 'HHI', linktype, 0, 65535) + options))
+        units.append(10 ** 6 if tsresol is None else 10 ** tsresol)
+    for iface, seconds, frame in packets:
+        ts = seconds * (units[iface] if iface < len(units) else 10 ** 6) + 7
+        out.append(block(endian, 6, struct.pack(endian + 'IIIII', iface, ts >> 32, ts & 0xFFFFFFFF,
+                                                 len(frame), len(frame)) + frame))
+    with open(path, 'wb') as f:
+        f.write(b''.join(out))
+
+def test_pcap_variants():
+    """Test both byte orders and timestamp precisions give the same first/last seen"""
+    frames = [(T0, ethernet(APPLE)), (T0 + 5, ethernet(DELL)), (T0 + 3600, ethernet(APPLE)),
+              (T0 + 10, ethernet(BROADCAST)), (T0 + 20, b'\x00' * 8)]
+    expected = {'70:56:81:00:00:01': (T0, T0 + 3600), '00:14:22:00:00:02': (T0 + 5, T0 + 5)}
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for endian in '<>':
+            for nano in (False, True):
+                path = os.path.join(tmp, f'{endian == "<"}{nano}.pcap')
+                write_pcap(path, frames, endian, nano)
+                summary = read_capture(path)
+                results.append(summary.seen == expected and summary.packets == 5
+                               and summary.skipped == 1)
+    return report(all(results), f"pcap byte orders and precisions ({sum(results)}/4)")
+
+def test_pcapng():
+    """Test interface link types, if_tsresol and a big-endian section"""
+    sll2 = bytes(12) + DELL + b'\x00\x00'
+    radiotap = b'\x00\x00\x08\x00' + bytes(4) + b'\x08\x00' + bytes(2) + BROADCAST + APPLE + bytes(8)
+    packets = [(0, T0, ethernet(APPLE)), (1, T0 + 60, sll2), (2, T0 + 120, radiotap),
+               (0, T0 + 7200, ethernet(DELL)), (3, T0, ethernet(APPLE))]
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        for endian in '<>':
+            path = os.path.join(tmp, 'capture.pcapng')
+            write_pcapng(path, [(1, None), (276, 9), (127, 3)], packets, endian)
+            summary = read_capture(path)
+            ok = ok and summary.seen == {'70:56:81:00:00:01': (T0, T0 + 120),
+                                         '00:14:22:00:00:02': (T0 + 60, T0 + 7200)}
+            ok = ok and summary.packets == 5 and summary.skipped == 1  # unknown interface 3
+    return report(ok, "pcapng interfaces, resolutions and byte orders")
+
+def test_sharding():
+    """Test multi-process shards resync on record boundaries and merge exactly"""
+    frames = [(T0 + i, ethernet(bytes([0, 0, 0, 0, i >> 8 & 0xFF, i & 0xFF]), 60 + i % 90))
+              for i in range(20_000)]
+    packets = [(0, seconds, frame) for seconds, frame in frames]
+    saved = pcap_reader.MIN_SHARD
+    pcap_reader.MIN_SHARD = 64 << 10
+    ok = True
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ('shard.pcap', 'shard.pcapng'):
+                path = os.path.join(tmp, name)
+                if name.endswith('ng'):
+                    write_pcapng(path, [(1, None)], packets)
+                else:
+                    write_pcap(path, frames)
+                single = read_capture(path)
+                sharded = read_capture(path, workers=4)
+                ok = (ok and len(single.seen) == 20_000 and sharded.seen == single.seen
+                      and sharded.packets == single.packets == 20_000)
+    finally:
+        pcap_reader.MIN_SHARD = saved
+    return report(ok, "Sharded reads match a single pass (pcap, pcapng)")
+
+def test_engine_ingestion():
+    """Test the engine fingerprints a capture path directly, with hour patterns"""
+    frames = [(T0 + i, ethernet(APPLE if i % 2 else DELL)) for i in range(100)]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'office.pcap')
+        write_pcap(path, frames)
+        fingerprint = MLMACEngine().analyze_network_environment(path)
+    hour = time.localtime(T0).tm_hour
+    ok = (set(fingerprint.vendor_distribution) == {'apple', 'dell'}
+          and fingerprint.time_patterns.get(hour) is not None)
+    return report(ok, f"Capture path fingerprinted {fingerprint.vendor_distribution}")
+
+def test_throughput():
+    """Test single-core parse rate on a 64 MB capture"""
+    frames = [(T0 + i // 1000, ethernet(bytes([0, 0x14, 0x22, 0, i >> 8 & 0xFF, i & 0xFF]), 400))
+              for i in range(160_000)]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bulk.pcap')
+        write_pcap(path, frames)
+        summary = read_capture(path)
+    budget = float(os.environ.get('ZSPOOF_PCAP_MIN_MBPS', 100))
+    return report(summary.mb_per_s >= budget,
+                  f"Parse rate {summary.mb_per_s:.0f} MB/s ({summary.packets:,} packets, budget {budget:.0f})")
+
+def main():
+    """Run all tests"""
+    print(f"\n{Colors.BLUE}{'='*60}{Colors.ENDC}")
+    print(f"{Colors.BLUE}ZSPOOF v3.0.0 - Capture Reader Tests{Colors.ENDC}")
+    print(f"{Colors.BLUE}{'='*60}{Colors.ENDC}\n")
+
+    tests = [
+        test_pcap_variants(),
+        test_pcapng(),
+        test_sharding(),
+        test_engine_ingestion(),
+        test_throughput(),
+    ]
+
+    passed = sum(tests)
+    total = len(tests)
+    print(f"\n{Colors.BLUE}{'='*60}{Colors.ENDC}")
+    if passed == total:
+        print(f"{Colors.GREEN}✓ ALL TESTS PASSED ({passed}/{total}){Colors.ENDC}")
+        return 0
+    print(f"{Colors.RED}✗ SOME TESTS FAILED ({passed}/{total}){Colors.ENDC}")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+ZSPOOF v3.0.0 - Generator Quality Tests
+Statistical checks pass for every profile and catch biased generators
+"""
+
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from mac_generator import available_profiles, iter_batches
+from quality import analyze_chunks, chi2_sf, run
+
+class Colors:
+    GREEN = '\033[92m'
+    RED = '\033[91m'
+    YELLOW = '\033[93m'
+    BLUE = '\033[94m'
+    ENDC = '\033[0m'
+
+def report(ok, message):
+    status = f"{Colors.GREEN}✓ PASS{Colors.ENDC}" if ok else f"{Colors.RED}✗ FAIL{Colors.ENDC}"
+    print(f"{status} {message}")
+    return ok
+
+def test_chi2_tail():
+    """Test the chi-square tail approximation at known quantiles"""
+    # 95th and 99.9th percentiles of chi2(255)
+    ok = abs(chi2_sf(293.25, 255) - 0.05) < 0.002 and abs(chi2_sf(330.52, 255) - 0.001) < 0.0003
+    return report(ok, "Chi-square tail approximation")
+
+def test_profiles_pass():
+    """Test every profile passes at 500k addresses"""
+    failed = []
+    for profile in available_profiles():
+        result = run(profile, 500_000)
+        if not result.passed:
+            failed.append((profile, {k: c['passed'] for k, c in result.checks.items()}))
+    return report(not failed, f"All profiles pass quality checks {failed or ''}")
+
+def test_detects_bias():
+    """Test a biased NIC byte and a multicast leak are both caught"""
+    def biased(chunks):
+        for raw in chunks:
+            raw = bytearray(raw)
+            raw[5::6] = bytes(b & 0xFE for b in raw[5::6])  # last bit stuck at 0
+            yield bytes(raw)
+
+    def leaky(chunks):
+        for raw in chunks:
+            raw = bytearray(raw)
+            raw[0] |= 0x01
+            yield bytes(raw)
+
+    bias = analyze_chunks(biased(iter_batches('stealth', 200_000)), 'stealth')
+    leak = analyze_chunks(leaky(iter_batches('random', 200_000)), 'random')
+    ok = (not bias.checks['byte_chi2']['passed'] and not bias.checks['bit_balance']['passed']
+          and not leak.checks['invariants']['passed'] and not leak.passed)
+    return report(ok, "Biased and multicast-leaking generators rejected")
+
+def test_collisions():
+    """Test duplicates beyond the birthday bound are caught"""
+    raw = os.urandom(6) * 1000 + b''.join(iter_batches('random', 100_000))
+    result = analyze_chunks([raw], 'random')
+    ok = not result.checks['collisions']['passed'] and result.checks['collisions']['observed'] >= 999
+    return report(ok, f"Collision excess detected ({result.checks['collisions']['observed']})")
+
+def main():
+    """Run all tests"""
+    print(f"\n{Colors.BLUE}{'='*60}{Colors.ENDC}")
+    print(f"{Colors.BLUE}ZSPOOF v3.0.0 - Generator Quality Tests{Colors.ENDC}")
+    print(f"{Colors.BLUE}{'='*60}{Colors.ENDC}\n")
+
+    tests = [
+        test_chi2_tail(),
+        test_profiles_pass(),
+        test_detects_bias(),
+        test_collisions(),
+    ]
+
+    passed = sum(tests)
+    total = len(tests)
+    print(f"\n{Colors.BLUE}{'='*60}{Colors.ENDC}")
+    if passed == total:
+        print(f"{Colors.GREEN}✓ ALL TESTS PASSED ({passed}/{total}){Colors.ENDC}")
+        return 0
+    print(f"{Colors.RED}✗ SOME TESTS FAILED ({passed}/{total}){Colors.ENDC}")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
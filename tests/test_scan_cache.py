@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+ZSPOOF v3.0.0 - Scan Cache Tests
+TTL planning, incremental merges and per-block probe grouping
+"""
+
+import ipaddress
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "dashboard" / "backend"))
+
+from scan_cache import CACHED, FULL, STALE, ScanCache, group_targets, host_addresses
+
+RANGE = '10.0.0.0/24'
+
+class Colors:
+    GREEN = '\033[92m'
+    RED = '\033[91m'
+    YELLOW = '\033[93m'
+    BLUE = '\033[94m'
+    ENDC = '\033[0m'
+
+def report(ok, message):
+    status = f"{Colors.GREEN}✓ PASS{Colors.ENDC}" if ok else f"{Colors.RED}✗ FAIL{Colors.ENDC}"
+    print(f"{status} {message}")
+    return ok
+
+def addr(ip):
+    return int(ipaddress.ip_address(ip))
+
+def test_ttl_planning():
+    """Test fresh addresses are skipped until the TTL runs out"""
+    cache = ScanCache(ttl=60)
+    first = cache.plan('eth0', RANGE, STALE, now=1000)
+    cache.merge('eth0', RANGE, first, [('10.0.0.1', 'AA:00:00:00:00:01', 'unknown')], now=1000)
+    within = cache.plan('eth0', RANGE, STALE, now=1030)
+    cache.merge('eth0', RANGE, [addr('10.0.0.7')], [], now=1030)
+    expired = cache.plan('eth0', RANGE, STALE, now=1061)
+    ok = (len(first) == 254 and within == [] and cache.plan('eth0', RANGE, CACHED, now=2000) == []
+          and len(cache.plan('eth0', RANGE, FULL, now=1030)) == 254
+          and len(expired) == 253 and addr('10.0.0.7') not in expired)
+    return report(ok, f"Stale-only planning ({len(first)} -> {len(within)} -> {len(expired)})")
+
+def test_incremental_merge():
+    """Test merges keep first_seen, refresh last_seen and drop silent hosts"""
+    cache = ScanCache(ttl=60)
+    hosts = list(host_addresses(RANGE))
+    cache.merge('eth0', RANGE, hosts, [('10.0.0.1', 'AA:00:00:00:00:01', 'unknown'),
+                                       ('10.0.0.2', 'AA:00:00:00:00:02', 'unknown')], now=1000)
+    # Partial refresh: .1 answers again, .2 is silent, .3 is new; .9 was not probed
+    cache.merge('eth0', RANGE, [addr('10.0.0.1'), addr('10.0.0.2'), addr('10.0.0.3')],
+                [('10.0.0.1', 'AA:00:00:00:00:01', 'unknown'),
+                 ('10.0.0.3', 'AA:00:00:00:00:03', 'unknown')], now=1100)
+    devices = {d['ip']: d for d in cache.devices('eth0', RANGE)}
+    ok = (sorted(devices) == ['10.0.0.1', '10.0.0.3']
+          and devices['10.0.0.1']['first_seen'] == 1000 and devices['10.0.0.1']['last_seen'] == 1100
+          and devices['10.0.0.3']['first_seen'] == 1100
+          and cache.devices('eth1', RANGE) == [])
+    return report(ok, "Device table merged with last-seen timestamps")
+
+def test_grouping():
+    """Test whole blocks go out as CIDR and partial ones as address lists"""
+    targets = list(range(addr('10.0.0.1'), addr('10.0.1.0'))) + [addr('10.0.1.5'), addr('10.0.1.6')]
+    groups = dict(group_targets('10.0.0.0/22', targets))
+    # Inside a /16 the .0 and .255 of a block are hosts too
+    wide = group_targets('10.0.0.0/16', [addr('10.0.1.0'), addr('10.0.1.5'), addr('10.0.2.255')])
+    ok = (groups == {'10.0.0.0/24': '10.0.0.0/24', '10.0.1.0/24': ['10.0.1.5', '10.0.1.6']}
+          and wide == [('10.0.1.0/24', ['10.0.1.0', '10.0.1.5']), ('10.0.2.0/24', ['10.0.2.255'])]
+          and dict(group_targets(RANGE, list(host_addresses(RANGE)))) == {RANGE: RANGE}
+          and group_targets(RANGE, []) == [])
+    return report(ok, "Per-/24 probe groups")
+
+def main():
+    """Run all tests"""
+    print(f"\n{Colors.BLUE}{'='*60}{Colors.ENDC}")
+    print(f"{Colors.BLUE}ZSPOOF v3.0.0 - Scan Cache Tests{Colors.ENDC}")
+    print(f"{Colors.BLUE}{'='*60}{Colors.ENDC}\n")
+
+    tests = [
+        test_ttl_planning(),
+        test_incremental_merge(),
+        test_grouping(),
+    ]
+
+    passed = sum(tests)
+    total = len(tests)
+    print(f"\n{Colors.BLUE}{'='*60}{Colors.ENDC}")
+    if passed == total:
+        print(f"{Colors.GREEN}✓ ALL TESTS PASSED ({passed}/{total}){Colors.ENDC}")
+        return 0
+    print(f"{Colors.RED}✗ SOME TESTS FAILED ({passed}/{total}){Colors.ENDC}")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+ZSPOOF v3.0.0 - Scan Stream Tests
+Incremental device delivery, coalescing, NDJSON bodies and abandoned scans
+"""
+
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "dashboard" / "backend"))
+
+from scan_stream import MAX_BATCH, ScanStream, ndjson_lines
+
+class Colors:
+    GREEN = '\033[92m'
+    RED = '\033[91m'
+    YELLOW = '\033[93m'
+    BLUE = '\033[94m'
+    ENDC = '\033[0m'
+
+def report(ok, message):
+    status = f"{Colors.GREEN}✓ PASS{Colors.ENDC}" if ok else f"{Colors.RED}✗ FAIL{Colors.ENDC}"
+    print(f"{status} {message}")
+    return ok
+
+def device(i):
+    return (f'10.0.{i >> 8}.{i & 0xFF}', f'AA:00:00:00:{i >> 8:02X}:{i & 0xFF:02X}', 'unknown')
+
+def produce(stream, count, delay=0.0, first_delay=0.2):
+    time.sleep(first_delay)
+    for i in range(count):
+        stream.add(*device(i))
+        if delay:
+            time.sleep(delay)
+    stream.finish({'count': count})
+
+def test_first_device_latency():
+    """Test the first device reaches a follower as soon as it is added"""
+    stream = ScanStream()
+    producer = threading.Thread(target=produce, args=(stream, 5, 0.05))
+    producer.start()
+    batches = stream.follow()
+    first = next(batches)
+    latency = time.perf_counter() - stream.started - stream.first_device_s
+    rest = [d for batch in batches for d in batch]
+    producer.join()
+    ok = len(first) == 1 and latency < 0.02 and len(first) + len(rest) == 5
+    return report(ok, f"First device delivered {latency * 1000:.2f} ms after its reply")
+
+def test_coalescing():
+    """Test a burst of replies arrives in order as a few batches"""
+    stream = ScanStream()
+    producer = threading.Thread(target=produce, args=(stream, 2000, 0.00005, 0.05))
+    producer.start()
+    batches = list(stream.follow(interval=0.02))
+    producer.join()
+    ips = [d['ip'] for batch in batches for d in batch]
+    ok = (ips == [device(i)[0] for i in range(2000)] and len(batches) < 400
+          and max(len(b) for b in batches) <= MAX_BATCH)
+    return report(ok, f"2000 replies in {len(batches)} batches")
+
+def test_duplicates_and_finish():
+    """Test repeated replies and replies after the summary are ignored"""
+    stream = ScanStream()
+    added = [stream.add(*device(1)), stream.add(*device(1)), stream.add(*device(2))]
+    stream.finish({'count': 2})
+    stream.finish({'count': 99})
+    late = stream.add(*device(3))
+    ok = added == [True, False, True] and not late and stream.summary == {'count': 2}
+    return report(ok, "Duplicates dropped, first summary kept")
+
+def test_ndjson():
+    """Test the chunked body is a job line, one line per device, then the summary"""
+    devices = [dict(zip(('ip', 'mac', 'vendor'), device(i))) for i in range(600)]
+    stream = ScanStream.completed(devices, {'count': 600, 'probed': 0})
+    start = time.perf_counter()
+    chunks = list(ndjson_lines(stream, {'job_id': 'abc'}))
+    elapsed = time.perf_counter() - start
+    lines = [json.loads(line) for line in b''.join(chunks).decode().splitlines()]
+    types = [line['type'] for line in lines]
+    ok = (types == ['job'] + ['device'] * 600 + ['summary'] and lines[1]['ip'] == '10.0.0.0'
+          and lines[-1]['count'] == 600 and len(chunks) == 2 + -(-600 // MAX_BATCH) and elapsed < 0.1)
+    return report(ok, f"NDJSON body in {len(chunks)} chunks")
+
+def test_abandoned():
+    """Test followers stop when the scan ends without finishing the stream"""
+    alive = [True]
+    stream = ScanStream(job_id='j1', alive=lambda: alive[0])
+    stream.add(*device(1))
+    threading.Timer(0.2, lambda: alive.__setitem__(0, False)).start()
+    start = time.perf_counter()
+    batches = list(stream.follow())
+    elapsed = time.perf_counter() - start
+    ok = len(batches) == 1 and stream.summary['error'] and elapsed < 3
+    return report(ok, f"Abandoned scan closed after {elapsed:.1f} s")
+
+def main():
+    """Run all tests"""
+    print(f"\n{Colors.BLUE}{'='*60}{Colors.ENDC}")
+    print(f"{Colors.BLUE}ZSPOOF v3.0.0 - Scan Stream Tests{Colors.ENDC}")
+    print(f"{Colors.BLUE}{'='*60}{Colors.ENDC}\n")
+
+    tests = [
+        test_first_device_latency(),
+        test_coalescing(),
+        test_duplicates_and_finish(),
+        test_ndjson(),
+        test_abandoned(),
+    ]
+
+    passed = sum(tests)
+    total = len(tests)
+    print(f"\n{Colors.BLUE}{'='*60}{Colors.ENDC}")
+    if passed == total:
+        print(f"{Colors.GREEN}✓ ALL TESTS PASSED ({passed}/{total}){Colors.ENDC}")
+        return 0
+    print(f"{Colors.RED}✗ SOME TESTS FAILED ({passed}/{total}){Colors.ENDC}")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+ZSPOOF v3.0.0 - Session Store Tests
+Non-blocking inserts, incremental counters, pagination and sharing
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+BACKEND_DIR = Path(__file__).parent.parent / "dashboard" / "backend"
+sys.path.insert(0, str(SRC_DIR))
+
+from session_store import Session, SessionStore
+
+class Colors:
+    GREEN = '\033[92m'
+    RED = '\033[91m'
+    YELLOW = '\033[93m'
+    BLUE = '\033[94m'
+    ENDC = '\033[0m'
+
+def report(ok, message):
+    status = f"{Colors.GREEN}✓ PASS{Colors.ENDC}" if ok else f"{Colors.RED}✗ FAIL{Colors.ENDC}"
+    print(f"{status} {message}")
+    return ok
+
+def temp_db():
+    return Path(tempfile.mkdtemp()) / "sessions.db"
+
+def test_insert_throughput():
+    """Test thousands of inserts per second from concurrent threads"""
+    store = SessionStore(temp_db())
+    n, threads = 5000, 4
+
+    def worker(t):
+        for i in range(n):
+            store.record(Session(interface=f'eth{t}', mac='02:00:00:00:00:01',
+                                 profile='cafe' if i % 2 else 'iot', success=i % 10 != 0))
+
+    start = time.perf_counter()
+    pool = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    enqueued = time.perf_counter() - start
+    store.flush()
+    persisted = time.perf_counter() - start
+
+    stats = store.stats()
+    total = n * threads
+    ok = (stats['total_sessions'] == total
+          and stats['failed'] == total // 10
+          and stats['by_profile'] == {'cafe': total // 2, 'iot': total // 2}
+          and stats['by_interface']['eth3'] == n
+          and stats['last_session']['id'] == total
+          and total / persisted > 2000)
+    store.close()
+    return report(ok, f"{total} inserts: {total / enqueued:,.0f}/s queued, "
+                      f"{total / persisted:,.0f}/s persisted")
+
+def test_pagination():
+    """Test keyset pages and time/interface filters"""
+    store = SessionStore(temp_db())
+    for i in range(25):
+        store.record(Session(interface='eth0' if i % 2 else 'wlan0', mac='02:00:00:00:00:02',
+                             ts=1000.0 + i))
+    store.flush()
+
+    pages, cursor = [], None
+    while True:
+        page, cursor = store.sessions(limit=10, before=cursor)
+        pages.append([s.id for s in page])
+        if cursor is None:
+            break
+    window, _ = store.sessions(since=1005, until=1010, interface='eth0')
+    ok = (pages == [list(range(25, 15, -1)), list(range(15, 5, -1)), list(range(5, 0, -1))]
+          and [s.ts for s in window] == [1009.0, 1007.0, 1005.0])
+    store.close()
+    return report(ok, f"Keyset pagination ({len(pages)} pages) and filters")
+
+def test_shared_between_processes():
+    """Test a CLI process and this process append to the same log"""
+    path = temp_db()
+    store = SessionStore(path)
+    store.record(Session(interface='eth0', mac='02:00:00:00:00:03', source='dashboard'))
+    store.flush()
+    code = f"""
+import sys
+sys.path.insert(0, {str(SRC_DIR)!r})
+from session_store import Session, SessionStore
+store = SessionStore({str(path)!r})
+for _ in range(3):
+    store.record(Session(interface='eth1', mac='02:00:00:00:00:04', source='cli'))
+"""
+    subprocess.run([sys.executable, '-c', code], check=True)  # atexit flushes
+    stats = store.stats()
+    ok = stats['total_sessions'] == 4 and stats['by_source'] == {'dashboard': 1, 'cli': 3}
+    store.close()
+    return report(ok, f"Shared log across processes: {stats['by_source']}")
+
+def test_api_filters():
+    """Test /api/sessions rejects malformed cursors and time bounds with 400"""
+    tmp = Path(tempfile.mkdtemp())
+    code = f"""
+import json, sys
+sys.path.insert(0, {str(BACKEND_DIR)!r})
+from app import app
+client = app.test_client()
+urls = ['before=abc', 'since=yesterday', 'until=1e5x', 'since=nan', 'limit=x',
+        'before=3&since=1000.5&until=2000']
+print(json.dumps([client.get('/api/sessions?' + q).status_code for q in urls]))
+"""
+    env = dict(os.environ, ZSPOOF_SESSION_DB=str(tmp / 'sessions.db'),
+               ZSPOOF_STATE_DB=str(tmp / 'state.db'))
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, env=env)
+    codes = json.loads(result.stdout.splitlines()[-1]) if result.returncode == 0 else result.stderr[-200:]
+    ok = codes == [400, 400, 400, 400, 400, 200]
+    return report(ok, f"Malformed session filters rejected: {codes}")
+
+def main():
+    """Run all tests"""
+    print(f"\n{Colors.BLUE}{'='*60}{Colors.ENDC}")
+    print(f"{Colors.BLUE}ZSPOOF v3.0.0 - Session Store Tests{Colors.ENDC}")
+    print(f"{Colors.BLUE}{'='*60}{Colors.ENDC}\n")
+
+    tests = [
+        test_insert_throughput(),
+        test_pagination(),
+        test_shared_between_processes(),
+        test_api_filters(),
+    ]
+
+    passed = sum(tests)
+    total = len(tests)
+    print(f"\n{Colors.BLUE}{'='*60}{Colors.ENDC}")
+    if passed == total:
+        print(f"{Colors.GREEN}✓ ALL TESTS PASSED ({passed}/{total}){Colors.ENDC}")
+        return 0
+    print(f"{Colors.RED}✗ SOME TESTS FAILED ({passed}/{total}){Colors.ENDC}")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+ZSPOOF v3.0.0 - Startup Tests
+CLI cold start stays under budget (-X importtime) and heavy modules load lazily
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+import inventory
+from ml_engine import AdvancedNetworkAnalyzer, get_engine
+
+# Imports plus the interface listing that precedes the first prompt
+BUDGET_MS = float(os.environ.get('ZSPOOF_STARTUP_BUDGET_MS', 50))
+RUNS = 10
+
+# Only needed once the user has picked something
+DEFERRED = ('mac_generator', 'session_store', 'sqlite3', 'subprocess', 'ml_engine', 'bulk_apply',
+            'tqdm', 'scapy', 'flask_socketio')
+
+FIRST_PROMPT = """
+import sys, time
+import {module} as cli
+start = time.perf_counter()
+for name in [i.name for i in cli.inventory.get_interfaces() if i.name != 'lo']:
+    cli.inventory.get_interface(name)
+print((time.perf_counter() - start) * 1000)
+print(','.join(m for m in {deferred!r} if m in sys.modules))
+"""
+
+class Colors:
+    GREEN = '\033[92m'
+    RED = '\033[91m'
+    YELLOW = '\033[93m'
+    BLUE = '\033[94m'
+    ENDC = '\033[0m'
+
+def report(ok, message):
+    status = f"{Colors.GREEN}✓ PASS{Colors.ENDC}" if ok else f"{Colors.RED}✗ FAIL{Colors.ENDC}"
+    print(f"{status} {message}")
+    return ok
+
+def first_prompt(module):
+    """(ms to first prompt, slowest imports, deferred modules loaded) for one cold start"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c',
+         FIRST_PROMPT.format(module=module, deferred=DEFERRED)],
+        cwd=SRC_DIR, capture_output=True, text=True, check=True
+    )
+    imports = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        imports[name.strip()] = (int(self_us), int(cumulative_us))
+    listing_ms, loaded = result.stdout.splitlines()
+    total = imports[module][1] / 1000 + float(listing_ms)
+    slowest = sorted(imports.items(), key=lambda item: item[1][0], reverse=True)[:5]
+    return total, slowest, [m for m in loaded.split(',') if m]
+
+def test_cli_budget():
+    """Test both CLIs reach their first prompt within the budget"""
+    ok, details = True, []
+    for module in ('zspoof_ultimate', 'toolkit'):
+        runs = [first_prompt(module) for _ in range(RUNS)]
+        best, slowest, _ = min(runs)
+        details.append(f"{module} {best:.1f} ms")
+        if best > BUDGET_MS:
+            ok = False
+            print('    slowest imports: ' + ', '.join(f'{n} {s / 1000:.1f} ms' for n, (s, _) in slowest))
+    return report(ok, f"Time to first prompt under {BUDGET_MS:.0f} ms ({', '.join(details)})")
+
+def test_deferred_imports():
+    """Test generator, session store and optional dependencies stay unloaded"""
+    loaded = {m for module in ('zspoof_ultimate', 'toolkit') for m in first_prompt(module)[2]}
+    return report(not loaded, f"Heavy modules deferred {sorted(loaded) or ''}")
+
+def test_default_interface():
+    """Test the default route comes from /proc/net/route, lowest metric wins"""
+    table = (
+        "Iface\tDestination\tGateway \tFlags\tRefCnt\tUse\tMetric\tMask\t\tMTU\tWindow\tIRTT\n"
+        "wlan0\t00000000\t0101A8C0\t0003\t0\t0\t600\t00000000\t0\t0\t0\n"
+        "eth0\t00000000\t010200C0\t0003\t0\t0\t100\t00000000\t0\t0\t0\n"
+        "eth0\t000200C0\t00000000\t0001\t0\t0\t100\t00FFFFFF\t0\t0\t0\n"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        route = Path(tmp) / 'route'
+        route.write_text(table)
+        found = inventory.default_interface(str(route))
+        route.write_text(table.splitlines()[0] + '\n' + table.splitlines()[-1] + '\n')
+        none = inventory.default_interface(str(route))
+        missing = inventory.default_interface(str(Path(tmp) / 'absent'))
+    ok = found == 'eth0' and none is None and missing is None
+    return report(ok, f"Default interface from route table ({found})")
+
+def test_shared_engine():
+    """Test one engine instance backs every analyzer"""
+    engine = get_engine()
+    ok = (get_engine() is engine and AdvancedNetworkAnalyzer().ml_engine is engine
+          and engine.temporal_weights[12] == 1.5)
+    return report(ok, "Shared engine with precomputed tables")
+
+def main():
+    """Run all tests"""
+    print(f"\n{Colors.BLUE}{'='*60}{Colors.ENDC}")
+    print(f"{Colors.BLUE}ZSPOOF v3.0.0 - Startup Tests{Colors.ENDC}")
+    print(f"{Colors.BLUE}{'='*60}{Colors.ENDC}\n")
+
+    tests = [
+        test_cli_budget(),
+        test_deferred_imports(),
+        test_default_interface(),
+        test_shared_engine(),
+    ]
+
+    passed = sum(tests)
+    total = len(tests)
+    print(f"\n{Colors.BLUE}{'='*60}{Colors.ENDC}")
+    if passed == total:
+        print(f"{Colors.GREEN}✓ ALL TESTS PASSED ({passed}/{total}){Colors.ENDC}")
+        return 0
+    print(f"{Colors.RED}✗ SOME TESTS FAILED ({passed}/{total}){Colors.ENDC}")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+ZSPOOF v3.0.0 - Uniqueness Index Tests
+Exact OUI bitmaps, the Bloom tier, persistence, seeding from scans and
+reject-and-redraw generation
+"""
+
+import io
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from generate import main as generate_main, write
+from mac_array import MacArray
+from mac_generator import format_records, generate_batch_bytes
+from ml_engine import get_engine
+from rng_streams import stream
+from uniqueness import BITMAP_SIZE, UniquenessIndex
+
+class Colors:
+    GREEN = '\033[92m'
+    RED = '\033[91m'
+    YELLOW = '\033[93m'
+    BLUE = '\033[94m'
+    ENDC = '\033[0m'
+
+def report(ok, message):
+    status = f"{Colors.GREEN}✓ PASS{Colors.ENDC}" if ok else f"{Colors.RED}✗ FAIL{Colors.ENDC}"
+    print(f"{status} {message}")
+    return ok
+
+def test_bitmap_tier():
+    """Test vendor MACs are tracked exactly, repeats inside one batch included"""
+    index = UniquenessIndex(bloom_bits=20)
+    raw = generate_batch_bytes('corporate', 50_000, rng=stream(1))
+    fresh = index.claim(raw + raw[:600])
+    again = index.claim(raw)
+    distinct = len(MacArray.from_records(raw).unique())
+    ok = (len(fresh) // 6 == distinct == index.bitmap_count and again == b''
+          and '00:14:22:00:00:01' not in index and index.add('00:14:22:00:00:01')
+          and '00:14:22:00:00:01' in index and not index.add('00:14:22:00:00:01'))
+    return report(ok, f"OUI bitmaps: {distinct:,} distinct, {len(index._bitmaps)} OUIs")
+
+def test_bloom_tier():
+    """Test locally administered MACs go through the Bloom filter with no false negatives"""
+    index = UniquenessIndex(bloom_bits=22)
+    raw = generate_batch_bytes('random', 100_000, rng=stream(2))
+    fresh = index.claim(raw)
+    rejected = index.claim(raw)
+    probe = format_records(generate_batch_bytes('random', 2000, rng=stream(3)))
+    false_positives = sum(mac in index for mac in probe)
+    ok = (index.bitmap_count == 0 and len(fresh) >= 6 * 99_990 and rejected == b''
+          and false_positives <= 20 and index.false_positive_rate() < 0.01)
+    return report(ok, f"Bloom tier: {false_positives}/2000 false positives "
+                      f"(expected {index.false_positive_rate():.1e})")
+
+def test_batch_matches_single():
+    """Test batch marking agrees with single adds, in-batch repeats and mixed batches"""
+    index = UniquenessIndex(bloom_bits=20)
+    local = generate_batch_bytes('random', 3000, rng=stream(9))
+    vendor = generate_batch_bytes('corporate', 3000, rng=stream(10))
+    mixed = b''.join(local[i:i + 6] + vendor[i:i + 6] for i in range(0, len(local), 6))
+    flags = index.fresh(mixed + local[:60])
+    single = UniquenessIndex(bloom_bits=20)
+    expected = bytes(map(single.add, MacArray.from_records(mixed + local[:60]).data))
+    macs = format_records(mixed)
+    ok = (flags == expected and flags.count(1) == 6000 and all(mac in index for mac in macs)
+          and index.bloom_count == single.bloom_count == 3000)
+    return report(ok, f"Batch and single-address marking agree ({len(flags):,} records)")
+
+def test_persistence():
+    """Test a reopened directory remembers every address and keeps 2 MiB per OUI"""
+    with tempfile.TemporaryDirectory() as tmp:
+        with UniquenessIndex(tmp, bloom_bits=20) as index:
+            first = index.generate('iot', 20_000, stream(4))
+            local = index.generate('random', 5000, stream(5))
+            count = len(index)
+        reopened = UniquenessIndex(tmp, bloom_bits=24)
+        ok = (len(reopened) == count == 25_000 and reopened.bloom_bits == 20
+              and reopened.claim(first + local) == b''
+              and all(path.stat().st_size == BITMAP_SIZE for path in Path(tmp).glob('*.bitmap')))
+        reopened.close()
+    return report(ok, f"Index persisted ({count:,} addresses)")
+
+def test_observe():
+    """Test scan results and neighbour-style devices are never generated"""
+    index = UniquenessIndex(bloom_bits=20)
+    scan = format_records(generate_batch_bytes('iot', 5000, rng=stream(6)))
+    devices = [{'ip': f'10.0.{i >> 8}.{i & 255}', 'mac': mac, 'state': 'reachable'}
+               for i, mac in enumerate(scan)]
+    added = index.observe(devices) + index.observe(MacArray.from_strings(scan))
+    generated = format_records(index.generate('iot', 5000, stream(6)))
+    ok = (added == len(set(scan)) and not set(scan) & set(generated)
+          and len(set(generated)) == 5000)
+    return report(ok, f"Observed {added:,} devices excluded from generation")
+
+def test_routing():
+    """Test ML batches, single picks and zspoof generate --observe go through the index"""
+    engine = get_engine()
+    index = UniquenessIndex(bloom_bits=20)
+    first = engine.generate_intelligent_batch('gamer', 20_000, rng=stream(12), unique=index)
+    again = engine.generate_intelligent_batch('gamer', 20_000, rng=stream(12), unique=index)
+    single = engine.generate_intelligent_mac('gamer', rng=stream(12), unique=index)
+    batches = MacArray.from_records(first.records + again.records)
+    ml_ok = (len(batches.unique()) == 40_000 and len(again.vendors) == 20_000
+             and single.mac not in set(batches.to_strings()) and len(index) == 40_001)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        scan = format_records(generate_batch_bytes('iot', 3000, rng=stream(13)))
+        export = Path(tmp) / 'scan.ndjson'
+        export.write_text(''.join(json.dumps({'ip': '10.0.0.1', 'mac': mac}) + '\n' for mac in scan))
+        out = Path(tmp) / 'macs.txt'
+        generate_main(['-p', 'iot', '-n', '3000', '--seed', '13', '--observe', str(export),
+                       '--unique', str(Path(tmp) / 'index'), '-o', str(out)])
+        generated = out.read_text().split()
+        os.environ['ZSPOOF_UNIQUE_DIR'] = str(Path(tmp) / 'default')
+        import uniqueness
+        picks = {uniqueness.unique_mac('iot') for _ in range(50)}
+        uniqueness.get_index().close()
+        uniqueness._index = None
+    cli_ok = len(generated) == 3000 and not set(scan) & set(generated) and len(picks) == 50
+    return report(ml_ok and cli_ok, "ML generation and --observe skip recorded addresses")
+
+def test_write_unique():
+    """Test zspoof generate --unique never repeats across runs with the same seed"""
+    index = UniquenessIndex(bloom_bits=20)
+    runs = []
+    for _ in range(3):
+        out = io.BytesIO()
+        write(out, 'gamer', 20_000, 'binary', chunk=7000, seed=8, unique=index)
+        runs.append(out.getvalue())
+    macs = MacArray.from_records(b''.join(runs))
+    ok = len(macs.unique()) == len(macs) == 60_000 and len(index) == 60_000
+    return report(ok, "Repeated seeded runs stay unique")
+
+def main():
+    """Run all tests"""
+    print(f"\n{Colors.BLUE}{'='*60}{Colors.ENDC}")
+    print(f"{Colors.BLUE}ZSPOOF v3.0.0 - Uniqueness Index Tests{Colors.ENDC}")
+    print(f"{Colors.BLUE}{'='*60}{Colors.ENDC}\n")
+
+    tests = [
+        test_bitmap_tier(),
+        test_bloom_tier(),
+        test_batch_matches_single(),
+        test_persistence(),
+        test_observe(),
+        test_routing(),
+        test_write_unique(),
+    ]
+
+    passed = sum(tests)
+    total = len(tests)
+    print(f"\n{Colors.BLUE}{'='*60}{Colors.ENDC}")
+    if passed == total:
+        print(f"{Colors.GREEN}✓ ALL TESTS PASSED ({passed}/{total}){Colors.ENDC}")
+        return 0
+    print(f"{Colors.RED}✗ SOME TESTS FAILED ({passed}/{total}){Colors.ENDC}")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())